@@ -4,6 +4,7 @@ set -euo pipefail
 
 NO_CLEANUP=${NO_CLEANUP:-}
 BUILD_IMAGE=${BUILD_IMAGE:-}
+CACHE_DIR=${CACHE_DIR:-${XDG_CACHE_HOME:-$HOME/.cache}/apache-release-verification}
 
 echo '# Updating environment'
 if [ -z "$BUILD_IMAGE" ]; then
@@ -18,8 +19,11 @@ echo "# Executing checks"
 
 cidfile="$(mktemp)"
 rm "$cidfile"
+mkdir -p "$CACHE_DIR"
 
-if docker run -ti --cidfile "$cidfile" "$tag" "$@" && [ -z "$NO_CLEANUP" ]; then
+if docker run -ti --cidfile "$cidfile" \
+    -v "$CACHE_DIR:/cache/apache-release-verification" \
+    "$tag" "$@" && [ -z "$NO_CLEANUP" ]; then
     echo 'Cleaning up container (set env var NO_CLEANUP=1 to disable this)'
     docker rm "$(cat "$cidfile")"
 else
@@ -0,0 +1,80 @@
+import difflib
+import hashlib
+import os
+import sqlite3
+import time
+from typing import List, Optional
+
+
+def normalize(content: str) -> str:
+    """
+    The content as far as a reviewer cares: line endings, trailing whitespace
+    and trailing blank lines don't make a file need another review.
+    """
+    lines = [line.rstrip() for line in content.splitlines()]
+    while lines and not lines[-1]:
+        lines.pop()
+    return "\n".join(lines) + "\n"
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(normalize(content).encode()).hexdigest()
+
+
+def diff(old: str, new: str, name: str) -> List[str]:
+    """Unified diff lines between two versions of a file, normalized."""
+    return list(
+        difflib.unified_diff(
+            normalize(old).splitlines(keepends=True),
+            normalize(new).splitlines(keepends=True),
+            f"{name} (last approved)",
+            name,
+        )
+    )
+
+
+class ApprovalStore:
+    """
+    Contents of files like LICENSE and NOTICE that someone looked at and
+    approved, per project, persisted in an SQLite database.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS approvals ("
+                "project TEXT NOT NULL, name TEXT NOT NULL, hash TEXT NOT NULL, "
+                "content TEXT NOT NULL, approved REAL NOT NULL, "
+                "PRIMARY KEY (project, name, hash))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=60)
+
+    def is_approved(self, project: str, name: str, content: str) -> bool:
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT 1 FROM approvals WHERE project = ? AND name = ? AND hash = ?",
+                (project, name, content_hash(content)),
+            ).fetchone()
+        return row is not None
+
+    def last_approved(self, project: str, name: str) -> Optional[str]:
+        """The content of file `name` of `project` approved most recently."""
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT content FROM approvals WHERE project = ? AND name = ? "
+                "ORDER BY approved DESC LIMIT 1",
+                (project, name),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def approve(self, project: str, name: str, content: str) -> None:
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO approvals "
+                "(project, name, hash, content, approved) VALUES (?, ?, ?, ?, ?)",
+                (project, name, content_hash(content), normalize(content), time.time()),
+            )
@@ -0,0 +1,347 @@
+import hashlib
+import os
+import stat
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import metrics
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class ArchiveError(Exception):
+    pass
+
+
+class Limits(NamedTuple):
+    max_total_size: int = 4 * 2**30
+    max_files: int = 250000
+    # Uncompressed / compressed size; only applied to members of at least
+    # RATIO_MIN_SIZE bytes, where it's meaningful.
+    max_ratio: float = 200.0
+
+
+RATIO_MIN_SIZE = 1024 * 1024
+# Longer symbolic link targets than this aren't valid paths on Linux
+MAX_LINK_TARGET = 4096
+
+
+class Member(NamedTuple):
+    """A file extracted from an archive, and what we learned while extracting it."""
+
+    path: str
+    size: int
+    mode: int
+    sha256: str
+    # Hash git would use for this content (a blob object id)
+    git_sha1: str
+    link_target: Optional[str] = None
+
+
+class Extraction(NamedTuple):
+    members: Dict[str, Member]
+    total_size: int
+    seconds: float
+
+
+def safe_relpath(name: str) -> str:
+    """Normalize an archive member name, refusing anything escaping the root."""
+    name = name.replace("\\", "/")
+    if name.startswith("/") or (len(name) > 1 and name[1] == ":"):
+        raise ArchiveError(f"Archive member has an absolute path: {name}")
+    parts = [part for part in name.split("/") if part not in ("", ".")]
+    if ".." in parts:
+        raise ArchiveError(f"Archive member escapes the archive root: {name}")
+    return "/".join(parts)
+
+
+def _git_blob_hasher(size: int) -> "hashlib._Hash":
+    hasher = hashlib.sha1()
+    hasher.update(b"blob %d\0" % size)
+    return hasher
+
+
+def _hash_bytes(data: bytes) -> Tuple[str, str]:
+    git = _git_blob_hasher(len(data))
+    git.update(data)
+    return hashlib.sha256(data).hexdigest(), git.hexdigest()
+
+
+def _write_stream(src, dest: str, size: int, mode: int) -> Member:
+    sha256 = hashlib.sha256()
+    git = _git_blob_hasher(size)
+    written = 0
+    with open(dest, "wb") as f:
+        while True:
+            chunk = src.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            written += len(chunk)
+            if written > size:
+                raise ArchiveError(f"{dest} is larger than the archive claims")
+            sha256.update(chunk)
+            git.update(chunk)
+            f.write(chunk)
+    if written != size:
+        raise ArchiveError(f"{dest} is smaller than the archive claims")
+    if mode & 0o777:
+        os.chmod(dest, mode & 0o777)
+    return Member("", size, mode, sha256.hexdigest(), git.hexdigest())
+
+
+def check_totals(file_count: int, total_size: int, limits: Limits) -> None:
+    if file_count > limits.max_files:
+        raise ArchiveError(
+            f"Archive contains more than {limits.max_files} files, refusing to "
+            "extract it"
+        )
+    if total_size > limits.max_total_size:
+        raise ArchiveError(
+            f"Archive would extract to more than {limits.max_total_size} bytes, "
+            "refusing to extract it"
+        )
+
+
+def check_ratio(name: str, size: int, compressed_size: int, limits: Limits) -> None:
+    if size >= RATIO_MIN_SIZE and size > limits.max_ratio * max(compressed_size, 1):
+        raise ArchiveError(
+            f"{name} has a suspicious compression ratio "
+            f"({size} / {compressed_size} bytes), refusing to extract it"
+        )
+
+
+def check_link_target(name: str, size: int) -> None:
+    if size > MAX_LINK_TARGET:
+        raise ArchiveError(
+            f"{name} is a symbolic link with a target of {size} bytes, refusing "
+            "to extract it"
+        )
+
+
+def _inside(root: str, path: str) -> bool:
+    return os.path.commonpath([root, os.path.realpath(path)]) == root
+
+
+def _create_symlinks(dest: str, links: List[Tuple[str, str]]) -> None:
+    # Created only after all regular files are written, so that writing files
+    # can never follow a link out of `dest`. Links can still point at each
+    # other, so what they resolve to is checked rather than their targets.
+    root = os.path.realpath(dest)
+    created = []
+    try:
+        for relpath, target in links:
+            path = os.path.join(dest, relpath)
+            # Before creating any directory, which could go through another link
+            if not _inside(root, os.path.dirname(path)):
+                raise ArchiveError(
+                    f"Archive member {relpath} is in a symbolic link pointing out "
+                    "of the archive"
+                )
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.symlink(target, path)
+            created.append(path)
+        # Only once all links exist, as a chain can be created in any order
+        for relpath, target in links:
+            if not _inside(root, os.path.join(dest, relpath)):
+                raise ArchiveError(
+                    f"Symbolic link {relpath} points out of the archive ({target})"
+                )
+    except ArchiveError:
+        # Don't leave links out of `dest` behind for anything looking at it
+        for path in created:
+            os.unlink(path)
+        raise
+
+
+# zip
+
+
+def zip_mode(info: zipfile.ZipInfo) -> int:
+    return (info.external_attr >> 16) & 0xFFFF
+
+
+def _extract_zip_members(
+    archive_path: str, dest: str, infos: List[zipfile.ZipInfo]
+) -> List[Member]:
+    members = []
+    # Each worker needs its own file handle
+    with zipfile.ZipFile(archive_path) as zf:
+        for info in infos:
+            relpath = safe_relpath(info.filename)
+            path = os.path.join(dest, relpath)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                # Reading to the end makes zipfile verify the CRC
+                with zf.open(info) as src:
+                    member = _write_stream(src, path, info.file_size, zip_mode(info))
+            except zipfile.BadZipFile as ex:
+                raise ArchiveError(f"{info.filename}: {ex}")
+            members.append(member._replace(path=relpath))
+    return members
+
+
+def _partition(infos: List[zipfile.ZipInfo], count: int) -> List[List[zipfile.ZipInfo]]:
+    """Split `infos` into `count` buckets of roughly equal total size."""
+    buckets: List[List[zipfile.ZipInfo]] = [[] for _ in range(count)]
+    sizes = [0] * count
+    for info in sorted(infos, key=lambda i: i.file_size, reverse=True):
+        smallest = sizes.index(min(sizes))
+        buckets[smallest].append(info)
+        sizes[smallest] += info.file_size
+    return [bucket for bucket in buckets if bucket]
+
+
+def _extract_zip(
+    archive_path: str, dest: str, limits: Limits, jobs: int
+) -> List[Member]:
+    try:
+        with zipfile.ZipFile(archive_path) as zf:
+            infos = zf.infolist()
+            files, links, seen = [], [], set()
+            for info in infos:
+                relpath = safe_relpath(info.filename)
+                if relpath in seen:
+                    raise ArchiveError(f"Duplicate archive member: {info.filename}")
+                seen.add(relpath)
+                check_ratio(info.filename, info.file_size, info.compress_size, limits)
+                if info.is_dir():
+                    os.makedirs(os.path.join(dest, relpath), exist_ok=True)
+                elif stat.S_ISLNK(zip_mode(info)):
+                    check_link_target(info.filename, info.file_size)
+                    links.append((info, relpath))
+                else:
+                    files.append(info)
+            check_totals(
+                len(files) + len(links), sum(info.file_size for info in infos), limits
+            )
+            # Only read once the limits are known to hold
+            targets = [zf.read(info) for info, _ in links]
+    except zipfile.BadZipFile as ex:
+        raise ArchiveError(str(ex))
+
+    members = []
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for chunk in executor.map(
+            metrics.bind(
+                lambda bucket: _extract_zip_members(archive_path, dest, bucket)
+            ),
+            _partition(files, jobs),
+        ):
+            members += chunk
+
+    symlinks = []
+    for (info, relpath), target in zip(links, targets):
+        sha256, git_sha1 = _hash_bytes(target)
+        link_target = target.decode("utf-8", errors="surrogateescape")
+        symlinks.append((relpath, link_target))
+        members.append(
+            Member(
+                relpath,
+                len(target),
+                zip_mode(info),
+                sha256,
+                git_sha1,
+                link_target,
+            )
+        )
+    _create_symlinks(dest, symlinks)
+    return members
+
+
+# tar
+
+
+def _extract_tar(archive_path: str, dest: str, limits: Limits) -> List[Member]:
+    compressed_size = os.path.getsize(archive_path)
+    members: List[Member] = []
+    by_path: Dict[str, Member] = {}
+    links = []
+    total_size = 0
+    try:
+        # Streaming mode: the archive is read exactly once, front to back
+        with tarfile.open(archive_path, mode="r|*") as tf:
+            for info in tf:
+                relpath = safe_relpath(info.name)
+                path = os.path.join(dest, relpath)
+                if info.isdir():
+                    os.makedirs(path, exist_ok=True)
+                    continue
+                if info.issym():
+                    check_link_target(info.name, len(info.linkname))
+                    target = info.linkname.encode("utf-8", errors="surrogateescape")
+                    sha256, git_sha1 = _hash_bytes(target)
+                    member = Member(
+                        relpath,
+                        len(target),
+                        stat.S_IFLNK | info.mode,
+                        sha256,
+                        git_sha1,
+                        info.linkname,
+                    )
+                    links.append((relpath, info.linkname))
+                elif info.islnk():
+                    original = by_path.get(safe_relpath(info.linkname))
+                    if original is None:
+                        raise ArchiveError(f"{info.name}: hard link to unknown file")
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    os.link(os.path.join(dest, original.path), path)
+                    member = original._replace(path=relpath)
+                elif info.isfile():
+                    total_size += info.size
+                    check_totals(len(members) + 1, total_size, limits)
+                    check_ratio(archive_path, total_size, compressed_size, limits)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    src = tf.extractfile(info)
+                    if src is None:
+                        raise ArchiveError(f"{info.name}: cannot read member")
+                    member = _write_stream(
+                        src, path, info.size, stat.S_IFREG | info.mode
+                    )._replace(path=relpath)
+                else:
+                    raise ArchiveError(f"{info.name}: unsupported member type")
+                members.append(member)
+                by_path[relpath] = member
+                check_totals(len(members), total_size, limits)
+    except (tarfile.TarError, EOFError, OSError) as ex:
+        raise ArchiveError(f"Failed to read {archive_path}: {ex}")
+    _create_symlinks(dest, links)
+    return members
+
+
+def extract(
+    archive_path: str,
+    dest: str,
+    limits: Optional[Limits] = None,
+    jobs: Optional[int] = None,
+) -> Extraction:
+    """
+    Extract a .zip or .tar(.gz) archive into `dest`, refusing archives that
+    exceed `limits` or contain members or symbolic links escaping `dest`. Zip
+    members are extracted on `jobs` threads in parallel. While writing each
+    file, its integrity is checked (the CRC for zip members, the gzip CRC for
+    tarballs) and its hashes are recorded, so nothing needs to read it again
+    to learn them.
+    """
+    if limits is None:
+        limits = Limits()
+    if jobs is None:
+        jobs = min(32, os.cpu_count() or 1)
+    start = time.monotonic()
+    try:
+        os.makedirs(dest, exist_ok=True)
+        if zipfile.is_zipfile(archive_path):
+            members = _extract_zip(archive_path, dest, limits, jobs)
+        elif tarfile.is_tarfile(archive_path):
+            members = _extract_tar(archive_path, dest, limits)
+        else:
+            raise ArchiveError(f"{archive_path} is neither a zip nor a tar archive")
+    except OSError as ex:
+        raise ArchiveError(f"Failed to extract {archive_path}: {ex}")
+    return Extraction(
+        {member.path: member for member in members},
+        sum(member.size for member in members),
+        time.monotonic() - start,
+    )
@@ -0,0 +1,118 @@
+import json
+import logging
+from typing import List, NamedTuple, Optional, Tuple
+
+import colorama
+
+import trace_profile
+from checks import Check, State, checks, run_checks
+from classifier import worker_pool
+from report import Report
+
+
+class BatchError(Exception):
+    pass
+
+
+class BatchEntry(NamedTuple):
+    project: str
+    module: Optional[str]
+    version: str
+    git_hash: str
+    gpg_key: str
+
+    @property
+    def label(self) -> str:
+        return f"{self.module or self.project}-{self.version}"
+
+
+def load_batch(
+    path: str, default_project: str, default_gpg_key: Optional[str]
+) -> List[BatchEntry]:
+    """
+    Read the releases to verify from a JSON file, holding a list of objects
+    with the keys "version", "git_hash", and optionally "module", "project" and
+    "gpg_key". The latter two default to what's given on the command line.
+    """
+    with open(path) as f:
+        try:
+            raw_entries = json.load(f)
+        except ValueError as ex:
+            raise BatchError(f"{path} is not valid JSON: {ex}")
+    if not isinstance(raw_entries, list) or not raw_entries:
+        raise BatchError(f"{path} must contain a non-empty list of releases")
+
+    entries = []
+    for i, raw in enumerate(raw_entries):
+        if not isinstance(raw, dict):
+            raise BatchError(f"Entry {i} in {path} is not an object")
+        unknown = set(raw) - set(BatchEntry._fields)
+        if unknown:
+            raise BatchError(f"Entry {i} in {path} has unknown keys: {unknown}")
+        gpg_key = raw.get("gpg_key", default_gpg_key)
+        missing = [key for key in ["version", "git_hash"] if key not in raw]
+        if gpg_key is None:
+            missing.append("gpg_key")
+        if missing:
+            raise BatchError(f"Entry {i} in {path} is missing {', '.join(missing)}")
+        entries.append(
+            BatchEntry(
+                project=raw.get("project", default_project),
+                module=raw.get("module"),
+                version=raw["version"],
+                git_hash=raw["git_hash"],
+                gpg_key=str(gpg_key),
+            )
+        )
+
+    labels = [entry.label for entry in entries]
+    duplicates = {label for label in labels if labels.count(label) > 1}
+    if duplicates:
+        raise BatchError(f"Releases listed more than once: {', '.join(duplicates)}")
+    return entries
+
+
+def _init_worker(log_level: int, trace: bool, python_profile: bool) -> None:
+    # Worker processes start afresh, so they're set up like the main process
+    colorama.init()
+    logging.basicConfig(level=log_level)
+    trace_profile.enable(trace, python_profile)
+
+
+def _verify_in_worker(
+    state: State, label: str, check_indexes: List[int], jobs: int
+) -> Tuple[Report, trace_profile.Collected]:
+    # Output of all workers ends up interleaved, so tell it apart
+    for handler in logging.getLogger().handlers:
+        handler.setFormatter(logging.Formatter(f"[{label}] %(message)s"))
+    # Checks can't be pickled, so workers look them up by position
+    report = run_checks(state, [checks[i] for i in check_indexes], jobs)
+    return report, trace_profile.take()
+
+
+def verify_all(
+    states: List[State],
+    labels: List[str],
+    selected_checks: List[Check],
+    jobs: int,
+    batch_jobs: int,
+) -> List[Report]:
+    """
+    Run `selected_checks` for every release in `states`, `batch_jobs` of them
+    at a time, each in a process of its own with `jobs` threads. The worker
+    processes log at the same level and collect the same trace and profile
+    data as this one.
+    """
+    check_indexes = [checks.index(check) for check in selected_checks]
+    initargs = (logging.getLogger().getEffectiveLevel(), *trace_profile.enabled())
+    with worker_pool(batch_jobs, _init_worker, initargs) as executor:
+        futures = [
+            executor.submit(_verify_in_worker, state, label, check_indexes, jobs)
+            for state, label in zip(states, labels)
+        ]
+        reports = []
+        for future in futures:
+            report, collected = future.result()
+            trace_profile.add(collected)
+            reports.append(report)
+        return reports
@@ -0,0 +1,523 @@
+"""
+Benchmarks of the check pipeline on synthetic releases, to tell whether a
+change makes verifying releases faster or slower.
+
+    python src/benchmark.py --files 1000 --files 100000 --output after.json \\
+        --compare before.json
+
+Each release is generated once into --data-dir: a source tree of text and
+binary files, a local git repository with it committed, and a source archive
+with its .sha512 and .asc, signed by a throwaway key listed in KEYS. It's
+then downloaded from a local HTTP server and verified like main.py would.
+"""
+
+import contextlib
+import datetime
+import functools
+import hashlib
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import click
+
+import apache_2_license
+import metrics
+from checks import State, checks, run_checks
+from download import Downloader
+from helpers import header, sh, step
+from main import USER_AGENT, configure_logging, fetch_releases
+from report import Report, usage_dict
+
+PROJECT = "bench"
+VERSION = "1.0"
+REPO = "dev"
+ZIPNAME_TEMPLATE = "apache-{project}{dash_incubating}-{version}-source-release"
+SOURCEDIR_TEMPLATE = "{module_or_project}-{version}"
+REPONAME_TEMPLATE = "{incubator_dash}{project}.git"
+
+# Files per directory, and directories per module, of the generated trees
+FILES_PER_DIR = 100
+DIRS_PER_MODULE = 100
+TEXT_FILE_LINES = 40
+BINARY_FILE_SIZE = 4096
+
+# Slowdowns of less than this many seconds are noise, however large relatively
+MIN_SLOWDOWN = 0.05
+
+# Bump when generated releases change, so old ones in --data-dir are redone
+GENERATOR_VERSION = 1
+
+# The same commit for the same tree, whenever it's generated
+_GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Benchmark",
+    "GIT_AUTHOR_EMAIL": "benchmark@example.org",
+    "GIT_AUTHOR_DATE": "2020-01-01T00:00:00Z",
+    "GIT_COMMITTER_NAME": "Benchmark",
+    "GIT_COMMITTER_EMAIL": "benchmark@example.org",
+    "GIT_COMMITTER_DATE": "2020-01-01T00:00:00Z",
+}
+
+_JAVA_HEADER = """/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0.
+ */
+"""
+
+
+class ReleaseSpec(NamedTuple):
+    files: int
+    # Share of the files that are binary
+    binary_share: float
+    archive_extension: str
+    seed: int
+
+    @property
+    def name(self) -> str:
+        return (
+            f"files{self.files}-binary{self.binary_share:g}-"
+            f"{self.archive_extension}-seed{self.seed}"
+        )
+
+
+class Release(NamedTuple):
+    spec: ReleaseSpec
+    # Served over HTTP like dist.apache.org
+    dist_dir: str
+    # Base of the file:// URL of the git repository
+    git_dir: str
+    git_hash: str
+    gpg_key: str
+    archive_bytes: int
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def _run(
+    cmd: str, workdir: Optional[str] = None, env: Optional[Dict[str, str]] = None
+) -> str:
+    result = sh(cmd, workdir, env, quiet=True)
+    if result.status != 0:
+        raise BenchmarkError(
+            f"`{cmd}` exited with status {result.status}:\n{result.output_tail}"
+        )
+    return result.output_tail
+
+
+def _path(i: int) -> str:
+    module = i // (FILES_PER_DIR * DIRS_PER_MODULE)
+    directory = i // FILES_PER_DIR % DIRS_PER_MODULE
+    return f"module{module:03d}/src/main/java/pkg{directory:02d}/File{i:07d}"
+
+
+def _write_tree(source_dir: str, spec: ReleaseSpec) -> None:
+    rng = random.Random(spec.seed)
+    os.makedirs(source_dir)
+    with open(os.path.join(source_dir, "LICENSE"), "w") as f:
+        f.write(apache_2_license.text)
+    with open(os.path.join(source_dir, "NOTICE"), "w") as f:
+        f.write("Apache Bench\nCopyright 2020 The Apache Software Foundation\n")
+    with open(os.path.join(source_dir, "DISCLAIMER"), "w") as f:
+        f.write("Apache Bench is an effort undergoing incubation.\n")
+    for i in range(spec.files):
+        path = os.path.join(source_dir, _path(i))
+        if i % FILES_PER_DIR == 0:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        if rng.random() < spec.binary_share:
+            content = rng.getrandbits(8 * BINARY_FILE_SIZE).to_bytes(
+                BINARY_FILE_SIZE, "little"
+            )
+            path += ".bin"
+        else:
+            lines = [
+                f"    int field{n} = {rng.randrange(1 << 30)};\n"
+                for n in range(TEXT_FILE_LINES)
+            ]
+            name = os.path.basename(path)
+            content = f"{_JAVA_HEADER}class {name} {{\n{''.join(lines)}}}\n".encode()
+            path += ".java"
+        with open(path, "wb") as f:
+            f.write(content)
+
+
+def _generate_key(gnupg_home: str) -> str:
+    os.makedirs(gnupg_home, mode=0o700)
+    env = {"GNUPGHOME": gnupg_home}
+    _run(
+        "gpg --batch --passphrase '' --quick-gen-key "
+        "'Benchmark <benchmark@example.org>' ed25519 sign never",
+        env=env,
+    )
+    listing = _run("gpg --batch --with-colons --list-keys", env=env)
+    fingerprints = [
+        line.split(":")[9] for line in listing.splitlines() if line.startswith("fpr:")
+    ]
+    return fingerprints[0]
+
+
+def generate(data_dir: str, spec: ReleaseSpec) -> Release:
+    """Generate the release described by `spec`, unless it already was."""
+    root = os.path.join(data_dir, spec.name)
+    done_path = os.path.join(root, "release.json")
+    if os.path.exists(done_path):
+        with open(done_path) as f:
+            done = json.load(f)
+        if done["generator_version"] == GENERATOR_VERSION:
+            return Release(spec, **done["release"])
+    shutil.rmtree(root, ignore_errors=True)
+    step(f"Generating release {spec.name}")
+
+    state = State(
+        PROJECT,
+        None,
+        VERSION,
+        root,
+        True,
+        ZIPNAME_TEMPLATE,
+        SOURCEDIR_TEMPLATE,
+        REPONAME_TEMPLATE,
+        "",
+        "",
+        None,
+        archive_extension=spec.archive_extension,
+    )
+    source_name = os.path.relpath(state.source_dir, state.unzipped_dir)
+    repo_dir = os.path.join(root, "git", state.git_repo_name)
+    _write_tree(repo_dir, spec)
+    _run("git init --quiet . && git add -A", repo_dir)
+    _run("git commit --quiet -m 'Synthetic release'", repo_dir, _GIT_ENV)
+    git_hash = _run("git rev-parse HEAD", repo_dir).strip()
+
+    release_dir = os.path.join(root, "dist", REPO, "incubator", PROJECT, VERSION)
+    os.makedirs(release_dir)
+    archive_path = os.path.join(release_dir, os.path.basename(state.archive_path))
+    archive_format = "zip" if spec.archive_extension == "zip" else "tar.gz"
+    _run(
+        f"git archive --format={archive_format} --prefix={source_name}/ "
+        f"--output={archive_path} HEAD",
+        repo_dir,
+    )
+    digest = hashlib.sha512()
+    with open(archive_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    with open(archive_path + ".sha512", "w") as f:
+        f.write(f"{digest.hexdigest()}  {os.path.basename(archive_path)}\n")
+
+    gnupg_home = os.path.join(root, "gnupg")
+    gpg_key = _generate_key(gnupg_home)
+    env = {"GNUPGHOME": gnupg_home}
+    keys_path = os.path.join(root, "dist", REPO, "incubator", PROJECT, "KEYS")
+    _run(f"gpg --batch --armor --export > {keys_path}", env=env)
+    _run(f"gpg --batch --armor --detach-sign {archive_path}", env=env)
+
+    release = Release(
+        spec,
+        dist_dir=os.path.join(root, "dist"),
+        git_dir=os.path.join(root, "git"),
+        git_hash=git_hash,
+        gpg_key=gpg_key,
+        archive_bytes=os.path.getsize(archive_path),
+    )
+    with open(done_path, "w") as f:
+        json.dump(
+            {
+                "generator_version": GENERATOR_VERSION,
+                "spec": spec._asdict(),
+                "release": {
+                    key: value
+                    for key, value in release._asdict().items()
+                    if key != "spec"
+                },
+            },
+            f,
+            indent=2,
+        )
+    return release
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def _serve(directory: str) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(_QuietHandler, directory=directory)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(
+    release: Release,
+    jobs: int,
+    build_and_test_command: str,
+    work_root: str,
+    quiet: bool = True,
+) -> Dict:
+    """
+    Download and verify `release` once, and measure how long each part took.
+    With `quiet`, what the checks print is dropped.
+    """
+    server = _serve(release.dist_dir)
+    work_dir = tempfile.mkdtemp(dir=work_root)
+    with contextlib.ExitStack() as stack:
+        if quiet:
+            # Not a StringIO, as commands' output is written to sys.stdout.buffer
+            stack.enter_context(
+                contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w")))
+            )
+            logging.disable(logging.INFO)
+            stack.callback(logging.disable, logging.NOTSET)
+        return _run_release(release, jobs, build_and_test_command, server, work_dir)
+
+
+def _run_release(
+    release: Release,
+    jobs: int,
+    build_and_test_command: str,
+    server: ThreadingHTTPServer,
+    work_dir: str,
+) -> Dict:
+    try:
+        state = State(
+            PROJECT,
+            None,
+            VERSION,
+            work_dir,
+            True,
+            ZIPNAME_TEMPLATE,
+            SOURCEDIR_TEMPLATE,
+            REPONAME_TEMPLATE,
+            release.gpg_key,
+            release.git_hash,
+            build_and_test_command,
+            archive_extension=release.spec.archive_extension,
+            git_remote_base=f"file://{release.git_dir}",
+            interactive=False,
+        )
+        with metrics.measure() as fetch:
+            fetch_releases(
+                Downloader(USER_AGENT),
+                f"http://127.0.0.1:{server.server_address[1]}",
+                REPO,
+                [state],
+            )
+        start = time.monotonic()
+        report: Report = run_checks(state, checks, jobs)
+        wall_seconds = time.monotonic() - start
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return {
+        "fetch": usage_dict(fetch.usage),
+        "checks": {
+            result.name: {"kind": result.kind.name, **usage_dict(result.usage)}
+            for result in report.results
+        },
+        "wall_seconds": round(wall_seconds, 6),
+    }
+
+
+def _tool_commit() -> str:
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    result = sh(f"git -C {src_dir} describe --always --dirty", quiet=True)
+    return result.output_tail.strip() if result.status == 0 else "unknown"
+
+
+def _best_times(case: Dict) -> Dict[str, float]:
+    """The fastest of the runs of a case, per check, as the least noisy."""
+    times: Dict[str, float] = {}
+    for result in case["runs"]:
+        parts = [("fetch", result["fetch"]["wall_seconds"])]
+        parts += [(name, r["wall_seconds"]) for name, r in result["checks"].items()]
+        parts.append(("all checks", result["wall_seconds"]))
+        for name, seconds in parts:
+            times[name] = min(times.get(name, seconds), seconds)
+    return times
+
+
+def compare(baseline: Dict, results: Dict, threshold: float) -> List[str]:
+    """
+    Lines comparing the cases both `baseline` and `results` have, marking
+    what got slower by more than `threshold` (like 0.2 for 20%).
+    """
+    old_cases = {case["release"]: case for case in baseline["cases"]}
+    lines = [f"Compared with {baseline['commit']} ({baseline['created']})"]
+    for case in results["cases"]:
+        if case["release"] not in old_cases:
+            continue
+        lines.append(f"{case['release']}:")
+        old_times = _best_times(old_cases[case["release"]])
+        for name, seconds in _best_times(case).items():
+            if name not in old_times:
+                continue
+            old_seconds = old_times[name]
+            change = seconds / old_seconds - 1 if old_seconds else 0.0
+            slower = change > threshold and seconds - old_seconds > MIN_SLOWDOWN
+            marker = " SLOWER" if slower else ""
+            lines.append(
+                f"    {name}: {old_seconds:.3f}s -> {seconds:.3f}s "
+                f"({change:+.0%}){marker}"
+            )
+    return lines
+
+
+@click.command()
+@click.option(
+    "--files",
+    type=int,
+    multiple=True,
+    default=[1000, 10000],
+    show_default=True,
+    help="Number of files of a generated release; repeat for several releases.",
+)
+@click.option(
+    "--binary-share",
+    type=float,
+    multiple=True,
+    default=[0.1],
+    show_default=True,
+    help="Share of the files of a release that are binary; repeat to benchmark "
+    "each size with several mixes.",
+)
+@click.option(
+    "--archive-extension",
+    type=click.Choice(["zip", "tar.gz"]),
+    default="zip",
+    show_default=True,
+)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option(
+    "--repeat",
+    type=int,
+    default=3,
+    show_default=True,
+    help="Times to verify each release; comparisons use the fastest run.",
+)
+@click.option(
+    "--jobs",
+    type=int,
+    default=os.cpu_count() or 1,
+    show_default=True,
+    help="Number of checks to run concurrently, like main.py's --jobs.",
+)
+@click.option(
+    "--build-and-test-command",
+    default="true",
+    show_default=True,
+    help="Build command of the releases; the default skips building, which "
+    "would mostly measure the build tool.",
+)
+@click.option(
+    "--data-dir",
+    default=lambda: os.path.join(tempfile.gettempdir(), "release-benchmark"),
+    show_default="$TMPDIR/release-benchmark",
+    help="Where generated releases are kept, to be reused by later runs.",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, writable=True),
+    default="benchmark.json",
+    show_default=True,
+    help="Where to write the results, as JSON.",
+)
+@click.option(
+    "--compare",
+    "baseline_file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Results of an earlier run, say of another commit, to compare with.",
+)
+@click.option(
+    "--threshold",
+    type=float,
+    default=0.2,
+    show_default=True,
+    help="Relative slowdown from --compare's results that is flagged.",
+)
+@click.option("-v", "--verbose", is_flag=True)
+def main(
+    files: Tuple[int, ...],
+    binary_share: Tuple[float, ...],
+    archive_extension: str,
+    seed: int,
+    repeat: int,
+    jobs: int,
+    build_and_test_command: str,
+    data_dir: str,
+    output: str,
+    baseline_file: Optional[str],
+    threshold: float,
+    verbose: bool,
+) -> None:
+    configure_logging(verbose)
+    specs = [
+        ReleaseSpec(count, share, archive_extension, seed)
+        for count in files
+        for share in binary_share
+    ]
+    results: Dict = {
+        "commit": _tool_commit(),
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "jobs": jobs,
+        "build_and_test_command": build_and_test_command,
+        "cases": [],
+    }
+    try:
+        for spec in specs:
+            release = generate(data_dir, spec)
+            case: Dict = {
+                "release": spec.name,
+                **spec._asdict(),
+                "archive_bytes": release.archive_bytes,
+                "runs": [],
+            }
+            for i in range(repeat):
+                header(f"Benchmarking {spec.name}, run {i + 1} of {repeat}")
+                case["runs"].append(
+                    run(
+                        release,
+                        jobs,
+                        build_and_test_command,
+                        data_dir,
+                        quiet=not verbose,
+                    )
+                )
+            results["cases"].append(case)
+    except BenchmarkError as ex:
+        logging.error(str(ex))
+        sys.exit(1)
+
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    logging.info(f"Wrote results to {output}")
+    if baseline_file is not None:
+        with open(baseline_file) as f:
+            baseline = json.load(f)
+        header("Comparison")
+        for line in compare(baseline, results, threshold):
+            logging.info(line)
+
+
+if __name__ == "__main__":
+    main()
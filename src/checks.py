@@ -1,15 +1,54 @@
-import filecmp
 import functools
+import json
 import logging
 import os
+import re
+import shlex
+import subprocess
+import threading
+import time
 import traceback
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional, Tuple, Union
-
-import apache_2_license
-from helpers import sh, step
-from report import Report, Result, ResultKind, color_result
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import (
+    IO,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+import approvals
+import archive
+import checksums
+import gitignore
+import gittree
+import headers
+import licenses
+import metrics
+import mismatches
+import path_policy
+import pgp
+import result_cache
+import source_tree
+import trace_profile
+from approvals import ApprovalStore
+from classifier import Classifier
+from helpers import file_lock, sh, sh_all, step, substep
+from manifest import Manifest
+from mismatches import MismatchReport
+from path_policy import PathPolicy
+from pgp import KeyIndex, KeysError
+from project_config import ProjectConfig
+from report import SEVERITY, Report, Result, ResultKind, color_result
+from result_cache import ResultCache
+from source_tree import SourceTree
 
 
 @dataclass
@@ -25,6 +64,57 @@ class State:
     gpg_key: str
     git_hash: str
     build_and_test_command: Optional[str]
+    archive_extension: str = "zip"
+    extraction_limits: archive.Limits = archive.Limits()
+    # Inspect the archive without extracting it
+    triage: bool = False
+    git_remote_base: str = "https://github.com/apache"
+    # Where to keep bare mirrors of git repositories between runs, if at all
+    git_mirror_dir: Optional[str] = None
+    # Where builds keep downloaded dependencies between runs, if at all
+    build_cache_dir: Optional[str] = None
+    # "auto" builds offline once the build cache is warm, "always" and "never"
+    # do what they say
+    offline_build: str = "auto"
+    # Maven's -T, like "4" or "1C"
+    build_threads: Optional[str] = None
+    # Number of JVMs Maven runs tests in
+    test_forks: Optional[int] = None
+    # Seconds after which git and build commands are killed, if at all
+    command_timeout: Optional[float] = None
+    project_config: ProjectConfig = ProjectConfig()
+    # Results of earlier runs, if at all, and whether to use them rather
+    # than just to store new ones
+    result_cache: Optional[ResultCache] = None
+    use_cached_results: bool = True
+    # Contents of files someone reviewed before, if at all, and whether to
+    # ask someone to review the others
+    approvals: Optional[ApprovalStore] = None
+    interactive: bool = True
+
+    # Filled in as checks run, for later checks to use
+    extraction: Optional[archive.Extraction] = field(
+        default=None, compare=False, repr=False
+    )
+    source_tree: Optional[SourceTree] = field(default=None, compare=False, repr=False)
+    key_index: Optional[KeyIndex] = field(default=None, compare=False, repr=False)
+    manifest: Optional[Manifest] = field(default=None, compare=False, repr=False)
+    git_tree: Optional[Dict[str, gittree.GitEntry]] = field(
+        default=None, compare=False, repr=False
+    )
+    # Built from the default rules and project_config; counts rule matches
+    path_policy: PathPolicy = field(init=False, compare=False, repr=False)
+    # Shared by everything classifying files, so it only sniffs them once
+    classifier: Classifier = field(init=False, compare=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.classifier = Classifier()
+        rules = self.project_config.path_rules
+        self.path_policy = PathPolicy(
+            path_policy.DEFAULT_RULES,
+            rules.get("", {}),
+            rules.get(self.module, {}) if self.module is not None else {},
+        )
 
     def _generate_optional_placeholders(
         self, key: str, value: str, condition: bool
@@ -95,12 +185,12 @@ class State:
         return os.path.join(self.release_dir, filename)
 
     @property
-    def zip_path(self) -> str:
-        return self.base_path + ".zip"
+    def archive_path(self) -> str:
+        return f"{self.base_path}.{self.archive_extension}"
 
     @property
     def sha512_path(self) -> str:
-        return self.zip_path + ".sha512"
+        return self.archive_path + ".sha512"
 
     @property
     def keys_path(self) -> str:
@@ -108,7 +198,7 @@ class State:
 
     @property
     def asc_path(self) -> str:
-        return self.zip_path + ".asc"
+        return self.archive_path + ".asc"
 
     @property
     def unzipped_dir(self) -> str:
@@ -123,6 +213,10 @@ class State:
     def git_repo_name(self) -> str:
         return self._format_template(self.github_reponame_template)
 
+    @property
+    def git_url(self) -> str:
+        return f"{self.git_remote_base.rstrip('/')}/{self.git_repo_name}"
+
     @property
     def git_dir(self) -> str:
         return os.path.join(self.work_dir, "git", self.git_repo_name)
@@ -130,15 +224,152 @@ class State:
 
 R = Optional[Tuple[str, ResultKind]]
 CheckFun = Callable[[State], R]
+# Something a check's result depends on, rendered as a string
+Input = Callable[[State], str]
+
+
+@functools.lru_cache(maxsize=None)
+def _file_digest(path: str, size: int, mtime_ns: int) -> str:
+    # Size and mtime are part of the key so a changed file is hashed again
+    return checksums.compute_digests(path, ["sha256"]).hexdigests["sha256"]
+
+
+def _digest(path: str) -> str:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return "missing"
+    return _file_digest(path, stat.st_size, stat.st_mtime_ns)
+
+
+# Some tools start a JVM just to tell their version
+TOOL_VERSION_TIMEOUT = 60
+
+
+@functools.lru_cache(maxsize=None)
+def _tool_versions(tools: Tuple[str, ...]) -> Tuple[str, ...]:
+    """The `--version` output of each of `tools`, asked all at once."""
+    results = sh_all(
+        [f"{shlex.quote(tool)} --version" for tool in tools],
+        timeout=TOOL_VERSION_TIMEOUT,
+    )
+    return tuple(
+        # bash's status for commands it can't find
+        "missing" if result.status == 127 else result.output_tail.strip()
+        for result in results
+    )
+
+
+def _tool_version(tool: str) -> str:
+    return _tool_versions((tool,))[0]
+
+
+@functools.lru_cache(maxsize=None)
+def _code_version() -> str:
+    """A digest of this script's code, so changing any check invalidates results."""
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    return json.dumps(
+        [
+            (name, _digest(os.path.join(src_dir, name)))
+            for name in sorted(os.listdir(src_dir))
+            if name.endswith(".py")
+        ]
+    )
+
+
+def archive_digest(state: State) -> str:
+    return _digest(state.archive_path)
+
+
+def release_digest(state: State) -> str:
+    """Digests of everything in the release directory: archive, sidecars, .ascs."""
+    if not os.path.isdir(state.release_dir):
+        return "missing"
+    return json.dumps(
+        [
+            (name, _digest(os.path.join(state.release_dir, name)))
+            for name in sorted(os.listdir(state.release_dir))
+        ]
+    )
+
+
+def keys_digest(state: State) -> str:
+    return _digest(state.keys_path)
+
+
+def gpg_key(state: State) -> str:
+    return pgp.normalize_key_id(state.gpg_key)
+
+
+def gpgv_version(state: State) -> str:
+    return _tool_version("gpgv")
+
+
+def source_layout(state: State) -> str:
+    # Paths relative to the work dir, which is different for every run
+    return json.dumps(
+        [
+            os.path.relpath(state.archive_path, state.work_dir),
+            os.path.relpath(state.source_dir, state.unzipped_dir),
+            state.triage,
+            list(state.extraction_limits),
+        ]
+    )
+
+
+def git_revision(state: State) -> str:
+    return json.dumps([state.git_url, state.git_hash, _tool_version("git")])
+
+
+def project_config(state: State) -> str:
+    return json.dumps(state.project_config)
+
+
+def build_command(state: State) -> str:
+    return json.dumps(
+        [
+            state.build_and_test_command,
+            *_tool_versions(("mvn", "npm", "gradle", "cargo")),
+        ]
+    )
 
 
 class Check:
     def __init__(
-        self, fun: CheckFun, name: Optional[str] = None, hide_if_passing: bool = False
+        self,
+        fun: CheckFun,
+        name: Optional[str] = None,
+        hide_if_passing: bool = False,
+        depends_on: Optional[List["Check"]] = None,
+        interactive: bool = False,
+        needs_extraction: bool = False,
+        after: Optional[List["Check"]] = None,
+        inputs: Optional[List[Input]] = None,
     ):
         self._fun = fun
         self.name = self._generate_nice_name(name)
         self.hide_if_passing = hide_if_passing
+        # Checks that must have finished (passing or not) before this one starts
+        self.depends_on = list(depends_on or [])
+        # Checks that must have finished before this one starts, without this
+        # one needing anything they leave behind in the state
+        self.after = list(after or [])
+        # Interactive checks need the terminal, so they never run concurrently
+        # with any other check
+        self.interactive = interactive
+        # Checks that need the source archive extracted to disk can't run in
+        # triage mode
+        self.needs_extraction = needs_extraction
+        # Everything the result depends on besides what the checks in
+        # depends_on leave behind; results of checks without inputs are
+        # never cached
+        self.inputs = list(inputs or [])
+
+    def cache_key(self, inputs: Dict[Input, str]) -> str:
+        """The result cache's key for this check, given the values of its inputs."""
+        values = {fun.__name__: inputs[fun] for fun in self.inputs}
+        values["code"] = _code_version()
+        return result_cache.cache_key(self.name, values)
 
     def _generate_nice_name(self, name: Optional[str]):
         if name is not None:
@@ -158,20 +389,38 @@ class Check:
 
 
 def check(
-    name: Optional[str] = None, hide_if_passing: bool = False
+    name: Optional[str] = None,
+    hide_if_passing: bool = False,
+    depends_on: Optional[List[Check]] = None,
+    interactive: bool = False,
+    needs_extraction: bool = False,
+    after: Optional[List[Check]] = None,
+    inputs: Optional[List[Input]] = None,
 ) -> Callable[[CheckFun], Check]:
     def make_check(fun: CheckFun) -> Check:
-        c = Check(fun, name, hide_if_passing)
+        c = Check(
+            fun,
+            name,
+            hide_if_passing,
+            depends_on,
+            interactive,
+            needs_extraction,
+            after,
+            inputs,
+        )
         functools.update_wrapper(c, fun)
         return c
 
     return make_check
 
 
-def run_checks(state: State, checks: List[Check]) -> Report:
-    results = []
-    for check in checks:
-        step(f"Running check: {check.name}")
+def _run_check(state: State, check: Check) -> Result:
+    step(f"Running check: {check.name}")
+    with trace_profile.span(
+        check.name,
+        "check",
+        depends_on=[dep.name for dep in check.depends_on],
+    ) as span_args, trace_profile.python_profile(), metrics.measure() as meter:
         try:
             result = check(state)
         except Exception as ex:
@@ -181,40 +430,228 @@ def run_checks(state: State, checks: List[Check]) -> Report:
                 "".join(traceback.format_exception_only(ex.__class__, ex)).strip(),
                 ResultKind.ERROR,
             )
-        if not result.is_passed:
-            msg = str(result.message)
-            # Inline problem reporting for NOTE level problems
-            # shouldn't be colored
-            if result.kind is not ResultKind.NOTE:
-                msg = color_result(msg, result.kind)
-            print(msg)
-        results.append(result)
-    return Report(results)
+        span_args["result"] = result.kind.name
+    return result._replace(usage=meter.usage)
+
+
+def _print_inline_problem(result: Result) -> None:
+    if result.is_passed:
+        return
+    msg = str(result.message)
+    # Inline problem reporting for NOTE level problems
+    # shouldn't be colored
+    if result.kind is not ResultKind.NOTE:
+        msg = color_result(msg, result.kind)
+    print(msg)
+
+
+class _CachePlan:
+    """
+    Decides which checks are answered from the result cache as their inputs
+    become known. Each input is evaluated once, all of them at the same
+    time, so a check whose inputs are quick to tell (like the archive's
+    digest) doesn't wait for slow ones (like asking build tools their
+    version).
+
+    A check runs if it has no cached result, or if a check that runs depends
+    on it: that one needs what it leaves behind in the state (like the
+    extracted archive). So a check with a cached result is only skipped once
+    it's known that none of the checks depending on it runs.
+    """
+
+    def __init__(self, state: State, checks: List[Check], inputs: Dict[Input, Future]):
+        self.state = state
+        self.checks = checks
+        self.inputs = inputs
+        self.keys: Dict[Check, str] = {}
+        self.cached: Dict[Check, Result] = {}
+        self.to_run: Set[Check] = set()
+        self.from_cache: Set[Check] = set()
+        self._dependents = {
+            check: [other for other in checks if check in other.depends_on]
+            for check in checks
+        }
+
+    def waiting_for(self) -> List[Future]:
+        return [future for future in self.inputs.values() if not future.done()]
+
+    def _lookup(self, check: Check) -> Optional[bool]:
+        """Whether `check` has a cached result; None while that isn't known."""
+        cache = self.state.result_cache
+        if cache is None or not check.inputs:
+            return False
+        if check not in self.keys:
+            if any(not self.inputs[fun].done() for fun in check.inputs):
+                return None
+            try:
+                self.keys[check] = check.cache_key(
+                    {fun: self.inputs[fun].result() for fun in check.inputs}
+                )
+            except Exception as ex:
+                logging.debug(f"Not caching the result of {check.name}: {ex}")
+                return False
+            if self.state.use_cached_results:
+                cached = cache.lookup(self.keys[check], self.state.work_dir)
+                if cached is not None:
+                    self.cached[check] = cached
+        return check in self.cached
+
+    def update(self) -> List[Check]:
+        """Decide what can be decided now; returns the checks to run, in order."""
+        decided: List[Check] = []
+        changed = True
+        while changed:
+            changed = False
+            for check in self.checks:
+                if check in self.to_run or check in self.from_cache:
+                    continue
+                # Even a check that has to run waits for its key, which its
+                # result is stored under
+                cached = self._lookup(check)
+                if cached is None:
+                    continue
+                dependents = self._dependents[check]
+                if not cached or any(dep in self.to_run for dep in dependents):
+                    self.to_run.add(check)
+                    decided.append(check)
+                    changed = True
+                elif all(dep in self.from_cache for dep in dependents):
+                    self.from_cache.add(check)
+                    changed = True
+        return sorted(decided, key=self.checks.index)
+
+
+def _needs_terminal(state: State, check: Check) -> bool:
+    # Without a human to ask, interactive checks are like any other
+    return check.interactive and state.interactive
+
+
+def run_checks(state: State, checks: List[Check], jobs: int = 1) -> Report:
+    """
+    Run `checks` on a pool of `jobs` worker threads.
+
+    A check is started as soon as all of its prerequisites that are part of
+    `checks` have finished (whether or not they passed), so independent checks
+    run concurrently. Among the checks that are ready, the ones declared first
+    are started first; with `jobs=1` this is exactly declaration order.
+    Interactive checks take priority and run alone. The report lists results
+    in declaration order regardless of completion order.
+
+    With a result cache, checks whose inputs are unchanged since a run that
+    didn't find a problem (or only a warning) aren't run again.
+    """
+    jobs = max(jobs, 1)
+    results: Dict[Check, Result] = {}
+    pending: List[Check] = []
+    running: Dict[Future, Check] = {}
+    inputs: List[Input] = []
+    if state.result_cache is not None:
+        for check in checks:
+            inputs += [fun for fun in check.inputs if fun not in inputs]
+
+    with trace_profile.span(
+        "run_checks", "checks", project=state.project, version=state.version
+    ), ThreadPoolExecutor(max_workers=jobs) as executor, ThreadPoolExecutor(
+        max_workers=max(len(inputs), 1)
+    ) as input_executor:
+        plan = _CachePlan(
+            state, checks, {fun: input_executor.submit(fun, state) for fun in inputs}
+        )
+        while len(results) < len(checks):
+            pending += plan.update()
+            pending.sort(key=checks.index)
+            for check in checks:
+                if check in plan.from_cache and check not in results:
+                    logging.info(f"Using the cached result of {check.name}")
+                    results[check] = plan.cached[check]
+
+            blocked = set(checks) - set(results)
+            interactive_running = any(
+                _needs_terminal(state, c) for c in running.values()
+            )
+            for check in list(pending):
+                if interactive_running or len(running) >= jobs:
+                    break
+                if any(dep in blocked for dep in check.depends_on + check.after):
+                    continue
+                if _needs_terminal(state, check):
+                    if running:
+                        # Don't start anything else until this one had its turn
+                        break
+                    interactive_running = True
+                pending.remove(check)
+                running[executor.submit(_run_check, state, check)] = check
+
+            if len(results) == len(checks):
+                break
+            if not running and not plan.waiting_for():
+                raise Exception(
+                    "Circular dependency between checks: "
+                    + ", ".join(check.name for check in checks if check not in results)
+                )
+
+            done, _ = wait(
+                list(running) + plan.waiting_for(), return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                if future not in running:
+                    continue
+                check = running.pop(future)
+                result = future.result()
+                _print_inline_problem(result)
+                results[check] = result
+                if check in plan.keys:
+                    assert state.result_cache is not None
+                    state.result_cache.store(plan.keys[check], result, state.work_dir)
+
+    return Report(
+        [results[check] for check in checks], state.path_policy.match_counts()
+    )
+
+
+# Lines of a failed command's output shown in its result
+OUTPUT_TAIL_LINES = 20
 
 
 def _check_sh(
     cmds: Union[str, List[str]],
     workdir: Optional[str] = None,
     failure_level=ResultKind.FAIL,
+    env: Optional[Dict[str, str]] = None,
+    output: Optional[IO] = None,
+    timeout: Optional[float] = None,
+    capture: bool = True,
 ) -> R:
     if isinstance(cmds, str):
         cmds = [cmds]
     for cmd in cmds:
-        status = sh(cmd, workdir)
-        if status != 0:
+        result = sh(cmd, workdir, env, output, timeout, capture)
+        if result.status != 0:
             msg = f"Executing `{cmd}`"
             if workdir is not None:
                 msg += f" in {workdir}"
-            msg += f" exited with non-zero status code {status}. "
-            msg += "See above for output. (Note that the command was run under "
-            msg += "`set -euo pipefail`)"
+            if result.timed_out:
+                msg += f" timed out after {timeout:g} seconds"
+            else:
+                msg += f" exited with non-zero status code {result.status}"
+            msg += (
+                f" (CPU time {result.cpu_seconds:.1f}s, "
+                f"max RSS {result.max_rss_kib // 1024} MiB). "
+            )
+            tail = result.output_tail.rstrip().splitlines()[-OUTPUT_TAIL_LINES:]
+            if tail:
+                msg += "Last lines of output:\n"
+                msg += "".join(f"    {line}\n" for line in tail)
+            else:
+                msg += "See above for output. "
+            msg += "(Note that the command was run under `set -euo pipefail`)"
             return msg, failure_level
     return None
 
 
 @check("Source archive has expected name")
 def check_zip_file_exists(state: State) -> R:
-    return _check_sh(f"test -f {state.zip_path}")
+    return _check_sh(f"test -f {state.archive_path}")
 
 
 @check("SHA512 checksum exists with expected name", hide_if_passing=True)
@@ -232,240 +669,615 @@ def check_keys_file_exists(state: State) -> R:
     return _check_sh(f"test -f {state.keys_path}")
 
 
-@check("SHA512 checksum is correct")
-def check_sha512(state: State) -> R:
-    return _check_sh(f"sha512sum -c {state.sha512_path}", workdir=state.release_dir)
+@check(
+    "Checksums are correct",
+    depends_on=[check_zip_file_exists, check_sha512_file_exists],
+    inputs=[release_digest],
+)
+def check_checksums(state: State) -> R:
+    sidecars = checksums.find_sidecars(state.archive_path)
+    if not sidecars:
+        return "No checksum files found", ResultKind.FAIL
+    substep(f"Verifying {', '.join(os.path.basename(p) for p in sidecars.values())}")
+    errors, digests = checksums.verify_sidecars(state.archive_path, sidecars)
+    logging.info(
+        f"Hashed {digests.size / 2**20:.1f} MiB with "
+        f"{', '.join(digests.hexdigests.keys())} in {digests.seconds:.2f}s "
+        f"({digests.throughput / 2**20:.1f} MiB/s)"
+    )
+    if errors:
+        return "\n".join(errors), ResultKind.FAIL
+    return None
+
+
+def _find_key(state: State) -> pgp.Key:
+    if state.key_index is None:
+        state.key_index = KeyIndex.from_file(state.keys_path)
+    return state.key_index.find(state.gpg_key)
 
 
-@check("Provided GPG key is in KEYS file")
+@check(
+    "Provided GPG key is in KEYS file",
+    depends_on=[check_keys_file_exists],
+    inputs=[keys_digest, gpg_key],
+)
 def check_gpg_key_in_keys_file(state: State) -> R:
-    return _check_sh(
-        "gpg --with-colons --import-options import-show "
-        f"--dry-run --import {state.keys_path} "
-        "| grep '^pub:' | cut -f5 -d: "
-        f"| grep '{state.gpg_key}$'"
-    )
+    try:
+        key = _find_key(state)
+    except KeysError as ex:
+        return str(ex), ResultKind.FAIL
+    logging.info(f"Found key {key.fingerprint} in KEYS")
+    return None
 
 
-@check("GPG signature is valid, made with the provided key")
+@check(
+    "GPG signature is valid, made with the provided key",
+    depends_on=[
+        check_zip_file_exists,
+        check_asc_file_exists,
+        check_keys_file_exists,
+        check_gpg_key_in_keys_file,
+    ],
+    inputs=[release_digest, keys_digest, gpg_key, gpgv_version],
+)
 def check_gpg_signature(state: State) -> R:
-    full_keyring = os.path.join(state.work_dir, "gpg.keyring.all")
-    strict_keyfile = os.path.join(state.work_dir, "KEYS.strict")
-    strict_keyring = os.path.join(state.work_dir, "gpg.keyring.strict")
+    try:
+        key = _find_key(state)
+    except KeysError as ex:
+        return str(ex), ResultKind.FAIL
+
+    # Verify all signatures in the release, not just the archive's
+    signatures = {state.asc_path: state.archive_path}
+    for name in os.listdir(state.release_dir):
+        if name.endswith(".asc"):
+            path = os.path.join(state.release_dir, name)
+            signatures[path] = os.path.splitext(path)[0]
+    errors = [
+        f"{path}: signed file {signed_path} does not exist"
+        for path, signed_path in signatures.items()
+        if not os.path.exists(signed_path)
+    ]
+    signatures = {
+        path: signed_path
+        for path, signed_path in signatures.items()
+        if os.path.exists(signed_path)
+    }
+    for result in pgp.verify_signatures(key, signatures):
+        if result.error is not None:
+            errors.append(f"{result.signature_path}: {result.error}")
+    if errors:
+        return "\n".join(errors), ResultKind.FAIL
+    logging.info(f"Verified {len(signatures)} signatures made with {key.fingerprint}")
+    return None
 
-    # The dance with importing/exporting/importing is needed so that we end up
-    # with a keyring containing exactly the key the release is said to be made
-    # with, and verify the signature against that key, and that key only.
-    return _check_sh(
-        [
-            # Import all keys from the KEYS file
-            (
-                f"gpg --no-default-keyring --keyring {full_keyring} "
-                f"--import {state.keys_path}"
-            ),
-            # Export only the key the release is said to be made with
-            (
-                f"gpg --no-default-keyring --keyring {full_keyring} "
-                f"--export --armor {state.gpg_key} > {strict_keyfile}"
-            ),
-            # Create keyring with only the wanted key
-            (
-                f"gpg --no-default-keyring --keyring {strict_keyring} "
-                f"--import {strict_keyfile}"
-            ),
-            # Check the signature using exactly the key provided
-            (f"gpgv --keyring {strict_keyring} {state.asc_path} {state.zip_path}"),
-        ]
+
+@check(
+    "Source archive can be extracted",
+    hide_if_passing=True,
+    depends_on=[check_zip_file_exists],
+    inputs=[archive_digest, source_layout],
+)
+def check_unzip(state: State) -> R:
+    sourcedir_name = os.path.relpath(state.source_dir, state.unzipped_dir)
+    if state.triage:
+        try:
+            state.source_tree = source_tree.open_archive(
+                state.archive_path, sourcedir_name, state.extraction_limits
+            )
+        except archive.ArchiveError as ex:
+            return str(ex), ResultKind.FAIL
+        return None
+
+    try:
+        state.extraction = archive.extract(
+            state.archive_path, state.unzipped_dir, state.extraction_limits
+        )
+    except archive.ArchiveError as ex:
+        return str(ex), ResultKind.FAIL
+    extraction = state.extraction
+    logging.info(
+        f"Extracted {len(extraction.members)} files "
+        f"({extraction.total_size / 2**20:.1f} MiB) in {extraction.seconds:.2f}s"
+    )
+    state.source_tree = source_tree.DirectoryTree(
+        state.source_dir,
+        {
+            os.path.relpath(path, sourcedir_name): member.sha256
+            for path, member in extraction.members.items()
+        },
     )
+    return None
 
 
-@check("Source archive can be unzipped", hide_if_passing=True)
-def check_unzip(state: State) -> R:
-    return _check_sh(f"unzip -q -d {state.unzipped_dir} {state.zip_path}")
+def _source_tree(state: State) -> SourceTree:
+    if state.source_tree is None:
+        raise Exception("The source archive could not be read")
+    return state.source_tree
+
+
+def _manifest(state: State) -> Manifest:
+    if state.manifest is None:
+        raise Exception("The source directory could not be listed")
+    return state.manifest
 
 
-@check("Base dir in archive has expected name")
+@check(
+    "Base dir in archive has expected name",
+    depends_on=[check_unzip],
+    inputs=[archive_digest, source_layout],
+)
 def check_source_dir_in_zip(state: State) -> R:
-    return _check_sh(f"test -d {state.source_dir}")
-
-
-def _check_dircmp_only_either_allowed(diff: filecmp.dircmp) -> List[str]:
-    errors = []
-    allowed_left_only = [
-        ".git",
-        ".gitignore",
-        ".github",
-        ".gitattributes",
-        ".travis.yml",
-        ".mvn",
-        "mvnw",
-        "mvnw.cmd",
-        "Jenkinsfile",
-        "CONTRIBUTING",
-        "CONTRIBUTING.md",
-    ]
-    allowed_right_only: List[str] = ["DEPENDENCIES", "dependency-reduced-pom.xml"]
-    # Check files only in the git checkout
-    for filename in diff.left_only:
-        if filename not in allowed_left_only:
-            errors.append(
-                os.path.join(diff.left, filename) + " is only in the git checkout"
-            )
-    # Check files only in the source archive
-    for filename in diff.right_only:
-        if filename not in allowed_right_only:
-            errors.append(
-                os.path.join(diff.right, filename) + " is only in the source archive"
-            )
-    # And recurse into subdirectories
-    for subdiff in diff.subdirs.values():
-        errors += _check_dircmp_only_either_allowed(subdiff)
-    return errors
+    tree = _source_tree(state)
+    if not tree.exists(""):
+        return f"{state.source_dir} does not exist", ResultKind.FAIL
+    # All later checks look at the source directory, so list it for them once
+    start = time.monotonic()
+    state.manifest = Manifest(tree, state.classifier)
+    logging.debug(
+        f"Listed {len(state.manifest)} entries in the source directory "
+        f"in {time.monotonic() - start:.2f}s"
+    )
+    return None
 
 
-def _check_dircmp_no_diff_files(diff: filecmp.dircmp) -> List[str]:
-    errors: List[str] = []
-    if diff.diff_files:
-        errors += "The contents of the following files differ: " + " ".join(
-            diff.diff_files
+def _check_only_either_allowed(
+    comparison: gittree.TreeComparison,
+    state: State,
+    archive: Dict[str, str],
+    report: MismatchReport,
+) -> None:
+    policy = state.path_policy
+    # Only files are listed in either tree, so anything else is a directory
+    git_tree = _git_tree(state)
+    allowed_left_only = set(
+        policy.select(
+            path_policy.ONLY_IN_GIT,
+            ((path, path not in git_tree) for path in comparison.only_in_git),
+        )
+    )
+    allowed_right_only = set(
+        policy.select(
+            path_policy.ONLY_IN_ARCHIVE,
+            ((path, path not in archive) for path in comparison.only_in_archive),
         )
-    for subdiff in diff.subdirs.values():
-        errors += _check_dircmp_no_diff_files(subdiff)
-    return errors
+    )
+    # Check files only in git
+    for path in comparison.only_in_git:
+        if path not in allowed_left_only:
+            report.add(f"Only in git at {state.git_hash}", path)
+    # Check files only in the source archive
+    for path in comparison.only_in_archive:
+        if path not in allowed_right_only:
+            report.add(f"Only in the source archive in {state.source_dir}", path)
 
 
-def _check_dircmp_no_funny_files(diff: filecmp.dircmp) -> List[str]:
-    errors: List[str] = []
-    if diff.funny_files:
-        errors += "Failed to compare contents of the following files: " + " ".join(
-            diff.diff_files
+def _archive_blob_ids(state: State) -> Dict[str, str]:
+    """Git blob ids of the files in the source directory, by relative path."""
+    if state.extraction is not None:
+        sourcedir_name = os.path.relpath(state.source_dir, state.unzipped_dir)
+        prefix = sourcedir_name + "/"
+        return {
+            path.replace(prefix, "", 1): member.git_sha1
+            for path, member in state.extraction.members.items()
+            if path.startswith(prefix)
+        }
+    return {
+        entry.path: gittree.blob_sha1(os.path.join(state.source_dir, entry.path))
+        for entry in _manifest(state)
+        if not entry.is_dir
+    }
+
+
+# Fetching blobs of a partial clone one by one is slow, so only this many
+# differing files are diffed
+DETAIL_DIFF_MAX_FILES = 100
+
+
+def _diff_small_files(
+    state: State, differing: List[str], report: MismatchReport
+) -> None:
+    """Diff the first of the `differing` files that are small enough."""
+    paths = []
+    for path in differing:
+        archive_path = os.path.join(state.source_dir, path)
+        if (
+            not os.path.islink(archive_path)
+            and os.path.getsize(archive_path) <= mismatches.DIFF_MAX_BYTES
+        ):
+            paths.append(path)
+            if len(paths) == DETAIL_DIFF_MAX_FILES:
+                break
+    git_tree = _git_tree(state)
+    blobs = gittree.read_blobs(state.git_dir, {git_tree[path].sha for path in paths})
+    for path in paths:
+        with open(os.path.join(state.source_dir, path), "rb") as f:
+            content = f.read()
+        report.add_diff(
+            path,
+            blobs[git_tree[path].sha],
+            content,
+            f"git at {state.git_hash}",
+            "source archive",
         )
-    for subdiff in diff.subdirs.values():
-        errors += _check_dircmp_no_diff_files(subdiff)
-    return errors
 
 
-@check("Git tree at provided revision matches source archive")
-def check_git_revision(state: State) -> R:
-    sh_result = _check_sh(
+def _update_git_mirror(state: State, mirror: str) -> R:
+    """Create or update the bare mirror, making sure it has the wanted commit."""
+    with file_lock(mirror + ".lock"):
+        if not os.path.isdir(mirror):
+            return _check_sh(
+                f"git clone --quiet --mirror {state.git_url} {mirror}",
+                timeout=state.command_timeout,
+            )
+        result = _check_sh(
+            [
+                f"git -C {mirror} remote set-url origin {state.git_url}",
+                f"git -C {mirror} fetch --quiet --prune origin",
+            ],
+            timeout=state.command_timeout,
+        )
+        has_commit = f"git -C {mirror} cat-file -e {state.git_hash}"
+        if result is None and sh(has_commit).status != 0:
+            # Not reachable from any branch or tag, ask for it explicitly
+            result = _check_sh(
+                f"git -C {mirror} fetch --quiet origin {state.git_hash}",
+                timeout=state.command_timeout,
+            )
+        return result
+
+
+def _fetch_git_revision(state: State) -> R:
+    """
+    Get the tree of the wanted commit into state.git_dir, transferring as
+    little as possible. With a mirror, the objects are shared with it instead
+    of being copied. Without one, only the commit and its trees are fetched;
+    blobs are fetched lazily if something needs them after all.
+    """
+    if state.git_mirror_dir is not None:
+        mirror = os.path.join(state.git_mirror_dir, state.git_repo_name)
+        return _update_git_mirror(state, mirror) or _check_sh(
+            f"git clone --quiet --no-checkout --shared {mirror} {state.git_dir}",
+            timeout=state.command_timeout,
+        )
+    git = f"git -C {state.git_dir}"
+    return _check_sh(
         [
+            f"git init --quiet {state.git_dir}",
+            f"{git} remote add origin {state.git_url}",
+            # Servers that don't allow fetching commits by id need a full fetch
             (
-                f"git clone https://github.com/apache/{state.git_repo_name} "
-                f"{state.git_dir}"
+                f"{git} fetch --quiet --depth 1 --filter=blob:none "
+                f"origin {state.git_hash} "
+                f"|| {git} fetch --quiet --filter=blob:none origin"
             ),
-            (
-                f"git --work-tree {state.git_dir} "
-                f"--git-dir {state.git_dir}/.git "
-                f"checkout --quiet {state.git_hash}"
-            ),
-        ]
+        ],
+        timeout=state.command_timeout,
     )
-    if sh_result is not None:
-        return sh_result
-
-    logging.info("NOTE: The following diff output is only informational.")
-    logging.info("NOTE: The actual verification is done in Python.")
-    sh(f"diff --recursive {state.git_dir} {state.source_dir}")
 
-    diff = filecmp.dircmp(state.git_dir, state.source_dir, ignore=[])
-    errors: List[str] = []
 
-    # First, check that any files appearing in only one tree are allowed
-    errors += _check_dircmp_only_either_allowed(diff)
-
-    # Then make sure that all files that exist in both places have no diff
-    errors += _check_dircmp_no_diff_files(diff)
-    # And finally that there we could compare all the files
-    errors += _check_dircmp_no_funny_files(diff)
+@check(
+    "Git tree at provided revision matches source archive",
+    depends_on=[check_source_dir_in_zip],
+    needs_extraction=True,
+    inputs=[archive_digest, source_layout, git_revision, project_config],
+)
+def check_git_revision(state: State) -> R:
+    sh_result = _fetch_git_revision(state)
+    if sh_result is not None:
+        return sh_result
 
-    if errors:
-        errors.append("See above for a full output of diff.")
-        return "\n".join(errors), ResultKind.WARN
+    try:
+        state.git_tree = gittree.ls_tree(state.git_dir, state.git_hash)
+    except subprocess.CalledProcessError as ex:
+        return (
+            f"Failed to list the tree of {state.git_hash}: "
+            f"{ex.stderr.decode(errors='replace').strip()}",
+            ResultKind.FAIL,
+        )
+    archive = _archive_blob_ids(state)
+    comparison = gittree.compare(state.git_tree, archive)
+
+    # Mismatches can run into the millions with the wrong revision, so only a
+    # summary goes into the result, and the details into a file
+    detail_path = os.path.join(state.work_dir, "git-mismatches.txt")
+    with open(detail_path, "w") as detail:
+        report = MismatchReport(detail)
+        # First, check that any files appearing in only one tree are allowed
+        _check_only_either_allowed(comparison, state, archive, report)
+        # Then make sure that all files that exist in both places have no diff
+        for path in comparison.differing:
+            report.add("Contents differ", path)
+        _diff_small_files(state, comparison.differing, report)
+        # And finally that there we could compare all the files
+        for path in comparison.uncomparable:
+            report.add("Failed to compare contents", path)
+
+    if not report.empty:
+        lines = report.summary() + [f"All mismatches are listed in {detail_path}"]
+        return "\n".join(lines), ResultKind.WARN
     return None
 
 
-@check("No blacklisted files in the source archive", hide_if_passing=True)
+@check(
+    "No blacklisted files in the source archive",
+    hide_if_passing=True,
+    depends_on=[check_source_dir_in_zip],
+    inputs=[archive_digest, source_layout, project_config],
+)
 def check_blacklisted_files(state: State) -> R:
-    blacklist = [".git", ".gitignore", ".mvn", "mvnw", "mvnw.cmd", "Jenkinsfile"]
-    commands = [
-        f"find {state.source_dir} -name {item} | ifne bash -c 'cat && false'"
-        for item in blacklist
+    found = [
+        os.path.join(state.source_dir, path)
+        for path in state.path_policy.select(
+            path_policy.FORBIDDEN_IN_ARCHIVE,
+            ((entry.path, entry.is_dir) for entry in _manifest(state)),
+        )
     ]
-    return _check_sh(commands)
+    if found:
+        return "Blacklisted files found:\n" + "\n".join(found), ResultKind.FAIL
+    return None
+
+
+def _git_tree(state: State) -> Dict[str, gittree.GitEntry]:
+    if state.git_tree is None:
+        raise Exception(f"The git tree at {state.git_hash} could not be listed")
+    return state.git_tree
+
+
+def _gitignore(state: State) -> gitignore.Gitignore:
+    """The rules of all .gitignore files in git, read without a checkout."""
+    shas = {
+        path.rpartition("/")[0]: entry.sha
+        for path, entry in _git_tree(state).items()
+        if path.rpartition("/")[2] == ".gitignore" and entry.type == "blob"
+    }
+    blobs = gittree.read_blobs(state.git_dir, shas.values())
+    return gitignore.Gitignore(
+        {
+            directory: blobs[sha].decode("utf-8", errors="surrogateescape")
+            for directory, sha in shas.items()
+        }
+    )
 
 
-@check("No .gitignore-d files in git checkout", hide_if_passing=True)
+# Both need the tree listed by check_git_revision, which can't run in triage mode
+@check(
+    "No .gitignore-d files in git checkout",
+    hide_if_passing=True,
+    depends_on=[check_git_revision],
+    needs_extraction=True,
+    inputs=[git_revision],
+)
 def check_gitignore_in_repo(state: State) -> R:
-    return _check_sh("shopt -s globstar; ! git check-ignore **", workdir=state.git_dir)
+    ignored = _gitignore(state).ignored(
+        # Submodules are directories in the checkout
+        (path, entry.type == "commit")
+        for path, entry in _git_tree(state).items()
+    )
+    if ignored:
+        # Unlike `git check-ignore`, which skips tracked files; here every file
+        # is tracked, and committing one that's ignored takes `git add -f`
+        return (
+            f"Files committed at {state.git_hash} although .gitignore matches "
+            "them:\n" + "\n".join(ignored),
+            ResultKind.WARN,
+        )
+    return None
 
 
-@check("No .gitignore-d files in source archive", hide_if_passing=False)
+@check(
+    "No .gitignore-d files in source archive",
+    hide_if_passing=False,
+    depends_on=[check_git_revision],
+    needs_extraction=True,
+    inputs=[archive_digest, source_layout, git_revision],
+)
 def check_gitignore_in_release(state: State) -> R:
-    result = _check_sh(
-        f"find . -name .gitignore | xargs cp --parents -t {state.source_dir}",
-        workdir=state.git_dir,
+    ignored = _gitignore(state).ignored(
+        (entry.path, entry.is_dir) for entry in _manifest(state)
     )
-    if not result:
-        result = _check_sh(
-            [
-                "git init --quiet && git add .",
-                "shopt -s globstar; ! git check-ignore **",
-            ],
-            workdir=state.source_dir,
+    if ignored:
+        return (
+            ".gitignore-d files found:\n"
+            + "\n".join(os.path.join(state.source_dir, path) for path in ignored),
+            ResultKind.FAIL,
         )
-    sh(f"rm -rf {state.source_dir}/.git")
-    sh(f"find {state.source_dir} -name .gitignore -delete")
-    return result
+    return None
 
 
-def _check_file_looks_good(path: str) -> R:
-    prompt = f"Did the contents of {path} look good to you? [y/N] "
-    return _check_sh(
-        [f"less {path}", f"read -r -p '{prompt}' response; test \"$response\" == y"]
+def _check_file_looks_good(state: State, name: str) -> R:
+    """
+    Have someone review file `name` of the source directory, unless the same
+    content was approved for the project before. If a different version of it
+    was, only the changes since are shown.
+    """
+    path = os.path.join(state.source_dir, name)
+    if not os.path.isfile(path):
+        return f"{path} does not exist", ResultKind.FAIL
+    with open(path, encoding="utf-8", errors="replace") as f:
+        content = f.read()
+    store = state.approvals
+    if store is not None and store.is_approved(state.project, name, content):
+        logging.info(f"The contents of {path} were approved before")
+        return None
+
+    previous = None if store is None else store.last_approved(state.project, name)
+    review_path = path
+    if previous is not None:
+        review_path = os.path.join(state.work_dir, f"{name}.diff")
+        with open(review_path, "w") as f:
+            f.writelines(approvals.diff(previous, content, name))
+    if not state.interactive:
+        if previous is None:
+            return f"{path} needs review", ResultKind.WARN
+        return (
+            f"{path} needs review, it changed since it was last approved "
+            f"(see {review_path})",
+            ResultKind.WARN,
+        )
+
+    if previous is None:
+        prompt = f"Did the contents of {path} look good to you? [y/N] "
+    else:
+        prompt = f"Did the changes to {path} look good to you? [y/N] "
+    result = _check_sh(
+        [
+            f"less {shlex.quote(review_path)}",
+            f"read -r -p '{prompt}' response; test \"$response\" == y",
+        ],
+        # They need the terminal
+        capture=False,
     )
+    if result is None and store is not None:
+        store.approve(state.project, name, content)
+    return result
 
 
-@check("DISCLAIMER and NOTICE look good")
+@check(
+    "DISCLAIMER and NOTICE look good",
+    depends_on=[check_source_dir_in_zip],
+    interactive=True,
+    needs_extraction=True,
+)
 def check_disclaimer_and_notice_look_good(state: State) -> R:
-    errors = []
-    for path in ["DISCLAIMER", "NOTICE"]:
-        result = _check_file_looks_good(os.path.join(state.source_dir, path))
+    problems = []
+    for name in ["DISCLAIMER", "NOTICE"]:
+        result = _check_file_looks_good(state, name)
         if result is not None:
-            errors.append(result[0])
-    if errors:
-        return "\n".join(errors), ResultKind.FAIL
+            problems.append(result)
+    if problems:
+        return (
+            "\n".join(message for message, _ in problems),
+            max((kind for _, kind in problems), key=SEVERITY.index),
+        )
     return None
 
 
-@check("LICENSE is Apache 2.0", hide_if_passing=True)
+@check(
+    "LICENSE is Apache 2.0",
+    hide_if_passing=True,
+    depends_on=[check_source_dir_in_zip],
+    inputs=[archive_digest, source_layout],
+)
 def check_license_is_apache_2(state: State) -> R:
-    actual_license_path = os.path.join(state.source_dir, "LICENSE")
-    expected_license = apache_2_license.text
-    with open(actual_license_path, "r") as f:
-        actual_license = f.read()
-    if not actual_license.startswith(expected_license):
-        return "LICENSE does not look like an Apache 2.0 license", ResultKind.FAIL
+    text = _source_tree(state).read("LICENSE").decode("utf-8", errors="replace")
+    if licenses.starts_with_apache_2(text):
+        return None
+    sections = licenses.identify(text)
+    if sections and sections[0].license is licenses.APACHE_2:
+        return (
+            "LICENSE starts with a modified Apache 2.0 license "
+            f"({sections[0].score:.1%} of its text matches)",
+            ResultKind.FAIL,
+        )
+    return "LICENSE does not look like an Apache 2.0 license", ResultKind.FAIL
+
+
+def _describe_section(section: licenses.Section) -> str:
+    lines = f"lines {section.first_line}-{section.last_line}"
+    if section.license is None:
+        return f"unidentified text ({lines})"
+    description = f"{section.license.spdx_id} ({lines}"
+    if section.score < 1:
+        description += f", {section.score:.1%} match"
+    description += f", category {section.license.category})"
+    return description
+
+
+@check(
+    "Licenses in LICENSE and COPYING files",
+    depends_on=[check_source_dir_in_zip],
+    inputs=[archive_digest, source_layout],
+)
+def check_bundled_licenses(state: State) -> R:
+    tree = _source_tree(state)
+    found = []
+    category_x = []
+    for entry in _manifest(state).files():
+        if not entry.name.upper().startswith(("LICENSE", "COPYING")):
+            continue
+        text = tree.read(entry.path).decode("utf-8", errors="replace")
+        sections = licenses.identify(text)
+        if [section.license for section in sections] == [licenses.APACHE_2]:
+            continue
+        path = os.path.join(state.source_dir, entry.path)
+        found.append(f"{path}: " + ", ".join(_describe_section(s) for s in sections))
+        category_x += [
+            f"{path}: {section.license.spdx_id}"
+            for section in sections
+            if section.license is not None and section.license.category == "X"
+        ]
+    if category_x:
+        return (
+            "Category X licenses, which must not be in a release:\n"
+            + "\n".join(category_x)
+            + "\n\nAll licenses found:\n"
+            + "\n".join(found),
+            ResultKind.WARN,
+        )
+    if found:
+        return "Licenses besides Apache 2.0:\n" + "\n".join(found), ResultKind.NOTE
     return None
 
 
-@check("LICENSE looks good")
+@check(
+    "Source files have license headers",
+    depends_on=[check_source_dir_in_zip],
+    inputs=[archive_digest, source_layout, project_config],
+)
+def check_license_headers(state: State) -> R:
+    tree = _source_tree(state)
+    missing = headers.missing_headers(
+        [entry.path for entry in _manifest(state).files()],
+        tree.read_prefix,
+        state.project_config.header_exclusions,
+        parallel=tree.supports_worker_reads,
+    )
+    if missing:
+        return (
+            "Files without a license header (exclude files in the project "
+            "config if they don't need one):\n"
+            + "\n".join(os.path.join(state.source_dir, path) for path in missing),
+            ResultKind.WARN,
+        )
+    return None
+
+
+@check(
+    "LICENSE looks good",
+    depends_on=[check_source_dir_in_zip],
+    interactive=True,
+    needs_extraction=True,
+)
 def check_license_looks_good(state: State) -> R:
-    return _check_file_looks_good(os.path.join(state.source_dir, "LICENSE"))
+    return _check_file_looks_good(state, "LICENSE")
 
 
-@check("No binary files in the release")
+@check(
+    "No binary files in the release",
+    depends_on=[check_source_dir_in_zip],
+    inputs=[archive_digest, source_layout],
+)
 def check_no_binary_files(state: State) -> R:
-    return _check_sh(
-        f"diff <(echo -n) <(find {state.source_dir} -type f "
-        "| xargs file | grep -v text | cut -f1 -d:)",
-        failure_level=ResultKind.NOTE,
-    )
+    manifest = _manifest(state)
+    classifications = manifest.classify([entry.path for entry in manifest.files()])
+    binaries = [
+        f"{os.path.join(state.source_dir, path)}: {classification.kind}"
+        for path, classification in sorted(classifications.items())
+        if classification.is_binary
+    ]
+    if binaries:
+        return "\n".join(binaries), ResultKind.NOTE
+    return None
 
 
 # build / test heuristics start here
 
 
 class BuildAndTest(ABC):
+    # What the build prints when building offline failed for want of a
+    # dependency that isn't in the cache yet
+    offline_miss: Optional[Pattern[str]] = None
+
     @abstractmethod
     def name(self) -> str:
         pass
@@ -475,57 +1287,314 @@ class BuildAndTest(ABC):
         pass
 
     @abstractmethod
-    def run(self, state: State) -> R:
+    def run(
+        self,
+        state: State,
+        source_dir: str,
+        cache_dir: Optional[str],
+        offline: bool,
+        output: Optional[IO] = None,
+    ) -> R:
+        """
+        Build and test in `source_dir`, keeping downloaded dependencies in
+        `cache_dir` if given, and not downloading anything if `offline`.
+        Output goes to `output` if given, otherwise to the terminal.
+        """
         pass
 
+    def missed_cache(self, failure: str) -> bool:
+        """Whether an offline build failed with `failure` for want of a dependency."""
+        return self.offline_miss is not None and bool(self.offline_miss.search(failure))
+
 
+# Build strategies check_build_and_test picks from; see build_strategy()
+build_strategies: List[BuildAndTest] = []
+
+
+def build_strategy(cls: Type[BuildAndTest]) -> Type[BuildAndTest]:
+    """Class decorator registering a strategy for check_build_and_test."""
+    build_strategies.append(cls())
+    return cls
+
+
+def _command(args: List[str]) -> str:
+    return " ".join(shlex.quote(arg) for arg in args)
+
+
+def _thread_count(state: State) -> Optional[int]:
+    """state.build_threads as a number, with Maven's "1C" meaning one per core."""
+    if state.build_threads is None:
+        return None
+    if state.build_threads.endswith("C"):
+        per_core = float(state.build_threads[:-1] or 1)
+        return max(int(per_core * (os.cpu_count() or 1)), 1)
+    return int(state.build_threads)
+
+
+@build_strategy
 class BuildAndTestMaven(BuildAndTest):
+    # The same for dependencies and plugins
+    offline_miss = re.compile(
+        r"in offline mode and the artifact .* has not been downloaded"
+    )
+
     def name(self) -> str:
         return "maven"
 
     def should_run(self, state: State) -> bool:
         return os.path.exists(os.path.join(state.source_dir, "pom.xml"))
 
-    def run(self, state: State) -> R:
+    def run(
+        self,
+        state: State,
+        source_dir: str,
+        cache_dir: Optional[str],
+        offline: bool,
+        output: Optional[IO] = None,
+    ) -> R:
+        options = []
+        env = {}
+        if cache_dir is not None:
+            options.append(
+                f"-Dmaven.repo.local={os.path.join(cache_dir, 'repository')}"
+            )
+            # Where the wrapper keeps the Maven distributions it downloads
+            env["MAVEN_USER_HOME"] = cache_dir
+        if offline:
+            options.append("--offline")
+        build_options = list(options)
+        if state.build_threads is not None:
+            build_options += ["-T", state.build_threads]
+        if state.test_forks is not None:
+            build_options.append(f"-DforkCount={state.test_forks}")
+        wrapper = ["mvn", "--quiet", "-N", "io.takari:maven:wrapper", "-Dmaven=3.6.0"]
+        build = ["./mvnw", "--quiet", "package"]
         return _check_sh(
-            [
-                "mvn --quiet -N io.takari:maven:wrapper -Dmaven=3.6.0",
-                "./mvnw --quiet package",
-            ],
-            workdir=state.source_dir,
+            [_command(wrapper + options), _command(build + build_options)],
+            workdir=source_dir,
+            env=env,
+            output=output,
+            timeout=state.command_timeout,
         )
 
 
+@build_strategy
 class BuildAndTestNpm(BuildAndTest):
+    offline_miss = re.compile(r"\bENOTCACHED\b")
+
     def name(self) -> str:
         return "npm"
 
     def should_run(self, state: State) -> bool:
         return os.path.exists(os.path.join(state.source_dir, "package.json"))
 
-    def run(self, state: State) -> R:
-        return _check_sh("npm test", workdir=state.source_dir)
+    def run(
+        self,
+        state: State,
+        source_dir: str,
+        cache_dir: Optional[str],
+        offline: bool,
+        output: Optional[IO] = None,
+    ) -> R:
+        env = {}
+        if cache_dir is not None:
+            env["npm_config_cache"] = cache_dir
+            env["npm_config_prefer_offline"] = "true"
+        if offline:
+            env["npm_config_offline"] = "true"
+        return _check_sh(
+            "npm test",
+            workdir=source_dir,
+            env=env,
+            output=output,
+            timeout=state.command_timeout,
+        )
 
 
-@check("Source archive builds cleanly")
-def check_build_and_test(state: State) -> R:
-    if state.build_and_test_command is not None:
-        return _check_sh(state.build_and_test_command, workdir=state.source_dir)
+@build_strategy
+class BuildAndTestGradle(BuildAndTest):
+    offline_miss = re.compile(r"No cached version of .* available for offline mode")
 
-    strategies = [BuildAndTestMaven(), BuildAndTestNpm()]
-    errors: List[str] = []
-    executed_at_least_one = False
+    def name(self) -> str:
+        return "gradle"
 
-    for strategy in strategies:
-        if not strategy.should_run(state):
-            continue
-        executed_at_least_one = True
-        print(f"Executing build-and-test for {strategy.name()}")
-        err = strategy.run(state)
-        if err is not None:
-            errors.append(f"{strategy.name()}: {err}")
+    def should_run(self, state: State) -> bool:
+        return any(
+            os.path.exists(os.path.join(state.source_dir, name))
+            for name in ["build.gradle", "build.gradle.kts"]
+        )
 
-    if not executed_at_least_one:
+    def run(
+        self,
+        state: State,
+        source_dir: str,
+        cache_dir: Optional[str],
+        offline: bool,
+        output: Optional[IO] = None,
+    ) -> R:
+        # Like mvnw, the wrapper is usually left out of source releases
+        if os.path.exists(os.path.join(source_dir, "gradlew")):
+            args = ["./gradlew"]
+        else:
+            args = ["gradle"]
+        args += ["--quiet", "build"]
+        env = {}
+        if cache_dir is not None:
+            env["GRADLE_USER_HOME"] = cache_dir
+        if offline:
+            args.append("--offline")
+        threads = _thread_count(state)
+        if threads is not None:
+            args += ["--parallel", f"--max-workers={threads}"]
+        return _check_sh(
+            _command(args),
+            workdir=source_dir,
+            env=env,
+            output=output,
+            timeout=state.command_timeout,
+        )
+
+
+@build_strategy
+class BuildAndTestCargo(BuildAndTest):
+    offline_miss = re.compile(r"--offline was specified|you're using offline mode")
+
+    def name(self) -> str:
+        return "cargo"
+
+    def should_run(self, state: State) -> bool:
+        return os.path.exists(os.path.join(state.source_dir, "Cargo.toml"))
+
+    def run(
+        self,
+        state: State,
+        source_dir: str,
+        cache_dir: Optional[str],
+        offline: bool,
+        output: Optional[IO] = None,
+    ) -> R:
+        args = ["cargo", "test", "--quiet"]
+        env = {}
+        if cache_dir is not None:
+            # The registry index and downloaded crates live in CARGO_HOME
+            env["CARGO_HOME"] = cache_dir
+        if offline:
+            args.append("--offline")
+        threads = _thread_count(state)
+        if threads is not None:
+            args.append(f"--jobs={threads}")
+        return _check_sh(
+            _command(args),
+            workdir=source_dir,
+            env=env,
+            output=output,
+            timeout=state.command_timeout,
+        )
+
+
+def _run_build(
+    state: State, strategy: BuildAndTest, source_dir: str, output: Optional[IO]
+) -> R:
+    """
+    Run `strategy` with its dependency cache for the project, if there is one.
+    The cache is warm once a build succeeded with it; from then on, builds
+    are tried offline first, building online again only if the release needs
+    dependencies that aren't in the cache yet.
+    """
+    if state.build_cache_dir is None:
+        offline = state.offline_build == "always"
+        return strategy.run(state, source_dir, None, offline, output)
+    cache_dir = os.path.join(state.build_cache_dir, state.project, strategy.name())
+    warm_marker = os.path.join(cache_dir, ".warm")
+    # Neither Maven's local repository nor the npm cache are safe to use
+    # from several builds at once
+    with file_lock(cache_dir + ".lock"):
+        os.makedirs(cache_dir, exist_ok=True)
+        offline = state.offline_build == "always" or (
+            state.offline_build == "auto" and os.path.exists(warm_marker)
+        )
+        result = strategy.run(state, source_dir, cache_dir, offline, output)
+        if (
+            result is not None
+            and offline
+            and state.offline_build == "auto"
+            and strategy.missed_cache(result[0])
+        ):
+            logging.info(
+                f"The offline {strategy.name()} build needs dependencies that "
+                "aren't in the cache, trying online"
+            )
+            offline = False
+            result = strategy.run(state, source_dir, cache_dir, offline, output)
+        if result is None and not offline:
+            with open(warm_marker, "w"):
+                pass
+    return result
+
+
+_output_lock = threading.Lock()
+
+
+def _run_build_in_copy(state: State, strategy: BuildAndTest) -> R:
+    """
+    Run `strategy` in a copy of the source directory, so it can't see what
+    other builds write there, with its output kept in a log file and printed
+    in one piece once it's done.
+    """
+    build_dir = os.path.join(state.work_dir, "build", strategy.name())
+    os.makedirs(os.path.dirname(build_dir), exist_ok=True)
+    # Copy-on-write where the file system supports it (btrfs, XFS), so the
+    # copy is instant and takes no space
+    result = _check_sh(
+        _command(["cp", "-a", "--reflink=auto", state.source_dir, build_dir])
+    )
+    if result is not None:
+        return result
+    log_path = build_dir + ".log"
+    with open(log_path, "w+") as log:
+        result = _run_build(state, strategy, build_dir, log)
+        log.seek(0)
+        with _output_lock:
+            print(f"Output of the {strategy.name()} build (also in {log_path}):")
+            for line in log:
+                print(line, end="")
+    return result
+
+
+# The build writes into the source directory (think mvnw, target/,
+# node_modules/), so it has to wait for every check that inspects it. It
+# doesn't need anything they found though, so if their results are cached,
+# rerunning a failed build doesn't run them (and clone the repository) again.
+@check(
+    "Source archive builds cleanly",
+    depends_on=[check_unzip, check_source_dir_in_zip],
+    needs_extraction=True,
+    after=[
+        check_git_revision,
+        check_blacklisted_files,
+        check_gitignore_in_release,
+        check_license_is_apache_2,
+        check_bundled_licenses,
+        check_license_headers,
+        check_no_binary_files,
+    ],
+    inputs=[archive_digest, source_layout, build_command],
+)
+def check_build_and_test(state: State) -> R:
+    if state.extraction is None:
+        # Whatever was extracted of a refused archive must not be built
+        raise Exception("The source archive could not be extracted")
+    if state.build_and_test_command is not None:
+        return _check_sh(
+            state.build_and_test_command,
+            workdir=state.source_dir,
+            timeout=state.command_timeout,
+        )
+
+    strategies = [
+        strategy for strategy in build_strategies if strategy.should_run(state)
+    ]
+    if not strategies:
         return (
             "This source release does not seem to include a build or test \n"
             "command. For common build toolchains, heuristics try to figure\n"
@@ -535,6 +1604,25 @@ def check_build_and_test(state: State) -> R:
             ResultKind.NOTE,
         )
 
+    print(f"Executing build-and-test for {', '.join(s.name() for s in strategies)}")
+    if len(strategies) == 1:
+        results = [_run_build(state, strategies[0], state.source_dir, None)]
+    else:
+        # Builds mostly wait for the network or run a compiler with a few
+        # threads, so running them at once is worth it
+        with ThreadPoolExecutor(max_workers=len(strategies)) as executor:
+            results = list(
+                executor.map(
+                    metrics.bind(lambda strategy: _run_build_in_copy(state, strategy)),
+                    strategies,
+                )
+            )
+
+    errors = [
+        f"{strategy.name()}: {result[0]}"
+        for strategy, result in zip(strategies, results)
+        if result is not None
+    ]
     if errors:
         return "\n".join(errors), ResultKind.FAIL
     return None
@@ -545,17 +1633,19 @@ checks = [
     check_sha512_file_exists,
     check_keys_file_exists,
     check_asc_file_exists,
-    check_sha512,
+    check_checksums,
     check_gpg_key_in_keys_file,
     check_gpg_signature,
     check_unzip,
     check_source_dir_in_zip,
     check_git_revision,
     check_blacklisted_files,
-    # check_gitignore_in_repo,
-    # check_gitignore_in_release,
+    check_gitignore_in_repo,
+    check_gitignore_in_release,
     check_disclaimer_and_notice_look_good,
     check_license_is_apache_2,
+    check_bundled_licenses,
+    check_license_headers,
     check_license_looks_good,
     check_no_binary_files,
     check_build_and_test,
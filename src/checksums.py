@@ -0,0 +1,164 @@
+import hashlib
+import os
+import re
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Sidecar extension -> hashlib algorithm name, strongest first
+SIDECAR_ALGORITHMS = {
+    "sha512": "sha512",
+    "sha256": "sha256",
+    "sha1": "sha1",
+    "md5": "md5",
+}
+
+CHUNK_SIZE = 4 * 1024 * 1024
+
+_BSD_LINE = re.compile(
+    r"^(?P<algo>[A-Za-z0-9-]+)\s*\((?P<name>.+)\)\s*=\s*(?P<hex>[0-9A-Fa-f]+)$"
+)
+_GNU_LINE = re.compile(r"^\\?(?P<hex>[0-9A-Fa-f]+)\s+[ *]?(?P<name>.+)$")
+_GPG_PRINT_MD = re.compile(r"^(?P<name>[^\n:]+?)\s*:\s*(?P<hex>[0-9A-Fa-f\s]+)$")
+_BARE = re.compile(r"^[0-9A-Fa-f\s]+$")
+
+
+class Digests(NamedTuple):
+    hexdigests: Dict[str, str]
+    size: int
+    seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Bytes hashed per second."""
+        return self.size / self.seconds if self.seconds > 0 else float("inf")
+
+
+def digest_length(algorithm: str) -> int:
+    """Length of a hex digest for `algorithm`."""
+    return hashlib.new(algorithm).digest_size * 2
+
+
+def find_sidecars(path: str) -> Dict[str, str]:
+    """Map algorithm name -> path of every checksum sidecar present for `path`."""
+    return {
+        algorithm: f"{path}.{extension}"
+        for extension, algorithm in SIDECAR_ALGORITHMS.items()
+        if os.path.isfile(f"{path}.{extension}")
+    }
+
+
+def parse_sidecar(content: str) -> List[Tuple[Optional[str], str]]:
+    """
+    Parse the contents of a checksum sidecar into (filename, hexdigest) pairs.
+    The filename is None if the format doesn't include one.
+
+    Understands the formats projects commonly publish:
+
+    * coreutils (`sha512sum`): `<hex>  <name>` or `<hex> *<name>`
+    * BSD / `shasum --tag` / openssl: `SHA512 (<name>) = <hex>`
+    * `gpg --print-md`: `<name>: ABCD 1234 ...`, possibly wrapped over lines
+    * just the bare hex digest
+    """
+    content = content.strip()
+    if _BARE.match(content):
+        return [(None, re.sub(r"\s", "", content).lower())]
+
+    entries: List[Tuple[Optional[str], str]] = []
+    for line in content.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        for pattern in (_BSD_LINE, _GNU_LINE):
+            match = pattern.match(line)
+            if match:
+                entries.append((_clean_name(match["name"]), match["hex"].lower()))
+                break
+        else:
+            entries = []
+            break
+    if entries:
+        return entries
+
+    match = _GPG_PRINT_MD.match(content)
+    if match:
+        hexdigest = re.sub(r"\s", "", match["hex"]).lower()
+        return [(_clean_name(match["name"]), hexdigest)]
+
+    raise ValueError("Unrecognized checksum file format")
+
+
+def _clean_name(name: str) -> str:
+    name = name.strip()
+    if name.startswith("*"):
+        name = name[1:]
+    return os.path.basename(name)
+
+
+def expected_digest(sidecar_path: str, algorithm: str, filename: str) -> str:
+    """
+    Read the digest `sidecar_path` states for `filename`. Raises ValueError
+    if there is no (well-formed) entry for it.
+    """
+    with open(sidecar_path, "r", errors="replace") as f:
+        entries = parse_sidecar(f.read())
+    for name, hexdigest in entries:
+        if name is None or name == filename:
+            if len(hexdigest) != digest_length(algorithm):
+                raise ValueError(
+                    f"digest has length {len(hexdigest)}, expected "
+                    f"{digest_length(algorithm)} for {algorithm}"
+                )
+            return hexdigest
+    names = ", ".join(str(name) for name, _ in entries)
+    raise ValueError(f"no entry for {filename} (only for {names})")
+
+
+def compute_digests(
+    path: str, algorithms: Iterable[str], chunk_size: int = CHUNK_SIZE
+) -> Digests:
+    """Compute all `algorithms` over the file at `path`, reading it only once."""
+    hashers = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    size = 0
+    start = time.monotonic()
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            size += n
+            for hasher in hashers.values():
+                hasher.update(view[:n])
+    seconds = time.monotonic() - start
+    return Digests(
+        {algorithm: hasher.hexdigest() for algorithm, hasher in hashers.items()},
+        size,
+        seconds,
+    )
+
+
+def verify_sidecars(path: str, sidecars: Dict[str, str]) -> Tuple[List[str], Digests]:
+    """
+    Check `path` against every sidecar in `sidecars` (algorithm -> sidecar
+    path) in a single pass over `path`. Returns the list of problems found,
+    and the computed digests.
+    """
+    errors = []
+    expected = {}
+    filename = os.path.basename(path)
+    for algorithm, sidecar_path in sidecars.items():
+        try:
+            expected[algorithm] = expected_digest(sidecar_path, algorithm, filename)
+        except ValueError as ex:
+            errors.append(f"{os.path.basename(sidecar_path)}: {ex}")
+
+    digests = compute_digests(path, expected.keys())
+    for algorithm, hexdigest in expected.items():
+        actual = digests.hexdigests[algorithm]
+        if actual != hexdigest:
+            errors.append(
+                f"{os.path.basename(sidecars[algorithm])}: {algorithm} checksum "
+                f"mismatch, expected {hexdigest}, got {actual}"
+            )
+    return errors, digests
@@ -0,0 +1,249 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+# Below this many files to sniff, starting worker processes costs more than it saves
+MIN_FILES_FOR_POOL = 512
+BATCH_SIZE = 256
+
+
+class Classification(NamedTuple):
+    is_binary: bool
+    kind: str
+
+
+TEXT = Classification(False, "text")
+
+# fmt: off
+_TEXT_EXTENSIONS = {
+    ext: Classification(False, f"{name} text")
+    for name, exts in {
+        "source": [
+            "c", "cc", "cpp", "cs", "css", "go", "groovy", "h", "hpp", "java",
+            "js", "jsx", "kt", "kts", "less", "lua", "php", "pl", "proto", "py",
+            "rb", "rs", "scala", "scss", "sql", "swift", "thrift", "ts", "tsx",
+            "vue",
+        ],
+        "markup": ["adoc", "htm", "html", "md", "rst", "svg", "xml", "xsd", "xsl"],
+        "config": [
+            "cfg", "conf", "gradle", "ini", "json", "properties", "toml", "yaml",
+            "yml",
+        ],
+        "script": ["bash", "bat", "cmd", "ps1", "sh"],
+        "plain": ["csv", "log", "txt"],
+    }.items()
+    for ext in exts
+}
+# fmt: on
+
+_BINARY_EXTENSIONS = {
+    "class": "Java class file",
+    "dll": "Windows library",
+    "ear": "Java archive",
+    "eot": "font",
+    "exe": "Windows executable",
+    "gif": "GIF image",
+    "gz": "gzip compressed data",
+    "ico": "icon",
+    "jar": "Java archive",
+    "jpeg": "JPEG image",
+    "jpg": "JPEG image",
+    "otf": "font",
+    "pdf": "PDF document",
+    "png": "PNG image",
+    "pyc": "Python bytecode",
+    "so": "shared library",
+    "tgz": "gzip compressed data",
+    "ttf": "font",
+    "war": "Java archive",
+    "woff": "font",
+    "woff2": "font",
+    "zip": "Zip archive",
+}
+
+# Signatures that identify a binary format regardless of what follows
+_MAGIC: List[Tuple[bytes, str]] = [
+    (b"\x89PNG\r\n\x1a\n", "PNG image"),
+    (b"GIF87a", "GIF image"),
+    (b"GIF89a", "GIF image"),
+    (b"\xff\xd8\xff", "JPEG image"),
+    (b"PK\x03\x04", "Zip archive"),
+    (b"PK\x05\x06", "Zip archive"),
+    (b"\xca\xfe\xba\xbe", "Java class file"),
+    (b"\x7fELF", "ELF executable"),
+    (b"\x1f\x8b", "gzip compressed data"),
+    (b"BZh", "bzip2 compressed data"),
+    (b"\xfd7zXZ\x00", "xz compressed data"),
+    (b"7z\xbc\xaf\x27\x1c", "7-zip archive"),
+    (b"%PDF-", "PDF document"),
+    (b"wOFF", "font"),
+    (b"wOF2", "font"),
+    (b"\x00\x01\x00\x00\x00", "font"),
+    (b"\x00\x00\x01\x00", "icon"),
+    (b"MZ", "Windows executable"),
+]
+
+# Control characters that don't make a file binary
+_TEXT_CONTROL_CHARS = {0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x1B}
+_BINARY_BYTES = (
+    bytes(byte for byte in range(0x20) if byte not in _TEXT_CONTROL_CHARS) + b"\x7f"
+)
+
+
+def _extension(path: str) -> str:
+    return os.path.splitext(path)[1][1:].lower()
+
+
+def classify_by_name(path: str) -> Optional[Classification]:
+    """Classify files whose extension is reliable enough to not look inside."""
+    ext = _extension(path)
+    if ext in _TEXT_EXTENSIONS:
+        return _TEXT_EXTENSIONS[ext]
+    if ext in _BINARY_EXTENSIONS:
+        return Classification(True, _BINARY_EXTENSIONS[ext])
+    return None
+
+
+def classify_prefix(prefix: bytes) -> Classification:
+    """Classify a file by sniffing its first few KB."""
+    if not prefix:
+        return Classification(False, "empty")
+    for magic, kind in _MAGIC:
+        if prefix.startswith(magic) and (magic != b"MZ" or b"\0" in prefix):
+            return Classification(True, kind)
+    if prefix.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return Classification(False, "UTF-16 text")
+    if prefix.startswith(b"\xef\xbb\xbf"):
+        return Classification(False, "UTF-8 text")
+    if b"\0" in prefix:
+        return Classification(True, "data")
+    # bytes.translate with a deletion table runs in C, unlike a Python loop
+    control_chars = len(prefix) - len(prefix.translate(None, _BINARY_BYTES))
+    if control_chars > len(prefix) // 100:
+        return Classification(True, "data")
+    return TEXT
+
+
+def batches(items: List[str], size: int) -> Iterator[List[str]]:
+    batch: List[str] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def worker_pool(
+    jobs: int, initializer: Callable[..., None], initargs: Tuple
+) -> ProcessPoolExecutor:
+    """
+    A pool of `jobs` worker processes, started by a fork server rather than
+    forked from this process: checks run on several threads, and a process
+    forked while another thread holds a lock would wait for it forever.
+    """
+    return ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=multiprocessing.get_context("forkserver"),
+        initializer=initializer,
+        initargs=initargs,
+    )
+
+
+# Set in each worker process by _init_worker
+_worker_read_prefix: Optional[Callable[[str], bytes]] = None
+
+
+def _init_worker(read_prefix: Callable[[str], bytes]) -> None:
+    global _worker_read_prefix
+    _worker_read_prefix = read_prefix
+
+
+def _classify_batch_in_worker(paths: List[str]) -> List[Classification]:
+    assert _worker_read_prefix is not None
+    return [classify_prefix(_worker_read_prefix(path)) for path in paths]
+
+
+class Classifier:
+    """
+    Sorts files into text and binary. Files are classified by name where
+    possible, by sniffing their first few KB otherwise. Results are cached by
+    content hash, so duplicate content is only ever sniffed once.
+    """
+
+    def __init__(self, jobs: Optional[int] = None):
+        self.jobs = jobs or os.cpu_count() or 1
+        self._cache: Dict[str, Classification] = {}
+        self._lock = threading.Lock()
+
+    # Each State has one, and batch mode sends States to worker processes;
+    # locks can't be pickled
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def classify(
+        self,
+        paths: Iterable[str],
+        read_prefix: Callable[[str], bytes],
+        content_hash: Callable[[str], Optional[str]] = lambda path: None,
+        parallel: bool = True,
+    ) -> Dict[str, Classification]:
+        """
+        Classify all `paths`. With `parallel`, sniffing is spread over worker
+        processes, each of which gets its own copy of `read_prefix`.
+        `content_hash` may return None for files whose hash isn't known.
+        """
+        results: Dict[str, Classification] = {}
+        # Content hash -> paths waiting for it to be sniffed
+        to_sniff: Dict[str, List[str]] = {}
+        for path in paths:
+            by_name = classify_by_name(path)
+            if by_name is not None:
+                results[path] = by_name
+                continue
+            key = content_hash(path) or f"path:{path}"
+            with self._lock:
+                cached = self._cache.get(key)
+            if cached is not None:
+                results[path] = cached
+            else:
+                to_sniff.setdefault(key, []).append(path)
+
+        keys = list(to_sniff.keys())
+        representatives = [to_sniff[key][0] for key in keys]
+        if not parallel or self.jobs == 1 or len(keys) < MIN_FILES_FOR_POOL:
+            sniffed = [classify_prefix(read_prefix(path)) for path in representatives]
+        else:
+            sniffed = []
+            with worker_pool(self.jobs, _init_worker, (read_prefix,)) as executor:
+                for batch_result in executor.map(
+                    _classify_batch_in_worker, batches(representatives, BATCH_SIZE)
+                ):
+                    sniffed += batch_result
+
+        with self._lock:
+            for key, classification in zip(keys, sniffed):
+                if not key.startswith("path:"):
+                    self._cache[key] = classification
+                for path in to_sniff[key]:
+                    results[path] = classification
+        return results
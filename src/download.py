@@ -0,0 +1,308 @@
+import http.client
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import unquote, urljoin, urlsplit
+
+import metrics
+import trace_profile
+from download_cache import DownloadCache
+
+CHUNK_SIZE = 1024 * 1024
+MAX_REDIRECTS = 5
+
+
+class DownloadError(Exception):
+    pass
+
+
+class _RetryableError(Exception):
+    pass
+
+
+class Download(NamedTuple):
+    url: str
+    path: str
+
+
+class _LinkParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__()
+        self.links: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        if tag != "a":
+            return
+        for name, value in attrs:
+            if name == "href" and value:
+                self.links.append(value)
+
+
+def _is_child_link(href: str) -> bool:
+    """True for relative links pointing into (not above) the listed directory."""
+    split = urlsplit(href)
+    return not (
+        split.scheme
+        or split.netloc
+        or split.query
+        or href.startswith(("/", "#", "./", "../"))
+        or split.path in ("", ".", "..")
+    )
+
+
+class Downloader:
+    """
+    Parallel HTTP(S) downloader. Every worker thread keeps one keep-alive
+    connection per host, interrupted downloads are resumed with Range
+    requests (if the file is still the same version, going by If-Range), and
+    failed requests are retried with exponential backoff.
+    If a `cache` is given, files are revalidated against it with conditional
+    requests instead of being downloaded again.
+    """
+
+    def __init__(
+        self,
+        user_agent: str,
+        jobs: int = 8,
+        retries: int = 4,
+        backoff: float = 0.5,
+        timeout: float = 60,
+        cache: Optional[DownloadCache] = None,
+    ):
+        self.user_agent = user_agent
+        self.cache = cache
+        self.jobs = jobs
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self._local = threading.local()
+        # The ETag or Last-Modified of the responses partial downloads came
+        # from, by partial path, to only resume them from the same version
+        self._validators: Dict[str, str] = {}
+
+    # Connection handling
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        pool: Dict[Tuple[str, str], http.client.HTTPConnection]
+        pool = getattr(self._local, "pool", None) or {}
+        self._local.pool = pool
+        key = (scheme, netloc)
+        if key not in pool:
+            if scheme == "https":
+                pool[key] = http.client.HTTPSConnection(netloc, timeout=self.timeout)
+            elif scheme == "http":
+                pool[key] = http.client.HTTPConnection(netloc, timeout=self.timeout)
+            else:
+                raise DownloadError(f"Unsupported URL scheme: {scheme}")
+        return pool[key]
+
+    def _drop_connection(self, scheme: str, netloc: str) -> None:
+        pool = getattr(self._local, "pool", {})
+        conn = pool.pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def _request(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[str, http.client.HTTPResponse]:
+        """
+        Send a GET request, following redirects. Returns the final URL and the
+        response, whose body must be read fully before the next request.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            split = urlsplit(url)
+            path = split.path or "/"
+            if split.query:
+                path += "?" + split.query
+            conn = self._connection(split.scheme, split.netloc)
+            all_headers = {"User-Agent": self.user_agent, **(headers or {})}
+            try:
+                conn.request("GET", path, headers=all_headers)
+                response = conn.getresponse()
+            except (OSError, http.client.HTTPException):
+                # Keep-alive connections may have been closed by the server
+                self._drop_connection(split.scheme, split.netloc)
+                raise
+            if response.status in (301, 302, 303, 307, 308):
+                response.read()
+                location = response.getheader("Location")
+                if not location:
+                    raise DownloadError(f"Redirect without Location from {url}")
+                url = urljoin(url, location)
+                continue
+            return url, response
+        raise DownloadError(f"Too many redirects fetching {url}")
+
+    def _with_retries(self, what: str, fun, *args):
+        for attempt in range(self.retries + 1):
+            try:
+                return fun(*args)
+            except (OSError, http.client.HTTPException, _RetryableError) as ex:
+                if attempt == self.retries:
+                    raise DownloadError(f"Failed to {what}: {ex}")
+                delay = self.backoff * 2**attempt * (1 + random.random())
+                logging.debug(f"Failed to {what} ({ex}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    # Directory listings
+
+    def _list_directory_once(self, url: str) -> Tuple[str, List[str], List[str]]:
+        final_url, response = self._request(url)
+        body = response.read()
+        _check_status(response, url)
+        parser = _LinkParser()
+        parser.feed(body.decode("utf-8", errors="replace"))
+        files, dirs = set(), set()
+        for href in parser.links:
+            if not _is_child_link(href):
+                continue
+            if href.endswith("/"):
+                dirs.add(href)
+            elif href.split("/")[-1] != "index.html":
+                files.add(href)
+        return final_url, sorted(files), sorted(dirs)
+
+    def list_directory(self, url: str) -> Tuple[str, List[str], List[str]]:
+        """
+        List the directory at `url`. Returns the URL of the listing after
+        redirects, and the relative links to the files and subdirectories in it.
+        """
+        if not url.endswith("/"):
+            url += "/"
+        with trace_profile.span("list directory", "download", url=url):
+            return self._with_retries(f"list {url}", self._list_directory_once, url)
+
+    def plan_tree(self, url: str, dest_dir: str) -> List[Download]:
+        """
+        Recursively list the directory at `url`, never ascending to its parent,
+        and plan downloading all files in it into `dest_dir`.
+        """
+        url, files, dirs = self.list_directory(url)
+        downloads = [
+            Download(urljoin(url, href), os.path.join(dest_dir, unquote(href)))
+            for href in files
+        ]
+        for href in dirs:
+            downloads += self.plan_tree(
+                urljoin(url, href), os.path.join(dest_dir, unquote(href))
+            )
+        return downloads
+
+    # File downloads
+
+    def _fetch_once(self, download: Download) -> None:
+        partial_path = download.path + ".part"
+        offset = 0
+        validator = self._validators.get(partial_path)
+        # Without a validator, the server can't tell whether the rest of its
+        # version of the file goes with what we have, so start over
+        if os.path.exists(partial_path) and validator is not None:
+            offset = os.path.getsize(partial_path)
+        headers = {}
+        if offset:
+            assert validator is not None
+            headers = {"Range": f"bytes={offset}-", "If-Range": validator}
+
+        cached = None
+        if self.cache is not None and not offset:
+            cached = self.cache.lookup(download.url)
+            if cached is not None and cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached is not None and cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        final_url, response = self._request(download.url, headers)
+        if response.status == 304 and cached is not None and self.cache is not None:
+            response.read()
+            self.cache.use(cached, download.path)
+            logging.debug(f"Using cached copy of {download.url}")
+            return
+        if response.status == 416 and offset:
+            # We already have everything there is
+            response.read()
+        else:
+            try:
+                self._receive(response, download.url, partial_path, offset)
+            except Exception:
+                # The rest of the body would be taken for the next response
+                split = urlsplit(final_url)
+                self._drop_connection(split.scheme, split.netloc)
+                raise
+        self._validators.pop(partial_path, None)
+        os.replace(partial_path, download.path)
+        if self.cache is not None:
+            self.cache.store(
+                download.url,
+                download.path,
+                response.getheader("ETag"),
+                response.getheader("Last-Modified"),
+            )
+
+    def _receive(
+        self,
+        response: http.client.HTTPResponse,
+        url: str,
+        partial_path: str,
+        offset: int,
+    ) -> None:
+        if response.status not in (200, 206):
+            response.read()
+            _check_status(response, url)
+        # Servers that ignore Range, or whose file changed, send all of it
+        mode = "ab" if response.status == 206 else "wb"
+        etag = response.getheader("ETag")
+        # Only strong ETags can be used with If-Range
+        validator = etag if etag and not etag.startswith("W/") else None
+        validator = validator or response.getheader("Last-Modified")
+        if mode == "wb" and validator is not None:
+            self._validators[partial_path] = validator
+        elif mode == "wb":
+            self._validators.pop(partial_path, None)
+        with open(partial_path, mode) as f:
+            while True:
+                chunk = response.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                f.write(chunk)
+        expected = response.getheader("Content-Length")
+        written = os.path.getsize(partial_path) - (offset if mode == "ab" else 0)
+        if expected is not None and written != int(expected):
+            raise _RetryableError(f"got {written} of {expected} bytes of {url}")
+
+    def fetch(self, download: Download) -> None:
+        os.makedirs(os.path.dirname(download.path) or ".", exist_ok=True)
+        with trace_profile.span(
+            "download", "download", url=download.url
+        ) as span_args, trace_profile.python_profile():
+            self._with_retries(f"download {download.url}", self._fetch_once, download)
+            span_args["bytes"] = os.path.getsize(download.path)
+        logging.debug(f"Downloaded {download.url} to {download.path}")
+
+    def fetch_all(self, downloads: List[Download]) -> List[str]:
+        """
+        Download everything in `downloads` in parallel. Returns a list of
+        error messages; an empty list means everything was downloaded.
+        """
+
+        def fetch(download: Download) -> Optional[str]:
+            try:
+                self.fetch(download)
+                return None
+            except DownloadError as ex:
+                return str(ex)
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            results = list(executor.map(metrics.bind(fetch), downloads))
+        return [error for error in results if error is not None]
+
+
+def _check_status(response: http.client.HTTPResponse, url: str) -> None:
+    if response.status >= 500 or response.status == 429:
+        raise _RetryableError(f"HTTP {response.status} {response.reason} for {url}")
+    if response.status >= 400:
+        raise DownloadError(f"HTTP {response.status} {response.reason} for {url}")
@@ -0,0 +1,197 @@
+import errno
+import fcntl
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import NamedTuple, Optional
+
+import checksums
+
+# ioctl request number for FICLONE (Linux), to make copy-on-write copies
+_FICLONE = 0x40049409
+
+
+class CacheEntry(NamedTuple):
+    url: str
+    sha256: str
+    size: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    bytes_from_cache: int
+    bytes_downloaded: int
+    evictions: int
+
+
+def link_or_copy(src: str, dst: str) -> None:
+    """
+    Make `dst` have the same contents as `src` as cheaply as possible: hard link
+    if possible, then reflink (copy-on-write clone), and only then copy.
+    """
+    if os.path.lexists(dst):
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+        return
+    except OSError as ex:
+        if ex.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+            raise
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            return
+        except OSError:
+            pass
+        shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+
+
+class DownloadCache:
+    """
+    On-disk cache of downloaded files that persists across runs.
+
+    Files are stored once per content (by SHA-256) under `objects/`, and an
+    SQLite index maps each URL to its content along with the ETag and
+    Last-Modified headers it was served with, so it can be revalidated with a
+    conditional request. When the cache grows beyond `max_size` bytes, the least
+    recently used URLs are evicted.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._objects_dir = os.path.join(cache_dir, "objects")
+        self._index_path = os.path.join(cache_dir, "index.sqlite")
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._bytes_from_cache = 0
+        self._bytes_downloaded = 0
+        self._evictions = 0
+        os.makedirs(self._objects_dir, exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "url TEXT PRIMARY KEY, sha256 TEXT NOT NULL, size INTEGER NOT NULL, "
+                "etag TEXT, last_modified TEXT, last_used REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._index_path, timeout=60)
+
+    def _object_path(self, sha256: str) -> str:
+        return os.path.join(self._objects_dir, sha256[:2], sha256)
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                self._hits,
+                self._misses,
+                self._bytes_from_cache,
+                self._bytes_downloaded,
+                self._evictions,
+            )
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Return the cache entry for `url`, if its content is still cached."""
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT url, sha256, size, etag, last_modified FROM entries "
+                "WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(*row)
+        if not os.path.exists(self._object_path(entry.sha256)):
+            return None
+        return entry
+
+    def use(self, entry: CacheEntry, dest: str) -> None:
+        """Place the cached content of `entry` at `dest`, and count a hit."""
+        link_or_copy(self._object_path(entry.sha256), dest)
+        with self._connect() as db:
+            db.execute(
+                "UPDATE entries SET last_used = ? WHERE url = ?",
+                (time.time(), entry.url),
+            )
+        with self._lock:
+            self._hits += 1
+            self._bytes_from_cache += entry.size
+
+    def store(
+        self,
+        url: str,
+        path: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        """
+        Add the freshly downloaded file at `path` to the cache, and count a
+        miss. Afterwards `path` shares its storage with the cached copy.
+        """
+        sha256 = checksums.compute_digests(path, ["sha256"]).hexdigests["sha256"]
+        size = os.path.getsize(path)
+        object_path = self._object_path(sha256)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(object_path))
+            os.close(fd)
+            try:
+                link_or_copy(path, tmp_path)
+                # Hard links share permissions with the file in the work dir, so
+                # this also protects the cache from checks modifying the file
+                os.chmod(tmp_path, 0o444)
+                os.replace(tmp_path, object_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        link_or_copy(object_path, path)
+
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(url, sha256, size, etag, last_modified, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, sha256, size, etag, last_modified, time.time()),
+            )
+        with self._lock:
+            self._misses += 1
+            self._bytes_downloaded += size
+        self.evict()
+
+    def evict(self) -> None:
+        """Drop least recently used entries until the cache fits `max_size`."""
+        with self._connect() as db:
+            rows = db.execute(
+                "SELECT url, sha256, size FROM entries ORDER BY last_used DESC"
+            ).fetchall()
+            kept_size = 0
+            kept_objects = set()
+            for url, sha256, size in rows:
+                if sha256 in kept_objects:
+                    continue
+                if kept_size + size <= self.max_size:
+                    kept_size += size
+                    kept_objects.add(sha256)
+                    continue
+                db.execute("DELETE FROM entries WHERE url = ?", (url,))
+                still_used = db.execute(
+                    "SELECT 1 FROM entries WHERE sha256 = ?", (sha256,)
+                ).fetchone()
+                if not still_used:
+                    try:
+                        os.remove(self._object_path(sha256))
+                    except FileNotFoundError:
+                        pass
+                logging.debug(f"Evicted {url} from the download cache")
+                with self._lock:
+                    self._evictions += 1
@@ -0,0 +1,179 @@
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Pattern, Tuple
+
+
+class Rule(NamedTuple):
+    pattern: str
+    regex: Pattern
+    negated: bool
+    dir_only: bool
+
+
+def _translate_class(glob: str, start: int) -> Tuple[Optional[str], int]:
+    """Translate the bracket expression starting at glob[start] == "["."""
+    i = start + 1
+    negated = i < len(glob) and glob[i] in "!^"
+    if negated:
+        i += 1
+    # A "]" right at the start is part of the class
+    end = glob.find("]", i + 1 if i < len(glob) and glob[i] == "]" else i)
+    if end == -1:
+        return None, start + 1
+    chars = "".join("\\" + c if c in "\\[^" else c for c in glob[i:end])
+    return f"[{'^' if negated else ''}{chars}]", end + 1
+
+
+def _translate(glob: str) -> str:
+    """Translate a gitignore glob (without leading "/") into a regex."""
+    parts = []
+    i = 0
+    while i < len(glob):
+        c = glob[i]
+        if glob.startswith("**", i) and (i == 0 or glob[i - 1] == "/"):
+            after = i + 2
+            if after == len(glob):
+                # "foo/**" matches everything inside foo
+                parts.append(".*")
+                i = after
+                continue
+            if glob[after] == "/":
+                # "**/" matches zero or more directories
+                parts.append("(?:.*/)?")
+                i = after + 1
+                continue
+        if c == "*":
+            parts.append("[^/]*")
+            while i + 1 < len(glob) and glob[i + 1] == "*":
+                i += 1
+        elif c == "?":
+            parts.append("[^/]")
+        elif c == "[":
+            translated, i = _translate_class(glob, i)
+            parts.append(translated if translated is not None else re.escape("["))
+            continue
+        elif c == "\\" and i + 1 < len(glob):
+            i += 1
+            parts.append(re.escape(glob[i]))
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return "".join(parts)
+
+
+def parse_rule(line: str) -> Optional[Rule]:
+    """Parse one line of a .gitignore file; blank lines and comments are None."""
+    line = line.rstrip("\r\n")
+    if not line or line.startswith("#"):
+        return None
+    # Trailing spaces are ignored unless escaped
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    pattern = stripped
+    negated = pattern.startswith("!")
+    if negated:
+        pattern = pattern[1:]
+    elif pattern.startswith(("\\!", "\\#")):
+        pattern = pattern[1:]
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    if not pattern:
+        return None
+    # Patterns with a slash anywhere but the end are relative to the directory
+    # of the .gitignore; others match at any depth below it
+    anchored = "/" in pattern
+    body = _translate(pattern.lstrip("/"))
+    regex = body if anchored else f"(?:.*/)?{body}"
+    return Rule(stripped, re.compile(regex, re.DOTALL), negated, dir_only)
+
+
+class _RuleSet:
+    """The rules of a single .gitignore file."""
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+        # One pass over all patterns at once rules out most paths; only paths
+        # some pattern matches need to find out which one matched last
+        self._any = re.compile(
+            "|".join(f"(?:{rule.regex.pattern})" for rule in rules), re.DOTALL
+        )
+
+    def match(self, relpath: str, is_dir: bool) -> Optional[bool]:
+        """Whether the rules ignore `relpath`, or None if none applies."""
+        if not self._any.fullmatch(relpath):
+            return None
+        for rule in reversed(self.rules):
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.fullmatch(relpath):
+                return not rule.negated
+        return None
+
+
+class Gitignore:
+    """
+    The combined rules of all .gitignore files of a tree, as git applies
+    them: rules in deeper directories take precedence over those higher up,
+    later rules over earlier ones in the same file, and nothing inside an
+    ignored directory can be re-included.
+    """
+
+    def __init__(self, files: Dict[str, str]):
+        """
+        `files` maps the directory of each .gitignore ("" for the root) to its
+        contents.
+        """
+        self._rule_sets: Dict[str, _RuleSet] = {}
+        for directory, content in files.items():
+            rules = [parse_rule(line) for line in content.splitlines()]
+            present = [rule for rule in rules if rule is not None]
+            if present:
+                self._rule_sets[directory] = _RuleSet(present)
+        # Directory -> its topmost ignored ancestor (or itself), or None
+        self._ignored_dirs: Dict[str, Optional[str]] = {"": None}
+
+    def _match(self, path: str, is_dir: bool) -> bool:
+        directory = path
+        while directory:
+            directory = directory.rpartition("/")[0]
+            rule_set = self._rule_sets.get(directory)
+            if rule_set is None:
+                continue
+            relpath = path.replace(directory + "/", "", 1) if directory else path
+            result = rule_set.match(relpath, is_dir)
+            if result is not None:
+                return result
+        return False
+
+    def _ignored_dir(self, directory: str) -> Optional[str]:
+        if directory not in self._ignored_dirs:
+            parent = self._ignored_dir(directory.rpartition("/")[0])
+            if parent is None and self._match(directory, is_dir=True):
+                parent = directory
+            self._ignored_dirs[directory] = parent
+        return self._ignored_dirs[directory]
+
+    def ignored_by(self, path: str, is_dir: bool = False) -> Optional[str]:
+        """
+        The topmost ignored path among `path` and its parent directories, or
+        None if `path` isn't ignored.
+        """
+        if is_dir:
+            return self._ignored_dir(path)
+        ignored_parent = self._ignored_dir(path.rpartition("/")[0])
+        if ignored_parent is not None:
+            return ignored_parent
+        return path if self._match(path, is_dir=False) else None
+
+    def ignored(self, paths: Iterable[Tuple[str, bool]]) -> List[str]:
+        """
+        Check all (path, is_dir) pairs of a tree in one pass. Returns the
+        ignored ones, listing only the directory for everything inside an
+        ignored directory.
+        """
+        found = set()
+        for path, is_dir in paths:
+            ignored_by = self.ignored_by(path, is_dir)
+            if ignored_by is not None:
+                found.add(ignored_by)
+        return sorted(found)
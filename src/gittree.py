@@ -0,0 +1,137 @@
+import hashlib
+import os
+from typing import Dict, Iterable, List, NamedTuple, Set
+
+import trace_profile
+from helpers import run
+
+
+class GitEntry(NamedTuple):
+    mode: str
+    type: str
+    sha: str
+
+
+class TreeComparison(NamedTuple):
+    # For paths only in one of the trees, only the topmost missing directory
+    # (or the file itself) is listed, just like filecmp.dircmp does
+    only_in_git: List[str]
+    only_in_archive: List[str]
+    differing: List[str]
+    uncomparable: List[str]
+
+
+def ls_tree(git_dir: str, rev: str) -> Dict[str, GitEntry]:
+    """List every file in the tree of commit `rev`, without checking it out."""
+    with trace_profile.span("git ls-tree", "command", git_dir=git_dir, rev=rev):
+        output = run(
+            ["git", "-C", git_dir, "ls-tree", "-r", "-z", "--full-tree", rev],
+            check=True,
+        ).stdout
+    entries = {}
+    for record in output.split(b"\0"):
+        if not record:
+            continue
+        meta, path = record.split(b"\t", 1)
+        mode, type_, sha = meta.decode().split(" ")
+        entries[path.decode("utf-8", errors="surrogateescape")] = GitEntry(
+            mode, type_, sha
+        )
+    return entries
+
+
+def read_blobs(git_dir: str, shas: Iterable[str]) -> Dict[str, bytes]:
+    """Read the contents of blobs `shas` with a single git process."""
+    shas = list(shas)
+    if not shas:
+        return {}
+    with trace_profile.span(
+        "git cat-file", "command", git_dir=git_dir, count=len(shas)
+    ):
+        output = run(
+            ["git", "-C", git_dir, "cat-file", "--batch"],
+            input="".join(f"{sha}\n" for sha in shas).encode(),
+            check=True,
+        ).stdout
+    blobs = {}
+    offset = 0
+    for sha in shas:
+        header_end = output.index(b"\n", offset)
+        header = output[offset:header_end].decode().split(" ")
+        if header[1] == "missing":
+            raise FileNotFoundError(f"Object {sha} is missing from {git_dir}")
+        size = int(header[2])
+        start, end = header_end + 1, header_end + 1 + size
+        blobs[sha] = output[start:end]
+        # Each object is followed by a newline
+        offset = end + 1
+    return blobs
+
+
+def blob_sha1(path: str) -> str:
+    """The id git would give the file (or symlink) at `path` as a blob."""
+    if os.path.islink(path):
+        data = os.readlink(path).encode("utf-8", errors="surrogateescape")
+        return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+    hasher = hashlib.sha1(b"blob %d\0" % os.path.getsize(path))
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _ancestors(paths: Iterable[str]) -> Set[str]:
+    dirs = set()
+    for path in paths:
+        parent = path.rpartition("/")[0]
+        while parent and parent not in dirs:
+            dirs.add(parent)
+            parent = parent.rpartition("/")[0]
+    return dirs
+
+
+def _topmost_missing(paths: Iterable[str], other: Set[str]) -> List[str]:
+    missing = set()
+    for path in paths:
+        parts = path.split("/")
+        for i in range(1, len(parts) + 1):
+            prefix = "/".join(parts[:i])
+            if prefix not in other:
+                missing.add(prefix)
+                break
+    return sorted(missing)
+
+
+def _in_any(path: str, dirs: Set[str]) -> bool:
+    """Whether `path` is one of `dirs` or beneath one of them."""
+    parts = path.split("/")
+    return any("/".join(parts[:i]) in dirs for i in range(1, len(parts) + 1))
+
+
+def compare(git: Dict[str, GitEntry], archive: Dict[str, str]) -> TreeComparison:
+    """
+    Compare the files of a git tree with the files of the source archive,
+    given as path -> blob id. Files are equal if their blob ids are, so neither
+    tree needs to be read beyond what's needed to compute those ids.
+
+    Submodules only have a commit id, so they are reported as uncomparable,
+    whatever the archive has at or beneath their path.
+    """
+    submodules = {path for path, entry in git.items() if entry.type == "commit"}
+    git_paths = set(git.keys()) - submodules
+    archive_paths = {path for path in archive if not _in_any(path, submodules)}
+    differing = [
+        path
+        for path in sorted(git_paths & archive_paths)
+        if git[path].sha != archive[path]
+    ]
+    return TreeComparison(
+        only_in_git=_topmost_missing(
+            git_paths - archive_paths, archive_paths | _ancestors(archive_paths)
+        ),
+        only_in_archive=_topmost_missing(
+            archive_paths - git_paths, git_paths | _ancestors(git_paths)
+        ),
+        differing=differing,
+        uncomparable=sorted(submodules),
+    )
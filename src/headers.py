@@ -0,0 +1,152 @@
+import os
+import re
+from typing import Callable, Dict, Iterable, List, Optional, Pattern
+
+import apache_2_license
+import gitignore
+from classifier import BATCH_SIZE, MIN_FILES_FOR_POOL, batches, worker_pool
+from licenses import words
+
+# Headers go at the top, after at most a shebang, a package declaration or
+# an XML declaration; like Apache RAT, only look there
+HEADER_LINES = 50
+HEADER_BYTES = 8192
+
+# The header the ASF asks its projects to use
+ASF_HEADER = """
+Licensed to the Apache Software Foundation (ASF) under one
+or more contributor license agreements.
+"""
+# The boilerplate notice from the appendix of the license itself
+_BOILERPLATE = re.search(
+    r"Licensed under the Apache License.*?compliance with the License\.",
+    apache_2_license.text,
+    re.DOTALL,
+)
+assert _BOILERPLATE is not None
+APACHE_2_NOTICE = _BOILERPLATE.group()
+SPDX_IDENTIFIER = "SPDX-License-Identifier: Apache-2.0"
+
+# One pattern for all accepted headers, matched against the words of a file's
+# comments, so comment markers and line wrapping don't matter
+_HEADER = re.compile(
+    "|".join(
+        re.escape(" ".join(words(header)))
+        for header in [ASF_HEADER, APACHE_2_NOTICE, SPDX_IDENTIFIER]
+    )
+)
+
+# Comments by comment syntax; unterminated block comments run to the end of
+# what's read
+_C_COMMENTS = re.compile(r"/\*.*?(?:\*/|\Z)|//[^\n]*", re.DOTALL)
+_HASH_COMMENTS = re.compile(r"#[^\n]*")
+_XML_COMMENTS = re.compile(r"<!--.*?(?:-->|\Z)", re.DOTALL)
+_DASH_COMMENTS = re.compile(r"--\[\[.*?(?:\]\]|\Z)|--[^\n]*", re.DOTALL)
+_INI_COMMENTS = re.compile(r"[;#][^\n]*")
+# "rem" is a word, so it has to be left out explicitly
+_BATCH_COMMENTS = re.compile(r"^[ \t]*@?(?:rem\b|::)([^\n]*)", re.IGNORECASE | re.M)
+
+# fmt: off
+_COMMENTS_BY_EXTENSION: Dict[str, Pattern] = {
+    **{ext: _C_COMMENTS for ext in [
+        "c", "cc", "cpp", "cs", "css", "go", "gradle", "groovy", "h", "hpp",
+        "java", "js", "jsx", "kt", "kts", "less", "php", "proto", "rs",
+        "scala", "scss", "swift", "thrift", "ts", "tsx",
+    ]},
+    **{ext: _HASH_COMMENTS for ext in [
+        "bash", "cfg", "conf", "pl", "properties", "py", "rb", "sh", "toml",
+        "yaml", "yml",
+    ]},
+    **{ext: _XML_COMMENTS for ext in [
+        "htm", "html", "vue", "xml", "xsd", "xsl",
+    ]},
+    **{ext: _DASH_COMMENTS for ext in ["lua", "sql"]},
+    "ini": _INI_COMMENTS,
+    "bat": _BATCH_COMMENTS,
+    "cmd": _BATCH_COMMENTS,
+}
+# fmt: on
+_COMMENTS_BY_NAME = {
+    "Dockerfile": _HASH_COMMENTS,
+    "Makefile": _HASH_COMMENTS,
+    "Jenkinsfile": _C_COMMENTS,
+}
+
+# Files that aren't expected to have a header wherever they are; gitignore
+# syntax
+DEFAULT_EXCLUSIONS = ["*.min.js", "*.min.css"]
+
+
+def _comment_syntax(path: str) -> Optional[Pattern]:
+    name = path.rpartition("/")[2]
+    if name in _COMMENTS_BY_NAME:
+        return _COMMENTS_BY_NAME[name]
+    return _COMMENTS_BY_EXTENSION.get(os.path.splitext(name)[1][1:].lower())
+
+
+def has_header(path: str, prefix: bytes) -> bool:
+    """Whether the comments in `prefix`, the start of `path`, have a header."""
+    comments = _comment_syntax(path)
+    if comments is None or not prefix.strip():
+        # Nothing to license in an empty file
+        return True
+    text = prefix.decode("utf-8", errors="replace")
+    end = 0
+    for _ in range(HEADER_LINES):
+        end = text.find("\n", end) + 1
+        if not end:
+            end = len(text)
+            break
+    text = text[:end]
+    comment_text = " ".join(
+        match.group(match.lastindex or 0) for match in comments.finditer(text)
+    )
+    return _HEADER.search(" ".join(words(comment_text))) is not None
+
+
+# Set in each worker process by _init_worker
+_worker_read_prefix: Optional[Callable[[str, int], bytes]] = None
+
+
+def _init_worker(read_prefix: Callable[[str, int], bytes]) -> None:
+    global _worker_read_prefix
+    _worker_read_prefix = read_prefix
+
+
+def _scan_batch_in_worker(paths: List[str]) -> List[bool]:
+    assert _worker_read_prefix is not None
+    read_prefix = _worker_read_prefix
+    return [has_header(path, read_prefix(path, HEADER_BYTES)) for path in paths]
+
+
+def missing_headers(
+    paths: Iterable[str],
+    read_prefix: Callable[[str, int], bytes],
+    exclusions: List[str],
+    jobs: Optional[int] = None,
+    parallel: bool = True,
+) -> List[str]:
+    """
+    The files among `paths` that should have a license header but don't.
+    Files in formats without comments, and those matching `exclusions` or
+    DEFAULT_EXCLUSIONS (in gitignore syntax), aren't checked. With
+    `parallel`, files are read on a pool of `jobs` worker processes, each of
+    which gets its own copy of `read_prefix`.
+    """
+    excluded = gitignore.Gitignore({"": "\n".join(DEFAULT_EXCLUSIONS + exclusions)})
+    to_scan = [
+        path
+        for path in paths
+        if _comment_syntax(path) is not None and excluded.ignored_by(path) is None
+    ]
+    jobs = jobs or os.cpu_count() or 1
+    if not parallel or jobs == 1 or len(to_scan) < MIN_FILES_FOR_POOL:
+        found = [has_header(path, read_prefix(path, HEADER_BYTES)) for path in to_scan]
+    else:
+        found = []
+        with worker_pool(jobs, _init_worker, (read_prefix,)) as executor:
+            for batch_result in executor.map(
+                _scan_batch_in_worker, batches(to_scan, BATCH_SIZE)
+            ):
+                found += batch_result
+    return sorted(path for path, ok in zip(to_scan, found) if not ok)
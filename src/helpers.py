@@ -1,9 +1,21 @@
+import codecs
+import fcntl
 import logging
+import os
+import signal
 import subprocess
-from typing import Optional
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
 from colorama import Back, Fore, Style
 
+import metrics
+import trace_profile
+
 
 def header(msg: str) -> None:
     logging.info(f"{Back.MAGENTA}{Style.BRIGHT} {msg} {Style.RESET_ALL}")
@@ -17,11 +29,271 @@ def substep(msg: str) -> None:
     logging.info(f"{Fore.CYAN}>> {msg}{Style.RESET_ALL}")
 
 
-def sh(cmd: str, workdir: Optional[str] = None) -> int:
+# How much of a command's output is kept to report along with its result
+TAIL_BYTES = 64 * 1024
+# How long a timed out command gets to exit after SIGTERM, before SIGKILL
+KILL_GRACE_SECONDS = 10
+
+
+class CommandResult(NamedTuple):
+    # Negative signal number if the command was killed by a signal
+    status: int
+    timed_out: bool = False
+    # The last TAIL_BYTES of stdout and stderr, interleaved
+    output_tail: str = ""
+    wall_seconds: float = 0.0
+    # User and system CPU time, and peak resident set size, of the command
+    # and the descendants it waited for. The peak is at least what the
+    # process shared with this one before it started bash.
+    cpu_seconds: float = 0.0
+    max_rss_kib: int = 0
+
+
+class _Tail:
+    """A ring buffer keeping the last `size` bytes written to it."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.data = bytearray()
+
+    def write(self, chunk: bytes) -> None:
+        self.data += chunk
+        excess = len(self.data) - self.size
+        if excess > 0:
+            del self.data[:excess]
+
+    def text(self) -> str:
+        return self.data.decode(errors="replace")
+
+
+def _pump(pipe: IO[bytes], tail: _Tail, sink: Optional[Callable[[bytes], None]]):
+    while True:
+        chunk = os.read(pipe.fileno(), 65536)
+        if not chunk:
+            break
+        tail.write(chunk)
+        if sink is not None:
+            sink(chunk)
+    pipe.close()
+
+
+def _sink(output: Optional[IO], quiet: bool) -> Optional[Callable[[bytes], None]]:
+    if quiet:
+        return None
+    if output is None:
+        stdout = sys.stdout.buffer
+
+        def to_terminal(chunk: bytes) -> None:
+            stdout.write(chunk)
+            stdout.flush()
+
+        return to_terminal
+    # Chunks can end in the middle of a character
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    def to_output(chunk: bytes) -> None:
+        output.write(decoder.decode(chunk))
+        output.flush()
+
+    return to_output
+
+
+def _kill_group(pgid: int, sig: int) -> None:
+    try:
+        os.killpg(pgid, sig)
+    except ProcessLookupError:
+        pass
+
+
+def _reap(pid: int) -> Tuple[int, Any, Dict[str, int]]:
+    """Wait for child `pid`; returns its wait status, rusage and I/O counters."""
+    if hasattr(os, "waitid"):
+        # The counters are gone once it's reaped
+        os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+    io = metrics.process_io(pid)
+    _, wait_status, rusage = os.wait4(pid, 0)
+    return wait_status, rusage, io
+
+
+def _exit_status(wait_status: int) -> int:
+    if os.WIFSIGNALED(wait_status):
+        return -os.WTERMSIG(wait_status)
+    return os.WEXITSTATUS(wait_status)
+
+
+def _max_rss_kib(rusage: Any) -> int:
+    # Kilobytes on Linux, bytes on macOS
+    return rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss
+
+
+def run(
+    args: List[str], input: bytes = b"", check: bool = False
+) -> "subprocess.CompletedProcess[bytes]":
+    """
+    Like subprocess.run with stdout and stderr captured, for commands that
+    aren't worth a shell: their resource usage is recorded just like that of
+    sh's commands.
+    """
+    process = subprocess.Popen(
+        args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    outputs: Dict[str, bytes] = {}
+
+    def feed() -> None:
+        assert process.stdin is not None
+        try:
+            process.stdin.write(input)
+            process.stdin.close()
+        except BrokenPipeError:
+            # It's not reading everything; its exit status tells why
+            pass
+
+    def read(name: str, pipe: Optional[IO[bytes]]) -> None:
+        assert pipe is not None
+        outputs[name] = pipe.read()
+        pipe.close()
+
+    threads = [
+        threading.Thread(target=feed),
+        threading.Thread(target=read, args=("stdout", process.stdout)),
+        threading.Thread(target=read, args=("stderr", process.stderr)),
+    ]
+    for thread in threads:
+        thread.start()
+    wait_status, rusage, io = _reap(process.pid)
+    for thread in threads:
+        thread.join()
+    # Already reaped; keep Popen from trying again
+    process.returncode = _exit_status(wait_status)
+    metrics.finished_command(
+        rusage.ru_utime + rusage.ru_stime, _max_rss_kib(rusage), io
+    )
+    completed = subprocess.CompletedProcess(
+        args, process.returncode, outputs["stdout"], outputs["stderr"]
+    )
+    if check:
+        completed.check_returncode()
+    return completed
+
+
+def sh(
+    cmd: str,
+    workdir: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    output: Optional[IO] = None,
+    timeout: Optional[float] = None,
+    capture: bool = True,
+    quiet: bool = False,
+) -> CommandResult:
+    """
+    Run `cmd` in bash, with `env` added to the environment, if given. Its
+    stdout and stderr go to `output` if given, otherwise to the terminal, and
+    their tail is kept in the result; with `quiet`, they're only kept.
+
+    The command runs in a process group of its own, which is killed if it
+    takes longer than `timeout` seconds, and once the command exited, so
+    that nothing it left behind keeps running. Commands that need the
+    terminal, like a pager or a prompt, need `capture` off: they then get
+    the terminal as is, and neither a timeout nor an output tail.
+    """
     msg = f"Executing `{cmd}`"
     if workdir is not None:
         msg += f" in '{workdir}'"
-    substep(msg)
-    return subprocess.call(
-        f"set -euo pipefail; {cmd}", shell=True, cwd=workdir, executable="bash"
-    )
+    if output is not None:
+        # Before the command's own output
+        output.write(f">> {msg}\n")
+        output.flush()
+    elif not quiet:
+        substep(msg)
+    with trace_profile.span(cmd, "command", workdir=workdir) as span_args:
+        start = time.monotonic()
+        process = subprocess.Popen(
+            ["bash", "-c", f"set -euo pipefail; {cmd}"],
+            cwd=workdir,
+            env=None if env is None else {**os.environ, **env},
+            stdin=subprocess.DEVNULL if capture else None,
+            stdout=subprocess.PIPE if capture else None,
+            stderr=subprocess.STDOUT if capture else None,
+            # A process group of its own, with no way to grab the terminal
+            start_new_session=capture,
+        )
+        tail = _Tail(TAIL_BYTES)
+        pump = None
+        if process.stdout is not None:
+            pump = threading.Thread(
+                target=_pump, args=(process.stdout, tail, _sink(output, quiet))
+            )
+            pump.start()
+
+        # Popen can't report resource usage, so reap the process ourselves
+        waited: List[Tuple[int, Any, Dict[str, int]]] = []
+        waiter = threading.Thread(target=lambda: waited.append(_reap(process.pid)))
+        waiter.start()
+        waiter.join(timeout if capture else None)
+        timed_out = waiter.is_alive()
+        if timed_out:
+            _kill_group(process.pid, signal.SIGTERM)
+            waiter.join(KILL_GRACE_SECONDS)
+            if waiter.is_alive():
+                _kill_group(process.pid, signal.SIGKILL)
+            waiter.join()
+        if capture:
+            # Whatever is left of the group may hold on to the pipe
+            _kill_group(process.pid, signal.SIGKILL)
+        if pump is not None:
+            pump.join()
+
+        wait_status, rusage, io = waited[0]
+        status = _exit_status(wait_status)
+        # Already reaped; keep Popen from trying again
+        process.returncode = status
+        result = CommandResult(
+            status=status,
+            timed_out=timed_out,
+            output_tail=tail.text(),
+            wall_seconds=time.monotonic() - start,
+            cpu_seconds=rusage.ru_utime + rusage.ru_stime,
+            max_rss_kib=_max_rss_kib(rusage),
+        )
+        metrics.finished_command(result.cpu_seconds, result.max_rss_kib, io)
+        span_args["exit_status"] = status
+        span_args["timed_out"] = timed_out
+        span_args["cpu_seconds"] = result.cpu_seconds
+        span_args["max_rss_kib"] = result.max_rss_kib
+    return result
+
+
+def sh_all(
+    cmds: List[str],
+    jobs: Optional[int] = None,
+    workdir: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> List[CommandResult]:
+    """
+    Run `cmds` concurrently, at most `jobs` at a time, and only capture
+    their output.
+    """
+    if not cmds:
+        return []
+    with ThreadPoolExecutor(max_workers=jobs or len(cmds)) as executor:
+        return list(
+            executor.map(
+                metrics.bind(
+                    lambda cmd: sh(cmd, workdir, env, timeout=timeout, quiet=True)
+                ),
+                cmds,
+            )
+        )
+
+
+@contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on `path`, shared across processes."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,218 @@
+import re
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+import apache_2_license
+import license_texts
+
+# Number of consecutive words hashed together; long enough that licenses
+# only share shingles where they really share wording
+SHINGLE_SIZE = 5
+# Share of a paragraph's shingles a license needs to have for the paragraph
+# to count as part of that license
+PARAGRAPH_THRESHOLD = 0.5
+# Share of a license's shingles a section needs to have to be identified as it
+MATCH_THRESHOLD = 0.8
+# Paragraphs at least this long that are mostly in a section already start a
+# new one; shorter ones, like titles, are often repeated within licenses
+REPEAT_MIN_SHINGLES = 15
+
+_WORD = re.compile(r"[a-z0-9]+")
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n|\n[ \t]*[-=*_]{3,}[ \t]*\n")
+
+
+class License(NamedTuple):
+    # SPDX identifier
+    spdx_id: str
+    # Per the ASF's third-party license policy: "A" may be included in
+    # releases, "B" only in binary form, "X" not at all
+    category: str
+    text: str
+
+
+APACHE_2 = License("Apache-2.0", "A", apache_2_license.text)
+
+LICENSES = [
+    APACHE_2,
+    License("MIT", "A", license_texts.MIT),
+    License("BSD-2-Clause", "A", license_texts.BSD_2_CLAUSE),
+    License("BSD-3-Clause", "A", license_texts.BSD_3_CLAUSE),
+    License("ISC", "A", license_texts.ISC),
+    License("MPL-2.0", "B", license_texts.MPL_2_0),
+    License("EPL-1.0", "B", license_texts.EPL_1_0),
+    License("EPL-2.0", "B", license_texts.EPL_2_0),
+    License("GPL-2.0", "X", license_texts.GPL_2_0),
+    License("GPL-3.0", "X", license_texts.GPL_3_0),
+    License("LGPL-2.1", "X", license_texts.LGPL_2_1),
+]
+
+
+class Section(NamedTuple):
+    # 1-based, inclusive
+    first_line: int
+    last_line: int
+    # None if the section isn't any license known here
+    license: Optional[License]
+    # Share of the license's text found in the section
+    score: float
+
+
+def words(text: str) -> List[str]:
+    """
+    The words of `text`, which is all that's compared: case, punctuation,
+    and how the text is wrapped and indented don't matter.
+    """
+    return _WORD.findall(text.lower())
+
+
+def _shingles(text_words: List[str]) -> Set[int]:
+    return {
+        hash(shingle) for shingle in zip(*(text_words[i:] for i in range(SHINGLE_SIZE)))
+    }
+
+
+class _Index:
+    """Which licenses each shingle occurs in; built once, at import time."""
+
+    def __init__(self, licenses: List[License]):
+        self.licenses = licenses
+        self.shingles: List[Set[int]] = []
+        self.by_shingle: Dict[int, Set[int]] = {}
+        for i, license in enumerate(licenses):
+            shingles = _shingles(words(license.text))
+            self.shingles.append(shingles)
+            for shingle in shingles:
+                self.by_shingle.setdefault(shingle, set()).add(i)
+
+    def candidates(self, shingles: Set[int]) -> FrozenSet[int]:
+        """The licenses sharing most of `shingles`."""
+        counts: Dict[int, int] = {}
+        for shingle in shingles:
+            for i in self.by_shingle.get(shingle, ()):
+                counts[i] = counts.get(i, 0) + 1
+        return frozenset(
+            i
+            for i, count in counts.items()
+            if count >= PARAGRAPH_THRESHOLD * len(shingles)
+        )
+
+    def best_match(
+        self, candidates: FrozenSet[int], shingles: Set[int]
+    ) -> Tuple[Optional[License], float]:
+        """
+        The candidate most completely contained in `shingles`; of licenses
+        contained equally well (like BSD-2-Clause in BSD-3-Clause), the one
+        leaving the least of the section unexplained.
+        """
+        best: Optional[Tuple[float, float, int]] = None
+        for i in candidates:
+            common = len(self.shingles[i] & shingles)
+            recall = common / len(self.shingles[i])
+            precision = common / len(shingles)
+            if best is None or (recall, precision) > best[:2]:
+                best = (recall, precision, i)
+        if best is None or best[0] < MATCH_THRESHOLD:
+            return None, 0.0 if best is None else best[0]
+        return self.licenses[best[2]], best[0]
+
+
+_index = _Index(LICENSES)
+
+
+def _paragraphs(text: str) -> List[Tuple[int, int, List[str]]]:
+    """(first line, last line, words) of each paragraph of `text`."""
+    paragraphs = []
+    start = 0
+    for match in list(_PARAGRAPH_BREAK.finditer(text)) + [None]:
+        end = len(text) if match is None else match.start()
+        paragraph_words = words(text[start:end])
+        if paragraph_words:
+            first_line = text.count("\n", 0, start) + 1
+            # Leading empty lines don't count
+            first_line += len(text[start:end]) - len(text[start:end].lstrip("\n"))
+            last_line = text.count("\n", 0, end) + 1
+            paragraphs.append((first_line, last_line, paragraph_words))
+        if match is not None:
+            start = match.end()
+    return paragraphs
+
+
+class _Run:
+    """Consecutive paragraphs that may be the same license."""
+
+    def __init__(self, first_line: int, candidates: Optional[FrozenSet[int]]) -> None:
+        self.first_line = first_line
+        self.last_line = first_line
+        # None if the paragraphs aren't part of any license known here
+        self.candidates = candidates
+        self.words: List[str] = []
+        self.shingles: Set[int] = set()
+
+    def add(self, last_line: int, paragraph_words: List[str], shingles: Set[int]):
+        self.last_line = last_line
+        self.words += paragraph_words
+        self.shingles |= shingles
+
+
+def _repeats(run: _Run, shingles: Set[int]) -> bool:
+    return len(shingles) >= REPEAT_MIN_SHINGLES and len(
+        shingles & run.shingles
+    ) >= PARAGRAPH_THRESHOLD * len(shingles)
+
+
+def identify(text: str) -> List[Section]:
+    """
+    Split `text`, like a LICENSE file, into sections that are each one license
+    (or aren't any license known here), and identify them.
+
+    Paragraphs are matched against the index one by one. Consecutive
+    paragraphs that have a license in common make up a section, unless a
+    paragraph repeats what the section already has, as when the licenses of
+    several bundled libraries follow each other. Each section is then
+    identified as the license it contains most of.
+    """
+    runs: List[_Run] = []
+    for first_line, last_line, paragraph_words in _paragraphs(text):
+        shingles = _shingles(paragraph_words)
+        run = runs[-1] if runs else None
+        if not shingles:
+            # Too short to tell, like a heading; goes with what's around it
+            if run is None:
+                run = _Run(first_line, None)
+                runs.append(run)
+            run.add(last_line, paragraph_words, shingles)
+            continue
+
+        candidates = _index.candidates(shingles) or None
+        if run is not None and candidates is None and run.candidates is None:
+            run.add(last_line, paragraph_words, shingles)
+            continue
+        if (
+            run is not None
+            and candidates is not None
+            and run.candidates is not None
+            and candidates & run.candidates
+            and not _repeats(run, shingles)
+        ):
+            run.candidates &= candidates
+            run.add(last_line, paragraph_words, shingles)
+            continue
+        run = _Run(first_line, candidates)
+        run.add(last_line, paragraph_words, shingles)
+        runs.append(run)
+
+    sections: List[Section] = []
+    for run in runs:
+        license, score = None, 0.0
+        if run.candidates is not None:
+            # Shingles spanning paragraph breaks count too
+            license, score = _index.best_match(run.candidates, _shingles(run.words))
+        sections.append(Section(run.first_line, run.last_line, license, score))
+    return sections
+
+
+_apache_2_words = words(apache_2_license.text)
+
+
+def starts_with_apache_2(text: str) -> bool:
+    """Whether `text` starts with the Apache License 2.0, however it's wrapped."""
+    return words(text)[: len(_apache_2_words)] == _apache_2_words
@@ -1,16 +1,27 @@
+import atexit
 import logging
 import os
 import sys
 import tempfile
-from typing import Optional
+from typing import Dict, List, Optional
 
 import click
 import colorama
 from colorama import Fore, Style
 
+import archive
+import trace_profile
+from approvals import ApprovalStore
+from batch import BatchEntry, BatchError, load_batch, verify_all
 from checks import State, checks, run_checks
-from helpers import header, sh, step
-from report import print_report
+from download import Download, Downloader, DownloadError
+from download_cache import DownloadCache, link_or_copy
+from helpers import header, step
+from pgp import KeyIndex, KeysError
+from project_config import ProjectConfig, ProjectConfigError
+from project_config import load as load_project_config
+from report import REPORT_WRITERS, exit_code, print_batch_summary, print_report
+from result_cache import ResultCache
 
 DISCLAIMER = """
 This script is provided as a convenience to automate some steps
@@ -23,12 +34,41 @@ USER_AGENT = "gh:openzipkin-contrib/apache-release-verification"
 @click.command()
 @click.option("--project", default="zipkin")
 @click.option("--module")
-@click.option("--version", required=True)
-@click.option("--gpg-key", required=True, help="ID of GPG key used to sign the release")
+@click.option("--version", help="Required unless --batch is given")
 @click.option(
-    "--git-hash", required=True, help="Git hash of the commit the release is built from"
+    "--gpg-key",
+    help="ID of GPG key used to sign the release. Required unless --batch is "
+    "given, where it's the default for entries without a key.",
+)
+@click.option(
+    "--git-hash",
+    help="Git hash of the commit the release is built from. Required unless "
+    "--batch is given.",
+)
+@click.option(
+    "--batch",
+    "batch_file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Verify all releases listed in this JSON file instead of a single one. "
+    'It holds a list of objects with the keys "version", "git_hash", and '
+    'optionally "module", "project" and "gpg_key". Interactive checks are '
+    "skipped.",
+)
+@click.option(
+    "--batch-jobs",
+    type=int,
+    default=min(4, os.cpu_count() or 1),
+    show_default=True,
+    help="Number of releases to verify concurrently in batch mode, each in a "
+    "process of its own running up to --jobs checks.",
 )
 @click.option("--repo", default="dev", help="dev, release, or test")
+@click.option(
+    "--dist-url",
+    default="https://dist.apache.org/repos/dist",
+    show_default=True,
+    help="Root URL of the Apache distribution directory to download from.",
+)
 @click.option(
     "--incubating/--not-incubating",
     is_flag=True,
@@ -40,8 +80,15 @@ USER_AGENT = "gh:openzipkin-contrib/apache-release-verification"
 @click.option(
     "--zipname-template",
     default="apache-{project}{dash_module}{dash_incubating}-{version}-source-release",
-    help="Specify the format of the expected .zip filename. Supports the same "
-    "placeholders as --sourcedir-template.",
+    help="Specify the format of the expected archive filename, without the "
+    "extension. Supports the same placeholders as --sourcedir-template.",
+)
+@click.option(
+    "--archive-extension",
+    type=click.Choice(["zip", "tar.gz", "tgz"]),
+    default="zip",
+    show_default=True,
+    help="Extension (and format) of the source archive.",
 )
 @click.option(
     "--sourcedir-template",
@@ -56,78 +103,354 @@ USER_AGENT = "gh:openzipkin-contrib/apache-release-verification"
     help="Specify the format for the name of the GitHub repository of the project."
     "Supports the same placeholders as --sourcedir-template.",
 )
+@click.option(
+    "--git-remote-base",
+    default="https://github.com/apache",
+    show_default=True,
+    help="Base URL the git repository is cloned from; the repository name is "
+    "appended to it. A file:// URL works too.",
+)
+@click.option(
+    "--git-mirror/--no-git-mirror",
+    default=False,
+    help="Keep a bare mirror of the git repository in the cache directory, "
+    "update it incrementally, and use it as the source of git objects.",
+)
 @click.option(
     "--build-and-test-command",
     help="Instead of built-in heuristics, use this command to build and "
     "test the release. Executed with the exctracted source release archive "
     "as the working directory.",
 )
+@click.option(
+    "--build-cache/--no-build-cache",
+    default=True,
+    show_default=True,
+    help="Keep the Maven repository, Maven wrapper distributions and npm cache "
+    "of each project in the cache directory, rather than downloading all "
+    "dependencies for every build.",
+)
+@click.option(
+    "--offline-build",
+    type=click.Choice(["auto", "always", "never"]),
+    default="auto",
+    show_default=True,
+    help="Whether builds run offline. With auto, they do once a build of the "
+    "project succeeded with the build cache, and are run online again if "
+    "that fails.",
+)
+@click.option(
+    "--build-threads",
+    help="Number of threads for Maven builds, like 4 or 1C (one per core); "
+    "passed as -T.",
+)
+@click.option(
+    "--test-forks",
+    type=int,
+    help="Number of JVMs Maven runs tests in concurrently (forkCount).",
+)
+@click.option(
+    "--command-timeout",
+    type=float,
+    default=7200,
+    show_default=True,
+    help="Kill git and build commands, and everything they started, after "
+    "this many seconds. 0 means never.",
+)
+@click.option(
+    "--jobs",
+    type=int,
+    default=os.cpu_count() or 1,
+    show_default=True,
+    help="Number of checks to run concurrently. Checks only start once the "
+    "checks they depend on have finished.",
+)
+@click.option(
+    "--cache-dir",
+    default=lambda: default_cache_dir(),
+    show_default="$XDG_CACHE_HOME/apache-release-verification",
+    help="Directory for data kept between runs, like downloaded files.",
+)
+@click.option(
+    "--download-cache-size",
+    type=int,
+    default=2048,
+    show_default=True,
+    help="Maximum size of the download cache, in MiB.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Run all checks, even those whose inputs (archive, KEYS, git "
+    "revision, tools, ...) are unchanged since an earlier run that found no "
+    "problem. Their new results are still cached.",
+)
+@click.option(
+    "--max-extracted-size",
+    type=int,
+    default=archive.Limits().max_total_size // 2**20,
+    show_default=True,
+    help="Refuse to extract source archives larger than this many MiB.",
+)
+@click.option(
+    "--max-extracted-files",
+    type=int,
+    default=archive.Limits().max_files,
+    show_default=True,
+    help="Refuse to extract source archives with more files than this.",
+)
+@click.option(
+    "--max-compression-ratio",
+    type=float,
+    default=archive.Limits().max_ratio,
+    show_default=True,
+    help="Refuse to extract source archives containing files that compress "
+    "better than this ratio, as they are likely to be archive bombs.",
+)
+@click.option(
+    "--triage",
+    is_flag=True,
+    help="Quick triage: inspect the source archive without extracting it, and "
+    "skip the checks that need it extracted (comparing with git, interactive "
+    "reviews, building).",
+)
+@click.option(
+    "--project-config",
+    type=click.Path(exists=True, dir_okay=False),
+    help="INI file with settings for the project, like files that don't need "
+    "a license header.",
+)
+@click.option(
+    "--interactive/--non-interactive",
+    default=True,
+    show_default=True,
+    help="Whether to ask you to review files like LICENSE and NOTICE. Files "
+    "whose content you approved for the project before pass either way; "
+    "without asking, the others are reported as needing review. Batch mode "
+    "never asks.",
+)
+@click.option(
+    "--report-format",
+    type=click.Choice(["text", "json", "junit"]),
+    default="text",
+    show_default=True,
+    help="Besides printing the report, also write it in this machine-readable "
+    "format, including the time and resources each check used.",
+)
+@click.option(
+    "--report-file",
+    type=click.Path(dir_okay=False, writable=True, resolve_path=True),
+    help="Where to write the machine-readable report. Defaults to "
+    "release-report.json or release-report.xml in the current directory.",
+)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, writable=True, resolve_path=True),
+    help="Write a trace of the run (checks, commands, downloads) to this file, "
+    "in the Chrome trace event format. Open it in https://ui.perfetto.dev or "
+    "chrome://tracing.",
+)
+@click.option(
+    "--profile-python",
+    type=click.Path(dir_okay=False, writable=True, resolve_path=True),
+    help="Profile the Python code of checks and downloads with cProfile, and "
+    "write the stats to this file (readable with the pstats module).",
+)
 @click.option("-v", "--verbose", is_flag=True)
 def main(
     project: str,
     module: Optional[str],
-    version: str,
-    git_hash: str,
-    gpg_key: str,
+    version: Optional[str],
+    git_hash: Optional[str],
+    gpg_key: Optional[str],
+    batch_file: Optional[str],
+    batch_jobs: int,
     repo: str,
+    dist_url: str,
     incubating: bool,
     zipname_template: str,
+    archive_extension: str,
     sourcedir_template: str,
     github_reponame_template: str,
+    git_remote_base: str,
+    git_mirror: bool,
     build_and_test_command: Optional[str],
+    build_cache: bool,
+    offline_build: str,
+    build_threads: Optional[str],
+    test_forks: Optional[int],
+    command_timeout: float,
+    jobs: int,
+    cache_dir: str,
+    download_cache_size: int,
+    no_cache: bool,
+    max_extracted_size: int,
+    max_extracted_files: int,
+    max_compression_ratio: float,
+    triage: bool,
+    project_config: Optional[str],
+    interactive: bool,
+    report_format: str,
+    report_file: Optional[str],
+    profile: Optional[str],
+    profile_python: Optional[str],
     verbose: bool,
 ) -> None:
     configure_logging(verbose)
+    if profile is not None or profile_python is not None:
+        trace_profile.enable(
+            trace=profile is not None, python_profile=profile_python is not None
+        )
+        # Written however the run ends, as slow failing runs are interesting too
+        atexit.register(trace_profile.write, profile, profile_python)
     logging.debug(
         f"Arguments: project={project} module={module} version={version} "
         f"incubating={incubating} verbose={verbose} "
-        f"zipname_template={zipname_template} sourcedir_template={sourcedir_template} "
+        f"zipname_template={zipname_template} archive_extension={archive_extension} "
+        f"sourcedir_template={sourcedir_template} "
         f"github_reponame_template={github_reponame_template} "
-        f"build_and_test_command={build_and_test_command} "
+        f"git_remote_base={git_remote_base} git_mirror={git_mirror} "
+        f"build_and_test_command={build_and_test_command} jobs={jobs} "
+        f"build_cache={build_cache} offline_build={offline_build} "
+        f"build_threads={build_threads} test_forks={test_forks} "
+        f"command_timeout={command_timeout} "
+        f"cache_dir={cache_dir} download_cache_size={download_cache_size} "
+        f"no_cache={no_cache} "
+        f"triage={triage} batch_file={batch_file} batch_jobs={batch_jobs} "
+        f"interactive={interactive} project_config={project_config} "
+        f"report_format={report_format} report_file={report_file} "
+        f"profile={profile} profile_python={profile_python} "
         f"gpg_key={gpg_key} git_hash={git_hash}"
     )
 
-    header_msg = f"Verifying release candidate for {project}"
-    if module:
-        header_msg += f"/{module}"
-    header_msg += f" {version}"
+    if batch_file is not None:
+        try:
+            entries = load_batch(batch_file, project, gpg_key)
+        except BatchError as ex:
+            raise click.UsageError(str(ex))
+    else:
+        if version is None or gpg_key is None or git_hash is None:
+            raise click.UsageError(
+                "--version, --gpg-key and --git-hash are required without --batch"
+            )
+        entries = [BatchEntry(project, module, version, git_hash, gpg_key)]
+    config = ProjectConfig()
+    if project_config is not None:
+        try:
+            config = load_project_config(project_config)
+        except ProjectConfigError as ex:
+            raise click.UsageError(str(ex))
+    if report_format == "text" and report_file is not None:
+        raise click.UsageError("--report-file needs --report-format json or junit")
+    if report_format != "text" and report_file is None:
+        # Resolved now, before changing into the working directory
+        extension = {"json": "json", "junit": "xml"}[report_format]
+        report_file = os.path.abspath(f"release-report.{extension}")
+
+    if batch_file is None:
+        header_msg = f"Verifying release candidate for {project}"
+        if module:
+            header_msg += f"/{module}"
+        header_msg += f" {version}"
+    else:
+        header_msg = f"Verifying {len(entries)} release candidates"
     header(header_msg)
     logging.info(f"{Fore.YELLOW}{DISCLAIMER}{Style.RESET_ALL}")
 
     workdir = make_and_enter_workdir()
     logging.info(f"Working directory: {workdir}")
 
-    base_url = generate_base_url(repo, project, incubating)
-    logging.debug(f"Base URL: {base_url}")
-
-    fetch_project(base_url, module, version, incubating)
-    fetch_keys(base_url)
-
-    state = State(
-        project=project,
-        module=module,
-        version=version,
-        work_dir=workdir,
-        incubating=incubating,
-        zipname_template=zipname_template,
-        sourcedir_template=sourcedir_template,
-        github_reponame_template=github_reponame_template,
-        gpg_key=gpg_key,
-        git_hash=git_hash,
-        build_and_test_command=build_and_test_command,
+    cache = ResultCache(os.path.join(cache_dir, "results.sqlite"))
+    approval_store = ApprovalStore(os.path.join(cache_dir, "approvals.sqlite"))
+    states = []
+    for entry in entries:
+        # Each release of a batch gets a working directory of its own
+        entry_workdir = workdir
+        if batch_file is not None:
+            entry_workdir = os.path.join(workdir, entry.label)
+            os.makedirs(entry_workdir)
+        states.append(
+            State(
+                project=entry.project,
+                module=entry.module,
+                version=entry.version,
+                work_dir=entry_workdir,
+                incubating=incubating,
+                zipname_template=zipname_template,
+                sourcedir_template=sourcedir_template,
+                github_reponame_template=github_reponame_template,
+                gpg_key=entry.gpg_key,
+                git_hash=entry.git_hash,
+                build_and_test_command=build_and_test_command,
+                archive_extension=archive_extension,
+                extraction_limits=archive.Limits(
+                    max_total_size=max_extracted_size * 2**20,
+                    max_files=max_extracted_files,
+                    max_ratio=max_compression_ratio,
+                ),
+                triage=triage,
+                git_remote_base=git_remote_base,
+                git_mirror_dir=os.path.join(cache_dir, "git") if git_mirror else None,
+                build_cache_dir=(
+                    os.path.join(cache_dir, "build") if build_cache else None
+                ),
+                offline_build=offline_build,
+                build_threads=build_threads,
+                test_forks=test_forks,
+                command_timeout=command_timeout or None,
+                project_config=config,
+                result_cache=cache,
+                use_cached_results=not no_cache,
+                approvals=approval_store,
+                # Releases of a batch are verified concurrently, so nothing
+                # can have the terminal
+                interactive=interactive and batch_file is None,
+            )
+        )
+
+    download_cache = DownloadCache(
+        os.path.join(cache_dir, "downloads"), download_cache_size * 2**20
+    )
+    downloader = Downloader(USER_AGENT, cache=download_cache)
+    fetch_releases(downloader, dist_url, repo, states)
+    stats = download_cache.stats
+    logging.info(
+        f"Download cache: {stats.hits} hits, {stats.misses} misses, "
+        f"{stats.bytes_from_cache / 2**20:.1f} MiB served from cache, "
+        f"{stats.bytes_downloaded / 2**20:.1f} MiB downloaded"
     )
 
     # TODO this is the place to filter checks here with optional arguments
-    report = run_checks(state, checks=checks)
-    print_report(report)
-    if report.problem_count == 0:
+    selected_checks = checks
+    if triage:
+        selected_checks = [check for check in checks if not check.needs_extraction]
+        skipped = [check.name for check in checks if check.needs_extraction]
+        logging.info(f"Triage mode, skipping checks: {', '.join(skipped)}")
+
+    labels = [entry.label for entry in entries]
+    if batch_file is None:
+        reports = [run_checks(states[0], checks=selected_checks, jobs=jobs)]
+        print_report(reports[0])
+    else:
+        reports = verify_all(states, labels, selected_checks, jobs, batch_jobs)
+        for label, report in zip(labels, reports):
+            print_report(report, title=f"Summary for {label}")
+        print_batch_summary(labels, reports)
+
+    if report_file is not None:
+        with open(report_file, "w") as f:
+            REPORT_WRITERS[report_format](dict(zip(labels, reports)), f)
+        logging.info(f"Wrote {report_format} report to {report_file}")
+
+    problem_count = sum(report.problem_count for report in reports)
+
+    if problem_count == 0:
         logging.info(f"{Fore.GREEN}Everything seems to be in order.{Style.RESET_ALL}")
     else:
         logging.info(
-            f"{Fore.RED}Found {report.problem_count} "
-            f"potential problems.{Style.RESET_ALL}"
+            f"{Fore.RED}Found {problem_count} potential problems.{Style.RESET_ALL}"
         )
-        sys.exit(1)
+    sys.exit(exit_code(reports))
 
 
 def configure_logging(verbose: bool) -> None:
@@ -138,45 +461,101 @@ def configure_logging(verbose: bool) -> None:
     logging.basicConfig(level=level, format="%(message)s")
 
 
+def default_cache_dir() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_home, "apache-release-verification")
+
+
 def make_and_enter_workdir() -> str:
     workdir = tempfile.mkdtemp()
     os.chdir(workdir)
     return workdir
 
 
-def generate_base_url(repo: str, project: str, incubating: bool) -> str:
-    url = f"https://dist.apache.org/repos/dist/{repo}/"
+def generate_base_url(dist_url: str, repo: str, project: str, incubating: bool) -> str:
+    url = f"{dist_url.rstrip('/')}/{repo}/"
     if incubating:
         url += "incubator/"
     url += project
     return url
 
 
-def fetch_project(
-    base_url: str, module: Optional[str], version: str, incubating: bool
-) -> None:
-    step("Downloading release")
+def plan_project_downloads(
+    downloader: Downloader,
+    base_url: str,
+    project: str,
+    module: Optional[str],
+    version: str,
+    workdir: str,
+) -> List[Download]:
+    step("Listing release")
 
     version_root = f"{base_url}/"
     if module:
         version_root += f"{module}/"
     version_root += version
 
-    cut_dirs = 3
-    if module:
-        cut_dirs += 1
-    if incubating:
-        cut_dirs += 1
-    sh(
-        "wget --recursive --no-parent --reject index.html "
-        f"--no-verbose --user-agent='{USER_AGENT}' "
-        f"--no-host-directories --cut-dirs={cut_dirs} {version_root}"
+    return downloader.plan_tree(
+        version_root, os.path.join(workdir, module or project, version)
     )
 
 
-def fetch_keys(base_url: str) -> None:
-    step("Downloading KEYS file")
-    sh(f"wget --no-verbose --user-agent='{USER_AGENT}' {base_url}/KEYS")
+def plan_keys_download(base_url: str, workdir: str) -> Download:
+    return Download(f"{base_url}/KEYS", os.path.join(workdir, "KEYS"))
+
+
+def fetch_releases(
+    downloader: Downloader, dist_url: str, repo: str, states: List[State]
+) -> None:
+    """
+    Download all releases in one go. Releases of the same project share their
+    KEYS file: it's downloaded and parsed only once.
+    """
+    with trace_profile.span("fetch releases", "download"):
+        _fetch_releases(downloader, dist_url, repo, states)
+
+
+def _fetch_releases(
+    downloader: Downloader, dist_url: str, repo: str, states: List[State]
+) -> None:
+    downloads = []
+    keys_downloads: Dict[str, Download] = {}
+    for state in states:
+        base_url = generate_base_url(dist_url, repo, state.project, state.incubating)
+        logging.debug(f"Base URL: {base_url}")
+        try:
+            downloads += plan_project_downloads(
+                downloader,
+                base_url,
+                state.project,
+                state.module,
+                state.version,
+                state.work_dir,
+            )
+        except DownloadError as ex:
+            logging.error(f"{Fore.RED}{ex}{Style.RESET_ALL}")
+        if base_url not in keys_downloads:
+            keys_downloads[base_url] = plan_keys_download(base_url, state.work_dir)
+    downloads += keys_downloads.values()
+    step(f"Downloading releases and KEYS files ({len(downloads)} files)")
+    for error in downloader.fetch_all(downloads):
+        logging.error(f"{Fore.RED}{error}{Style.RESET_ALL}")
+
+    key_indexes: Dict[str, KeyIndex] = {}
+    for state in states:
+        base_url = generate_base_url(dist_url, repo, state.project, state.incubating)
+        keys_path = keys_downloads[base_url].path
+        if not os.path.exists(keys_path):
+            continue
+        if keys_path != state.keys_path:
+            link_or_copy(keys_path, state.keys_path)
+        if keys_path not in key_indexes:
+            try:
+                key_indexes[keys_path] = KeyIndex.from_file(keys_path)
+            except KeysError:
+                # Reported by the checks
+                continue
+        state.key_index = key_indexes[keys_path]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,168 @@
+import hashlib
+import stat
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional
+
+import classifier
+from source_tree import Entry, SourceTree
+
+
+def _encode(path: str) -> bytes:
+    return path.encode("utf-8", errors="surrogateescape")
+
+
+class _EncodedPaths:
+    """Sequence view of the encoded paths, for bisecting on them."""
+
+    def __init__(self, manifest: "Manifest"):
+        self._manifest = manifest
+
+    def __len__(self) -> int:
+        return len(self._manifest)
+
+    def __getitem__(self, index: int) -> bytes:
+        return self._manifest._encoded_path(index)
+
+
+class Manifest:
+    """
+    Everything in the source tree, listed by a single walk of it and shared by
+    all checks, so none of them needs to walk the tree again.
+
+    Entries are kept sorted by path in columns: all paths in one bytes object,
+    sizes and modes in arrays. That takes a fraction of the memory of an object
+    per entry, which matters for trees with millions of files. Content hashes
+    and whether files are binary are only worked out when first asked for.
+    """
+
+    def __init__(
+        self, tree: SourceTree, file_classifier: Optional[classifier.Classifier] = None
+    ):
+        self.tree = tree
+        self._classifier = file_classifier or classifier.Classifier()
+        # The columns are filled in the tree's order, then put in path order;
+        # the entries themselves are never all kept
+        paths: List[bytes] = []
+        sizes = array("Q")
+        modes = array("I")
+        link_targets: Dict[int, str] = {}
+        for entry in tree.entries():
+            if entry.link_target is not None:
+                link_targets[len(paths)] = entry.link_target
+            paths.append(_encode(entry.path))
+            sizes.append(entry.size)
+            modes.append(entry.mode)
+        order = sorted(range(len(paths)), key=paths.__getitem__)
+        self._offsets = array("Q", [0])
+        for index in order:
+            self._offsets.append(self._offsets[-1] + len(paths[index]))
+        self._paths = b"".join(paths[index] for index in order)
+        del paths
+        self._sizes = array("Q", (sizes[index] for index in order))
+        self._modes = array("I", (modes[index] for index in order))
+        # Only symlinks have one
+        self._link_targets = {
+            new: link_targets[old]
+            for new, old in enumerate(order)
+            if old in link_targets
+        }
+        # There are only a few distinct classifications, so each file just gets
+        # the position of its own in _classifications plus one; 0 means it's
+        # not classified yet
+        self._classification_ids = bytearray(len(order))
+        self._classifications: List[classifier.Classification] = []
+        self._hashes: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def _encoded_path(self, index: int) -> bytes:
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return self._paths[start:end]
+
+    def path(self, index: int) -> str:
+        return self._encoded_path(index).decode("utf-8", errors="surrogateescape")
+
+    def entry(self, index: int) -> Entry:
+        return Entry(
+            self.path(index),
+            self._sizes[index],
+            self._modes[index],
+            self._link_targets.get(index),
+        )
+
+    def index(self, path: str) -> Optional[int]:
+        """The index of `path`, or None if it's not in the tree."""
+        encoded = _encode(path)
+        index = bisect_left(_EncodedPaths(self), encoded)  # type: ignore
+        if index < len(self) and self._encoded_path(index) == encoded:
+            return index
+        return None
+
+    def __contains__(self, path: str) -> bool:
+        return self.index(path) is not None
+
+    def __iter__(self) -> Iterator[Entry]:
+        for index in range(len(self)):
+            yield self.entry(index)
+
+    def files(self) -> Iterator[Entry]:
+        """Regular files only, without directories and symlinks."""
+        for index in range(len(self)):
+            if stat.S_ISREG(self._modes[index]):
+                yield self.entry(index)
+
+    def _file_index(self, path: str) -> int:
+        index = self.index(path)
+        if index is None or not stat.S_ISREG(self._modes[index]):
+            raise FileNotFoundError(f"{path} is not a file in the source tree")
+        return index
+
+    def content_hash(self, path: str) -> str:
+        """The tree's hash of the file's content, or its SHA-256 if it has none."""
+        index = self._file_index(path)
+        with self._lock:
+            if index in self._hashes:
+                return self._hashes[index]
+        content_hash = self.tree.content_hash(path)
+        if content_hash is None:
+            content_hash = hashlib.sha256(self.tree.read(path)).hexdigest()
+        with self._lock:
+            self._hashes[index] = content_hash
+        return content_hash
+
+    def classify(self, paths: List[str]) -> Dict[str, classifier.Classification]:
+        """Classify the files at `paths`, sniffing only those not seen before."""
+        indexes = {path: self._file_index(path) for path in paths}
+        with self._lock:
+            to_classify = [
+                path
+                for path, index in indexes.items()
+                if not self._classification_ids[index]
+            ]
+        if to_classify:
+            # Only hashes known without reading the files are worth using here
+            classified = self._classifier.classify(
+                to_classify,
+                self.tree.read_prefix,
+                self.tree.content_hash,
+                parallel=self.tree.supports_worker_reads,
+            )
+            with self._lock:
+                for path, classification in classified.items():
+                    if classification not in self._classifications:
+                        self._classifications.append(classification)
+                    self._classification_ids[indexes[path]] = (
+                        self._classifications.index(classification) + 1
+                    )
+        with self._lock:
+            return {
+                path: self._classifications[self._classification_ids[index] - 1]
+                for path, index in indexes.items()
+            }
+
+    def is_binary(self, path: str) -> bool:
+        return self.classify([path])[path].is_binary
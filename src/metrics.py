@@ -0,0 +1,134 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class Usage(NamedTuple):
+    """
+    Resources used while something ran: by the threads doing it and the
+    commands they ran, but not by whatever else ran at the same time.
+    """
+
+    wall_seconds: float = 0.0
+    # User and system CPU time of the commands run
+    child_cpu_seconds: float = 0.0
+    # Bytes passed to read- and write-like system calls, by the threads and
+    # the commands
+    bytes_read: int = 0
+    bytes_written: int = 0
+    subprocesses: int = 0
+    # Largest peak resident set size of the commands
+    max_rss_kib: int = 0
+
+
+class Meter:
+    """Sums up the Usage of what runs in the context of `measure()`."""
+
+    def __init__(self) -> None:
+        self.usage = Usage()
+        self._lock = threading.Lock()
+
+    def add(self, usage: Usage) -> None:
+        with self._lock:
+            total = self.usage
+            self.usage = Usage(
+                wall_seconds=total.wall_seconds + usage.wall_seconds,
+                child_cpu_seconds=total.child_cpu_seconds + usage.child_cpu_seconds,
+                bytes_read=total.bytes_read + usage.bytes_read,
+                bytes_written=total.bytes_written + usage.bytes_written,
+                subprocesses=total.subprocesses + usage.subprocesses,
+                max_rss_kib=max(total.max_rss_kib, usage.max_rss_kib),
+            )
+
+
+# The meters of all measure() calls the current code runs in
+_meters: "ContextVar[Tuple[Meter, ...]]" = ContextVar("meters", default=())
+
+
+def _io_counters(path: str) -> Dict[str, int]:
+    try:
+        with open(path) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        # No procfs, like on macOS
+        return {}
+    counters = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        counters[name] = int(value)
+    return counters
+
+
+def process_io(pid: int) -> Dict[str, int]:
+    """
+    The I/O counters of process `pid`, including those of the descendants it
+    waited for. For a child process, they can be read until it's reaped.
+    """
+    return _io_counters(f"/proc/{pid}/io")
+
+
+def _thread_io() -> Dict[str, int]:
+    return _io_counters("/proc/thread-self/io")
+
+
+def _io_usage(start: Dict[str, int], end: Dict[str, int]) -> Usage:
+    return Usage(
+        bytes_read=end.get("rchar", 0) - start.get("rchar", 0),
+        bytes_written=end.get("wchar", 0) - start.get("wchar", 0),
+    )
+
+
+def finished_command(cpu_seconds: float, max_rss_kib: int, io: Dict[str, int]) -> None:
+    """
+    Record what a command used, with `io` from process_io(); to be called by
+    everything waiting for one.
+    """
+    usage = _io_usage({}, io)._replace(
+        child_cpu_seconds=cpu_seconds, subprocesses=1, max_rss_kib=max_rss_kib
+    )
+    for meter in _meters.get():
+        meter.add(usage)
+
+
+def bind(fun: Callable[..., T]) -> Callable[..., T]:
+    """
+    `fun`, for another thread to run on behalf of this one: the commands it
+    runs and its own I/O count towards what's measured here.
+    """
+    meters = _meters.get()
+
+    def bound(*args: Any, **kwargs: Any) -> T:
+        token = _meters.set(meters)
+        start_io = _thread_io()
+        try:
+            return fun(*args, **kwargs)
+        finally:
+            usage = _io_usage(start_io, _thread_io())
+            for meter in meters:
+                meter.add(usage)
+            _meters.reset(token)
+
+    return bound
+
+
+@contextmanager
+def measure() -> Iterator[Meter]:
+    """
+    Measure the Usage of the code run in this context, up to leaving it. Work
+    done in other threads only counts if it's handed to them with bind().
+    """
+    meter = Meter()
+    token = _meters.set(_meters.get() + (meter,))
+    start_wall = time.monotonic()
+    start_io = _thread_io()
+    try:
+        yield meter
+    finally:
+        # This thread's own I/O, which enclosing measure() calls count anyway
+        meter.add(_io_usage(start_io, _thread_io()))
+        meter.add(Usage(wall_seconds=time.monotonic() - start_wall))
+        _meters.reset(token)
@@ -0,0 +1,111 @@
+import difflib
+from typing import IO, Dict, List, Optional
+
+# Directories listed per kind of mismatch, and example paths per directory
+MAX_DIRECTORIES = 20
+MAX_EXAMPLES = 5
+# Only text files up to this size are diffed at all
+DIFF_MAX_BYTES = 64 * 1024
+# Of those, the diffs of this many files are shown, this many lines each
+DIFF_MAX_FILES = 3
+DIFF_MAX_LINES = 40
+
+
+class _Kind:
+    """Mismatches of one kind, counted by directory."""
+
+    def __init__(self, title: str) -> None:
+        self.title = title
+        self.total = 0
+        self.counts: Dict[str, int] = {}
+        # The names of the first MAX_EXAMPLES of each directory
+        self.examples: Dict[str, List[str]] = {}
+
+    def add(self, path: str) -> None:
+        directory, _, name = path.rpartition("/")
+        self.total += 1
+        self.counts[directory] = self.counts.get(directory, 0) + 1
+        examples = self.examples.setdefault(directory, [])
+        if len(examples) < MAX_EXAMPLES:
+            examples.append(name)
+
+    def summary(self) -> List[str]:
+        lines = [
+            f"{self.title}: {self.total} in {len(self.counts)} "
+            f"{'directory' if len(self.counts) == 1 else 'directories'}"
+        ]
+        # Where most of them are first
+        directories = sorted(self.counts, key=lambda d: (-self.counts[d], d))
+        for directory in directories[:MAX_DIRECTORIES]:
+            count = self.counts[directory]
+            line = f"    {directory or '.'}/: " + ", ".join(self.examples[directory])
+            if count > MAX_EXAMPLES:
+                line += f" and {count - MAX_EXAMPLES} more"
+            lines.append(line)
+        if len(directories) > MAX_DIRECTORIES:
+            lines.append(
+                f"    ... and {len(directories) - MAX_DIRECTORIES} more directories"
+            )
+        return lines
+
+
+def _text(content: bytes) -> Optional[List[str]]:
+    if len(content) > DIFF_MAX_BYTES or b"\0" in content:
+        return None
+    return content.decode(errors="replace").splitlines(keepends=True)
+
+
+class MismatchReport:
+    """
+    Mismatches between two trees, summarized with a bounded size however many
+    there are: per kind, how many there are in each directory with the first
+    few as examples, and the start of the diffs of the first few small text
+    files. Every mismatch and the full diffs go to `detail` as they're added.
+    """
+
+    def __init__(self, detail: IO[str]) -> None:
+        self.detail = detail
+        self._kinds: Dict[str, _Kind] = {}
+        self._diffs: List[List[str]] = []
+
+    def add(self, title: str, path: str) -> None:
+        """Add a mismatch of the kind described by `title` at `path`."""
+        if title not in self._kinds:
+            self._kinds[title] = _Kind(title)
+        self._kinds[title].add(path)
+        self.detail.write(f"{title}: {path}\n")
+
+    def add_diff(
+        self, path: str, old: bytes, new: bytes, old_label: str, new_label: str
+    ) -> None:
+        """Diff the two versions of `path`, unless either is binary or large."""
+        old_lines, new_lines = _text(old), _text(new)
+        if old_lines is None or new_lines is None:
+            return
+        shown: Optional[List[str]] = None
+        if len(self._diffs) < DIFF_MAX_FILES:
+            shown = []
+            self._diffs.append(shown)
+        diff = difflib.unified_diff(
+            old_lines, new_lines, f"{path} ({old_label})", f"{path} ({new_label})"
+        )
+        for line in diff:
+            if not line.endswith("\n"):
+                line += "\n\\ No newline at end of file\n"
+            self.detail.write(line)
+            if shown is not None and len(shown) < DIFF_MAX_LINES:
+                shown.append(line)
+            elif shown is not None and len(shown) == DIFF_MAX_LINES:
+                shown.append("... (diff truncated)\n")
+
+    @property
+    def empty(self) -> bool:
+        return not self._kinds
+
+    def summary(self) -> List[str]:
+        lines = []
+        for kind in self._kinds.values():
+            lines += kind.summary()
+        for diff in self._diffs:
+            lines += [line.rstrip("\n") for line in diff]
+        return lines
@@ -0,0 +1,128 @@
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import gitignore
+
+# Paths that may be in git but not in the source archive, the other way
+# around, and paths that must not be in the source archive at all
+ONLY_IN_GIT = "only-in-git"
+ONLY_IN_ARCHIVE = "only-in-archive"
+FORBIDDEN_IN_ARCHIVE = "forbidden-in-archive"
+CATEGORIES = [ONLY_IN_GIT, ONLY_IN_ARCHIVE, FORBIDDEN_IN_ARCHIVE]
+
+# In gitignore syntax, so patterns without a slash match names at any depth
+DEFAULT_RULES: Dict[str, List[str]] = {
+    ONLY_IN_GIT: [
+        ".git",
+        ".gitignore",
+        ".github",
+        ".gitattributes",
+        ".travis.yml",
+        ".mvn",
+        "mvnw",
+        "mvnw.cmd",
+        "Jenkinsfile",
+        "CONTRIBUTING",
+        "CONTRIBUTING.md",
+    ],
+    ONLY_IN_ARCHIVE: ["DEPENDENCIES", "dependency-reduced-pom.xml"],
+    FORBIDDEN_IN_ARCHIVE: [
+        ".git",
+        ".gitignore",
+        ".mvn",
+        "mvnw",
+        "mvnw.cmd",
+        "Jenkinsfile",
+    ],
+}
+
+
+def _rule_regex(rule: gitignore.Rule) -> str:
+    # Directories are matched with a trailing slash, which only they have
+    return rule.regex.pattern + ("/" if rule.dir_only else "/?")
+
+
+class PathPolicy:
+    """
+    Glob rules putting paths in CATEGORIES, in gitignore syntax: within a
+    category, the last rule matching a path decides, so a "!" rule takes
+    paths a rule before it matched out again.
+
+    All rules are compiled into a single regex with a lookahead per rule, so
+    one match tells which of them apply to a path. How often each rule
+    decided is counted, to tell rules that never match.
+    """
+
+    def __init__(self, *rule_sets: Dict[str, List[str]]):
+        """Each of `rule_sets` maps categories to rules, applied in order."""
+        self.rules: List[Tuple[str, gitignore.Rule]] = []
+        for rules in rule_sets:
+            for category, patterns in rules.items():
+                if category not in CATEGORIES:
+                    raise ValueError(f"Unknown path policy category {category}")
+                for pattern in patterns:
+                    rule = gitignore.parse_rule(pattern)
+                    if rule is not None:
+                        self.rules.append((category, rule))
+        self._matcher = re.compile(
+            "".join(
+                f"(?=(?P<r{i}>{_rule_regex(rule)})\\Z)?"
+                for i, (_, rule) in enumerate(self.rules)
+            ),
+            re.DOTALL,
+        )
+        self._lock = threading.Lock()
+        self._counts = [0] * len(self.rules)
+        self._evaluated: Set[str] = set()
+
+    # States are sent to batch mode's worker processes, and locks can't be
+    # pickled
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _deciding_rule(self, category: str, path: str, is_dir: bool) -> Optional[int]:
+        match = self._matcher.match(path + "/" if is_dir else path)
+        assert match is not None
+        decided = None
+        # In rule order
+        for name, value in match.groupdict().items():
+            if value is not None and self.rules[int(name[1:])][0] == category:
+                decided = int(name[1:])
+        return decided
+
+    def select(self, category: str, paths: Iterable[Tuple[str, bool]]) -> List[str]:
+        """Those of `paths`, given as (path, is_dir), that are in `category`."""
+        selected = []
+        counts: Dict[int, int] = {}
+        for path, is_dir in paths:
+            i = self._deciding_rule(category, path, is_dir)
+            if i is None:
+                continue
+            counts[i] = counts.get(i, 0) + 1
+            if not self.rules[i][1].negated:
+                selected.append(path)
+        with self._lock:
+            self._evaluated.add(category)
+            for i, count in counts.items():
+                self._counts[i] += count
+        return selected
+
+    def match_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        How many paths each rule decided on, by category and rule, for the
+        categories that paths were selected from.
+        """
+        counts: Dict[str, Dict[str, int]] = {}
+        with self._lock:
+            for (category, rule), count in zip(self.rules, self._counts):
+                if category in self._evaluated:
+                    by_rule = counts.setdefault(category, {})
+                    by_rule[rule.pattern] = by_rule.get(rule.pattern, 0) + count
+        return counts
@@ -0,0 +1,266 @@
+import base64
+import binascii
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import metrics
+import trace_profile
+from helpers import run
+
+_ARMORED_KEY = re.compile(
+    r"-----BEGIN PGP PUBLIC KEY BLOCK-----(?P<body>.*?)"
+    r"-----END PGP PUBLIC KEY BLOCK-----",
+    re.DOTALL,
+)
+
+# Packet tags of primary keys and subkeys
+_PUBLIC_KEY = 6
+_PUBLIC_SUBKEY = 14
+
+
+class KeysError(Exception):
+    pass
+
+
+class Key(NamedTuple):
+    # Upper case hex, like gpg shows them
+    fingerprint: str
+    subkey_fingerprints: List[str]
+    # The armored block the key was found in in KEYS
+    armored: str
+    # The key's own packets, which is all a keyring file for gpgv has to contain
+    packets: bytes
+
+
+class SignatureResult(NamedTuple):
+    signature_path: str
+    # None if the signature is good
+    error: Optional[str]
+
+
+def _dearmor(body: str) -> bytes:
+    lines = [line.strip() for line in body.strip().splitlines()]
+    # Armor headers are separated from the data by an empty line
+    if "" in lines:
+        data_start = lines.index("") + 1
+        lines = lines[data_start:]
+    # The last line may be a checksum, starting with "="
+    data = "".join(line for line in lines if not line.startswith("="))
+    try:
+        return base64.b64decode(data, validate=True)
+    except binascii.Error as ex:
+        raise KeysError(f"Invalid armored key block: {ex}")
+
+
+def _packet_header(data: bytes, offset: int) -> Tuple[int, int, int]:
+    """The tag, body length and body start of the packet at `offset`."""
+    header = data[offset]
+    offset += 1
+    if not header & 0x80:
+        raise KeysError(f"Invalid OpenPGP packet header at byte {offset - 1}")
+    if header & 0x40:
+        # New format
+        tag = header & 0x3F
+        first = data[offset]
+        if first < 192:
+            return tag, first, offset + 1
+        if first < 224:
+            return tag, ((first - 192) << 8) + data[offset + 1] + 192, offset + 2
+        if first == 255:
+            length_start, end = offset + 1, offset + 5
+            return tag, int.from_bytes(data[length_start:end], "big"), end
+        raise KeysError("Partial body lengths are not valid in keys")
+    # Old format
+    tag = (header >> 2) & 0x0F
+    length_size = {0: 1, 1: 2, 2: 4}.get(header & 0x03)
+    if length_size is None:
+        return tag, len(data) - offset, offset
+    end = offset + length_size
+    # A cut off length is caught by the caller, as the body then can't fit
+    return tag, int.from_bytes(data[offset:end], "big"), end
+
+
+def _packets(data: bytes) -> Iterator[Tuple[int, int, int, int]]:
+    """Yield (tag, packet start, body start, end) for each OpenPGP packet."""
+    offset = 0
+    while offset < len(data):
+        start = offset
+        try:
+            tag, length, offset = _packet_header(data, offset)
+        except IndexError:
+            raise KeysError(f"Truncated OpenPGP packet at byte {start}")
+        if offset + length > len(data):
+            raise KeysError(f"Truncated OpenPGP packet at byte {start}")
+        yield tag, start, offset, offset + length
+        offset += length
+
+
+def _fingerprint(body: bytes) -> Optional[str]:
+    """The fingerprint of a public (sub)key packet, if it's a v4 or v5 key."""
+    version = body[0] if body else None
+    if version == 4:
+        return (
+            hashlib.sha1(b"\x99" + len(body).to_bytes(2, "big") + body)
+            .hexdigest()
+            .upper()
+        )
+    if version == 5:
+        return (
+            hashlib.sha256(b"\x9a" + len(body).to_bytes(4, "big") + body)
+            .hexdigest()
+            .upper()
+        )
+    # Version 3 keys have been deprecated for decades
+    return None
+
+
+def _parse_block(armored: str, body: str) -> List[Key]:
+    data = _dearmor(body)
+    # Each primary key packet starts a new key; the user ids, signatures and
+    # subkeys following it belong to it
+    starts: List[int] = []
+    fingerprints: List[Optional[str]] = []
+    subkeys: List[List[str]] = []
+    for tag, start, body_start, end in _packets(data):
+        if tag == _PUBLIC_KEY:
+            starts.append(start)
+            fingerprints.append(_fingerprint(data[body_start:end]))
+            subkeys.append([])
+        elif tag == _PUBLIC_SUBKEY and subkeys:
+            fingerprint = _fingerprint(data[body_start:end])
+            if fingerprint is not None:
+                subkeys[-1].append(fingerprint)
+    ends = starts[1:] + [len(data)]
+    return [
+        Key(fingerprint, subkey_fingerprints, armored, data[start:end])
+        for start, end, fingerprint, subkey_fingerprints in zip(
+            starts, ends, fingerprints, subkeys
+        )
+        if fingerprint is not None
+    ]
+
+
+def parse_keys(text: str) -> List[Key]:
+    """
+    Parse all public keys from the armored blocks in a KEYS file. Blocks that
+    can't be parsed are skipped with a warning, so one broken key doesn't
+    hide everyone else's.
+    """
+    keys = []
+    for match in _ARMORED_KEY.finditer(text):
+        try:
+            keys += _parse_block(match.group(), match.group("body"))
+        except KeysError as ex:
+            line = text.count("\n", 0, match.start()) + 1
+            logging.warning(f"Skipping the key block at line {line} of KEYS: {ex}")
+    return keys
+
+
+def _key_ids(fingerprint: str) -> Set[str]:
+    """A fingerprint and the long and short key ids derived from it."""
+    # The key id of a v4 key is the rightmost 64 bits of its fingerprint, that
+    # of a v5 key the leftmost
+    long_id = fingerprint[:16] if len(fingerprint) == 64 else fingerprint[-16:]
+    return {fingerprint, long_id, long_id[-8:]}
+
+
+def normalize_key_id(key_id: str) -> str:
+    key_id = key_id.replace(" ", "").upper()
+    if key_id.startswith("0X"):
+        key_id = key_id.replace("0X", "", 1)
+    return key_id
+
+
+class KeyIndex:
+    """
+    The keys of a KEYS file, by fingerprint, long (16 hex digits) and short
+    (8 hex digits) key id of the primary key and all subkeys.
+    """
+
+    def __init__(self, keys: List[Key]):
+        self.keys = keys
+        self._by_id: Dict[str, List[Key]] = {}
+        for key in keys:
+            for fingerprint in [key.fingerprint] + key.subkey_fingerprints:
+                for key_id in _key_ids(fingerprint):
+                    matches = self._by_id.setdefault(key_id, [])
+                    if key not in matches:
+                        matches.append(key)
+
+    @classmethod
+    def from_file(cls, path: str) -> "KeyIndex":
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return cls(parse_keys(f.read()))
+
+    def find(self, key_id: str) -> Key:
+        """The key with fingerprint or key id `key_id`; raises KeysError."""
+        matches = self._by_id.get(normalize_key_id(key_id), [])
+        if not matches:
+            raise KeysError(f"Key {key_id} not found in KEYS")
+        if len(matches) > 1:
+            raise KeysError(
+                f"Key id {key_id} is ambiguous, it matches "
+                + ", ".join(key.fingerprint for key in matches)
+            )
+        return matches[0]
+
+
+def _verify_one(
+    gnupg_home: str, keyring: str, key: Key, signature_path: str, signed_path: str
+) -> SignatureResult:
+    with trace_profile.span("gpgv", "command", signature=signature_path) as span_args:
+        process = run(
+            [
+                "gpgv",
+                "--homedir",
+                gnupg_home,
+                "--keyring",
+                keyring,
+                "--status-fd",
+                "1",
+                signature_path,
+                signed_path,
+            ]
+        )
+        span_args["exit_status"] = process.returncode
+    if process.returncode != 0:
+        return SignatureResult(
+            signature_path, process.stderr.decode(errors="replace").strip()
+        )
+    for line in process.stdout.decode(errors="replace").splitlines():
+        fields = line.split()
+        # The last field of VALIDSIG is the fingerprint of the primary key
+        if fields[:2] == ["[GNUPG:]", "VALIDSIG"] and fields[-1] == key.fingerprint:
+            return SignatureResult(signature_path, None)
+    return SignatureResult(
+        signature_path, f"Signature is not made with key {key.fingerprint}"
+    )
+
+
+def verify_signatures(
+    key: Key, signatures: Dict[str, str], jobs: Optional[int] = None
+) -> List[SignatureResult]:
+    """
+    Verify detached signatures, given as signature path -> signed file path,
+    against `key` and nothing else. gpgv gets a keyring containing just that
+    key, in a throwaway GNUPGHOME, so neither the user's keys nor other keys
+    from KEYS can make a signature pass.
+    """
+    with tempfile.TemporaryDirectory(prefix="gnupg-") as gnupg_home:
+        keyring = os.path.join(gnupg_home, "key.gpg")
+        with open(keyring, "wb") as f:
+            f.write(key.packets)
+        with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+            return list(
+                executor.map(
+                    metrics.bind(
+                        lambda pair: _verify_one(gnupg_home, keyring, key, *pair)
+                    ),
+                    sorted(signatures.items()),
+                )
+            )
@@ -0,0 +1,66 @@
+import configparser
+from typing import Dict, List, NamedTuple
+
+import path_policy
+
+_PATH_POLICY_SECTION = "path-policy"
+
+
+class ProjectConfigError(Exception):
+    pass
+
+
+class ProjectConfig(NamedTuple):
+    """
+    Settings that differ between projects, read from an INI file like:
+
+        [license-headers]
+        # gitignore syntax, relative to the source directory
+        exclude =
+            docs/
+            *.snap
+
+        # Added to the defaults in path_policy, in gitignore syntax; "!" rules
+        # drop paths the defaults match
+        [path-policy]
+        only-in-git = .asf.yaml
+        only-in-archive = LICENSE-binary
+        forbidden-in-archive = /lib/*.jar
+
+        # Only for releases of this module, on top of the above
+        [path-policy:zipkin-lens]
+        only-in-git = !CONTRIBUTING.md
+    """
+
+    header_exclusions: List[str] = []
+    # By module ("" for all of them), then by path policy category
+    path_rules: Dict[str, Dict[str, List[str]]] = {}
+
+
+def _lines(value: str) -> List[str]:
+    return [line.strip() for line in value.splitlines() if line.strip()]
+
+
+def load(path: str) -> ProjectConfig:
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        with open(path) as f:
+            parser.read_file(f)
+    except (OSError, configparser.Error) as ex:
+        raise ProjectConfigError(f"Can't read project config {path}: {ex}")
+    path_rules: Dict[str, Dict[str, List[str]]] = {}
+    for section in parser.sections():
+        name, _, module = section.partition(":")
+        if name != _PATH_POLICY_SECTION:
+            continue
+        for category, value in parser.items(section):
+            if category not in path_policy.CATEGORIES:
+                raise ProjectConfigError(
+                    f"Unknown path policy category {category} in {path}, "
+                    f"expected one of {', '.join(path_policy.CATEGORIES)}"
+                )
+            path_rules.setdefault(module, {})[category] = _lines(value)
+    return ProjectConfig(
+        header_exclusions=_lines(parser.get("license-headers", "exclude", fallback="")),
+        path_rules=path_rules,
+    )
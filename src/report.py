@@ -1,11 +1,14 @@
+import json
 import logging
+import xml.etree.ElementTree as ET
 from enum import Enum, auto
 from math import ceil, floor
-from typing import List, NamedTuple, Optional
+from typing import IO, Dict, List, NamedTuple, Optional
 
 from colorama import Fore, Style
 
 from helpers import header
+from metrics import Usage
 
 
 class ResultKind(Enum):
@@ -16,6 +19,24 @@ class ResultKind(Enum):
     ERROR = auto()
 
 
+# From least to most severe
+SEVERITY = [
+    ResultKind.PASS,
+    ResultKind.NOTE,
+    ResultKind.WARN,
+    ResultKind.FAIL,
+    ResultKind.ERROR,
+]
+
+# The exit status for the worst result of a run; notes alone don't fail it
+EXIT_CODES = {
+    ResultKind.PASS: 0,
+    ResultKind.NOTE: 0,
+    ResultKind.WARN: 1,
+    ResultKind.FAIL: 2,
+    ResultKind.ERROR: 3,
+}
+
 RESULT_STYLES = {
     ResultKind.PASS: Fore.GREEN,
     ResultKind.FAIL: Fore.RED,
@@ -30,6 +51,9 @@ class Result(NamedTuple):
     hide_if_passing: bool
     message: Optional[str]
     kind: ResultKind
+    usage: Usage = Usage()
+    # Taken from the result cache instead of running the check
+    cached: bool = False
 
     @staticmethod
     def passed(name: str, hide_if_passing: bool) -> "Result":
@@ -48,6 +72,10 @@ class Result(NamedTuple):
 
 class Report(NamedTuple):
     results: List[Result]
+    # How many paths each path policy rule decided on, by category and rule;
+    # rules that never match are likely dead. Only categories used by checks
+    # that ran (rather than being cached) are included.
+    rule_matches: Dict[str, Dict[str, int]] = {}
 
     @property
     def problem_count(self) -> int:
@@ -57,21 +85,160 @@ class Report(NamedTuple):
                 problems += 1
         return problems
 
+    @property
+    def worst_kind(self) -> ResultKind:
+        return max(
+            (result.kind for result in self.results),
+            key=SEVERITY.index,
+            default=ResultKind.PASS,
+        )
+
+
+def exit_code(reports: List[Report]) -> int:
+    """The exit status for the worst result in any of `reports`."""
+    worst = max(
+        (report.worst_kind for report in reports),
+        key=SEVERITY.index,
+        default=ResultKind.PASS,
+    )
+    return EXIT_CODES[worst]
+
 
 def color_result(msg: str, kind: ResultKind) -> str:
     prefix = RESULT_STYLES.get(kind, "")
     return f"{prefix}{msg}{Style.RESET_ALL}"
 
 
-def print_report(report: Report) -> None:
-    header("Summary follows")
+def _padded_kind(kind: ResultKind, max_len: int) -> str:
+    padding_left = " " * ceil((max_len - len(kind.name)) / 2.0)
+    padding_right = " " * floor((max_len - len(kind.name)) / 2.0)
+    return f"[{padding_left}{color_result(kind.name, kind)}{padding_right}]"
+
+
+def print_report(report: Report, title: str = "Summary follows") -> None:
+    header(title)
     max_len = max(len(result.kind.name) for result in report.results)
     for result in report.results:
         if result.is_passed and result.hide_if_passing:
             continue
-        padding_left = " " * ceil((max_len - len(result.kind.name)) / 2.0)
-        padding_right = " " * floor((max_len - len(result.kind.name)) / 2.0)
-        prefix = color_result(result.kind.name, result.kind)
-        logging.info(f"[{padding_left}{prefix}{padding_right}] {result.name}")
+        cached = " (cached)" if result.cached else ""
+        logging.info(f"{_padded_kind(result.kind, max_len)} {result.name}{cached}")
         if not result.is_passed:
             logging.info(result.message)
+    for category, counts in report.rule_matches.items():
+        logging.debug(
+            f"Path policy rule matches ({category}): "
+            + ", ".join(f"{rule}: {count}" for rule, count in counts.items())
+        )
+
+
+def print_batch_summary(labels: List[str], reports: List[Report]) -> None:
+    header("Batch summary")
+    max_len = max(len(kind.name) for kind in SEVERITY)
+    for label, report in zip(labels, reports):
+        line = f"{_padded_kind(report.worst_kind, max_len)} {label}"
+        if report.problem_count:
+            line += f": {report.problem_count} potential problems"
+        logging.info(line)
+
+
+def usage_dict(usage: Usage) -> Dict:
+    return {
+        key: round(value, 6) if isinstance(value, float) else value
+        for key, value in usage._asdict().items()
+    }
+
+
+def _result_dict(result: Result) -> Dict:
+    return {
+        "name": result.name,
+        "kind": result.kind.name,
+        "message": result.message,
+        "cached": result.cached,
+        **usage_dict(result.usage),
+    }
+
+
+def write_json(reports: Dict[str, Report], f: IO[str]) -> None:
+    """Write the reports of all releases, by release name, as JSON."""
+    json.dump(
+        {
+            "releases": [
+                {
+                    "name": name,
+                    "worst_kind": report.worst_kind.name,
+                    "problem_count": report.problem_count,
+                    "results": [_result_dict(result) for result in report.results],
+                    "rule_matches": report.rule_matches,
+                }
+                for name, report in reports.items()
+            ]
+        },
+        f,
+        indent=2,
+    )
+    f.write("\n")
+
+
+def write_junit(reports: Dict[str, Report], f: IO[str]) -> None:
+    """
+    Write the reports of all releases, by release name, as JUnit XML: a test
+    suite per release, and a test case per check. FAIL and WARN results are
+    failures, ERROR results are errors, and NOTE results just carry their
+    message as output. Resource usage is recorded in test case properties,
+    path policy rule matches in test suite properties.
+    """
+    suites = ET.Element("testsuites")
+    for name, report in reports.items():
+        suite = ET.SubElement(
+            suites,
+            "testsuite",
+            name=name,
+            tests=str(len(report.results)),
+            failures=str(
+                sum(
+                    r.kind in (ResultKind.FAIL, ResultKind.WARN) for r in report.results
+                )
+            ),
+            errors=str(sum(r.kind is ResultKind.ERROR for r in report.results)),
+            time=f"{sum(r.usage.wall_seconds for r in report.results):.3f}",
+        )
+        properties = ET.SubElement(suite, "properties")
+        for category, counts in report.rule_matches.items():
+            for rule, count in counts.items():
+                ET.SubElement(
+                    properties,
+                    "property",
+                    name=f"rule_matches.{category}.{rule}",
+                    value=str(count),
+                )
+        for result in report.results:
+            case = ET.SubElement(
+                suite,
+                "testcase",
+                classname=name,
+                name=result.name,
+                time=f"{result.usage.wall_seconds:.3f}",
+            )
+            properties = ET.SubElement(case, "properties")
+            for key, value in usage_dict(result.usage).items():
+                ET.SubElement(properties, "property", name=key, value=str(value))
+            ET.SubElement(
+                properties, "property", name="cached", value=str(result.cached)
+            )
+            message = result.message or ""
+            if result.kind in (ResultKind.FAIL, ResultKind.WARN):
+                failure = ET.SubElement(
+                    case, "failure", type=result.kind.name, message=result.kind.name
+                )
+                failure.text = message
+            elif result.kind is ResultKind.ERROR:
+                error = ET.SubElement(case, "error", type="ERROR", message=message)
+                error.text = message
+            elif result.kind is ResultKind.NOTE:
+                ET.SubElement(case, "system-out").text = message
+    f.write(ET.tostring(suites, encoding="unicode"))
+    f.write("\n")
+
+
+REPORT_WRITERS = {"json": write_json, "junit": write_junit}
@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Dict, Optional
+
+from report import Result, ResultKind
+
+# Failures may well be caused by the environment (a flaky build, the network),
+# so they're always checked again
+CACHEABLE_KINDS = {ResultKind.PASS, ResultKind.NOTE, ResultKind.WARN}
+
+# Stands in for the working directory in stored messages, as every run has
+# a different one
+_WORK_DIR = "$WORK_DIR"
+
+
+def cache_key(check_name: str, inputs: Dict[str, str]) -> str:
+    """A key identifying the result of check `check_name` given `inputs`."""
+    payload = json.dumps([check_name, sorted(inputs.items())])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Results of checks from earlier runs, by a key derived from everything
+    the result depends on, persisted in an SQLite database.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, name TEXT NOT NULL, kind TEXT NOT NULL, "
+                "message TEXT, hide_if_passing INTEGER NOT NULL, "
+                "created REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=60)
+
+    def lookup(self, key: str, work_dir: str) -> Optional[Result]:
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT name, kind, message, hide_if_passing FROM results "
+                "WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        name, kind, message, hide_if_passing = row
+        if message is not None:
+            message = message.replace(_WORK_DIR, work_dir)
+        return Result(
+            name, bool(hide_if_passing), message, ResultKind[kind], cached=True
+        )
+
+    def store(self, key: str, result: Result, work_dir: str) -> None:
+        """Remember `result`, unless it's of a kind that isn't cached."""
+        if result.kind not in CACHEABLE_KINDS:
+            return
+        message = result.message
+        if message is not None:
+            message = message.replace(work_dir, _WORK_DIR)
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO results "
+                "(key, name, kind, message, hide_if_passing, created) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    result.name,
+                    result.kind.name,
+                    message,
+                    int(result.hide_if_passing),
+                    time.time(),
+                ),
+            )
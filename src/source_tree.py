@@ -0,0 +1,306 @@
+import os
+import stat
+import tarfile
+import zipfile
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+import archive
+
+# How much of each file content sniffing needs
+PREFIX_SIZE = 8192
+# How much of each file TarTree keeps from its one pass over the archive;
+# enough to compare the start of LICENSE with the Apache License
+TAR_PREFIX_SIZE = 16 * 1024
+
+
+class Entry(NamedTuple):
+    # Relative to the root of the tree, "/"-separated
+    path: str
+    size: int
+    mode: int
+    link_target: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+    @property
+    def is_dir(self) -> bool:
+        return stat.S_ISDIR(self.mode)
+
+    @property
+    def is_file(self) -> bool:
+        return stat.S_ISREG(self.mode)
+
+
+class SourceTree(ABC):
+    """
+    Read-only view of the source release, either as extracted on disk or
+    straight from the archive. Paths are relative to the source directory.
+    """
+
+    @abstractmethod
+    def entries(self) -> Iterator[Entry]:
+        """All files and directories in the tree, excluding the root."""
+        pass
+
+    @abstractmethod
+    def exists(self, path: str) -> bool:
+        """Whether `path` exists in the tree; "" refers to the root."""
+        pass
+
+    @abstractmethod
+    def read_prefix(self, path: str, size: int = PREFIX_SIZE) -> bytes:
+        """Read (at most) the first `size` bytes of the file at `path`."""
+        pass
+
+    @abstractmethod
+    def read(self, path: str) -> bytes:
+        pass
+
+    def content_hash(self, path: str) -> Optional[str]:
+        """Some hash of the content of `path`, if known without reading it."""
+        return None
+
+    # Whether read_prefix works in (and is cheap to copy to) worker processes
+    supports_worker_reads = False
+
+
+class DirectoryTree(SourceTree):
+    supports_worker_reads = True
+
+    def __init__(self, root: str, content_hashes: Optional[Dict[str, str]] = None):
+        self.root = root
+        self._content_hashes = content_hashes or {}
+
+    def _walk(self, relpath: str) -> Iterator[Entry]:
+        with os.scandir(os.path.join(self.root, relpath)) as it:
+            children = list(it)
+        for child in children:
+            child_path = f"{relpath}/{child.name}" if relpath else child.name
+            st = child.stat(follow_symlinks=False)
+            target = os.readlink(child.path) if stat.S_ISLNK(st.st_mode) else None
+            yield Entry(child_path, st.st_size, st.st_mode, target)
+            if child.is_dir(follow_symlinks=False):
+                yield from self._walk(child_path)
+
+    def entries(self) -> Iterator[Entry]:
+        return self._walk("")
+
+    def exists(self, path: str) -> bool:
+        return os.path.lexists(os.path.join(self.root, path))
+
+    def read_prefix(self, path: str, size: int = PREFIX_SIZE) -> bytes:
+        with open(os.path.join(self.root, path), "rb") as f:
+            return f.read(size)
+
+    def read(self, path: str) -> bytes:
+        with open(os.path.join(self.root, path), "rb") as f:
+            return f.read()
+
+    def content_hash(self, path: str) -> Optional[str]:
+        return self._content_hashes.get(path)
+
+
+def _strip_root(name: str, root: str) -> Optional[str]:
+    """Path of archive member `name` relative to `root`, or None if outside."""
+    relpath = archive.safe_relpath(name)
+    if relpath == root:
+        return ""
+    prefix = root + "/"
+    if relpath.startswith(prefix):
+        return relpath.replace(prefix, "", 1)
+    return None
+
+
+def _add_parents(entries: Dict[str, Entry], path: str) -> None:
+    # Archives don't necessarily list directories explicitly
+    parent = path.rpartition("/")[0]
+    while parent and parent not in entries:
+        entries[parent] = Entry(parent, 0, stat.S_IFDIR | 0o755)
+        parent = parent.rpartition("/")[0]
+
+
+class ZipTree(SourceTree):
+    """
+    Serves everything from the zip's central directory; only reading file
+    contents decompresses anything, and only as much as is read.
+    """
+
+    supports_worker_reads = True
+
+    def __init__(self, archive_path: str, root: str, limits: archive.Limits):
+        self._archive_path = archive_path
+        self._zf: Optional[zipfile.ZipFile] = zipfile.ZipFile(archive_path)
+        self._infos: Dict[str, zipfile.ZipInfo] = {}
+        self._entries: Dict[str, Entry] = {}
+        self._root_exists = False
+        infos = self._zf.infolist()
+        archive.check_totals(len(infos), sum(i.file_size for i in infos), limits)
+        for info in infos:
+            archive.check_ratio(
+                info.filename, info.file_size, info.compress_size, limits
+            )
+            relpath = _strip_root(info.filename, root)
+            if relpath is None:
+                continue
+            self._root_exists = True
+            if relpath == "":
+                continue
+            mode = archive.zip_mode(info)
+            if info.is_dir():
+                mode = stat.S_IFDIR | (stat.S_IMODE(mode) or 0o755)
+            elif stat.S_IFMT(mode) == 0:
+                mode = stat.S_IFREG | (stat.S_IMODE(mode) or 0o644)
+            target = None
+            if stat.S_ISLNK(mode):
+                # The same bounds as when extracting, whatever the header claims
+                archive.check_link_target(info.filename, info.file_size)
+                with self._zf.open(info) as f:
+                    link = f.read(archive.MAX_LINK_TARGET)
+                target = link.decode("utf-8", errors="surrogateescape")
+            self._infos[relpath] = info
+            _add_parents(self._entries, relpath)
+            self._entries[relpath] = Entry(relpath, info.file_size, mode, target)
+
+    def entries(self) -> Iterator[Entry]:
+        return iter(list(self._entries.values()))
+
+    def exists(self, path: str) -> bool:
+        return self._root_exists if path == "" else path in self._entries
+
+    def _info(self, path: str) -> zipfile.ZipInfo:
+        if path not in self._infos:
+            raise FileNotFoundError(f"{path} is not in the archive")
+        return self._infos[path]
+
+    def _zipfile(self) -> zipfile.ZipFile:
+        if self._zf is None:
+            self._zf = zipfile.ZipFile(self._archive_path)
+        return self._zf
+
+    def __getstate__(self) -> Dict:
+        # Worker processes open the archive for themselves
+        state = self.__dict__.copy()
+        state["_zf"] = None
+        return state
+
+    def read_prefix(self, path: str, size: int = PREFIX_SIZE) -> bytes:
+        with self._zipfile().open(self._info(path)) as f:
+            return f.read(size)
+
+    def read(self, path: str) -> bytes:
+        return self._zipfile().read(self._info(path))
+
+    def content_hash(self, path: str) -> Optional[str]:
+        info = self._info(path)
+        return f"crc32:{info.CRC:08x}:{info.file_size}"
+
+
+class TarTree(SourceTree):
+    """
+    Tarballs have no central directory, so listing one means reading it once
+    completely. The first few KB of all files are kept from that pass, so
+    content sniffing needs no further reads. Hard links are files with the
+    content of the member they link to.
+    """
+
+    def __init__(self, archive_path: str, root: str, limits: archive.Limits):
+        self._archive_path = archive_path
+        self._entries: Dict[str, Entry] = {}
+        # The archive member holding the content of each file in the tree,
+        # and the first bytes of every member holding content
+        self._members: Dict[str, str] = {}
+        self._prefixes: Dict[str, bytes] = {}
+        self._root_exists = False
+        compressed_size = os.path.getsize(archive_path)
+        total_size = 0
+        # Size and content holding member of every file in the archive,
+        # for hard links to resolve to
+        files: Dict[str, Tuple[int, str]] = {}
+        with tarfile.open(archive_path, mode="r|*") as tf:
+            for info in tf:
+                total_size += info.size
+                archive.check_totals(len(self._entries) + 1, total_size, limits)
+                archive.check_ratio(archive_path, total_size, compressed_size, limits)
+                name = archive.safe_relpath(info.name)
+                size, target = info.size, None
+                if info.isdir():
+                    mode = stat.S_IFDIR | info.mode
+                elif info.issym():
+                    archive.check_link_target(info.name, len(info.linkname))
+                    mode, target = stat.S_IFLNK | info.mode, info.linkname
+                elif info.islnk():
+                    original = archive.safe_relpath(info.linkname)
+                    if original not in files:
+                        raise archive.ArchiveError(
+                            f"{info.name}: hard link to unknown file"
+                        )
+                    mode = stat.S_IFREG | info.mode
+                    size, member = files[original]
+                    files[name] = (size, member)
+                elif info.isfile():
+                    mode = stat.S_IFREG | info.mode
+                    f = tf.extractfile(info)
+                    self._prefixes[name] = f.read(TAR_PREFIX_SIZE) if f else b""
+                    files[name] = (size, name)
+                else:
+                    raise archive.ArchiveError(f"{info.name}: unsupported member type")
+                relpath = _strip_root(info.name, root)
+                if relpath is None:
+                    continue
+                self._root_exists = True
+                if relpath == "":
+                    continue
+                if name in files:
+                    self._members[relpath] = files[name][1]
+                _add_parents(self._entries, relpath)
+                self._entries[relpath] = Entry(relpath, size, mode, target)
+        # Only what the tree's files need
+        needed = set(self._members.values())
+        self._prefixes = {
+            name: prefix for name, prefix in self._prefixes.items() if name in needed
+        }
+
+    def _member(self, path: str) -> str:
+        if path not in self._members:
+            raise FileNotFoundError(f"{path} is not in the archive")
+        return self._members[path]
+
+    def entries(self) -> Iterator[Entry]:
+        return iter(list(self._entries.values()))
+
+    def exists(self, path: str) -> bool:
+        return self._root_exists if path == "" else path in self._entries
+
+    def read_prefix(self, path: str, size: int = PREFIX_SIZE) -> bytes:
+        member = self._member(path)
+        if size <= TAR_PREFIX_SIZE:
+            return self._prefixes[member][:size]
+        return self.read(path)[:size]
+
+    def read(self, path: str) -> bytes:
+        member = self._member(path)
+        with tarfile.open(self._archive_path, mode="r|*") as tf:
+            for info in tf:
+                if info.isfile() and archive.safe_relpath(info.name) == member:
+                    f = tf.extractfile(info)
+                    if f is not None:
+                        return f.read()
+        raise FileNotFoundError(f"{path} is not in the archive")
+
+
+def open_archive(archive_path: str, root: str, limits: archive.Limits) -> SourceTree:
+    """
+    View the contents of directory `root` in the archive without extracting
+    it. Raises archive.ArchiveError if the archive is broken or exceeds `limits`.
+    """
+    try:
+        if zipfile.is_zipfile(archive_path):
+            return ZipTree(archive_path, root, limits)
+        if tarfile.is_tarfile(archive_path):
+            return TarTree(archive_path, root, limits)
+    except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError) as ex:
+        raise archive.ArchiveError(f"Failed to read {archive_path}: {ex}")
+    raise archive.ArchiveError(f"{archive_path} is neither a zip nor a tar archive")
@@ -0,0 +1,150 @@
+import cProfile
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+# Set by enable(); while None, tracing and profiling cost next to nothing
+_events: Optional[List[Dict[str, Any]]] = None
+_profiles: Optional[List["_ProfileData"]] = None
+_named_threads: Set[Tuple[int, int]] = set()
+_lock = threading.Lock()
+
+
+class _ProfileData:
+    """What pstats.Stats needs of a profile, in a form that can be pickled."""
+
+    def __init__(self, profile: cProfile.Profile):
+        profile.create_stats()
+        self.stats = profile.stats  # type: ignore
+
+    def create_stats(self) -> None:
+        pass
+
+
+class Collected(NamedTuple):
+    """Trace events and profiles, as handed from batch workers to the main process."""
+
+    events: List[Dict[str, Any]]
+    profiles: List[_ProfileData]
+
+
+def enable(trace: bool = True, python_profile: bool = False) -> None:
+    """Start collecting trace events, and cProfile data if `python_profile`."""
+    global _events, _profiles
+    if trace:
+        _events = []
+    if python_profile:
+        _profiles = []
+
+
+def enabled() -> Tuple[bool, bool]:
+    """What enable() was asked to collect, for worker processes to do the same."""
+    return _events is not None, _profiles is not None
+
+
+def _now_us() -> float:
+    # Monotonic time is comparable across processes, so the traces of batch
+    # workers line up with that of the main process
+    return time.monotonic() * 1e6
+
+
+@contextmanager
+def span(name: str, category: str, **args: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Record the duration of the block as a trace event. The yielded dict is
+    the event's arguments, so the block can add what it learned, like an exit
+    status.
+    """
+    if _events is None:
+        yield args
+        return
+    start = _now_us()
+    try:
+        yield args
+    finally:
+        end = _now_us()
+        pid, tid = os.getpid(), threading.get_ident()
+        with _lock:
+            if (pid, tid) not in _named_threads:
+                _named_threads.add((pid, tid))
+                _events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": pid,
+                        "tid": tid,
+                        "args": {"name": threading.current_thread().name},
+                    }
+                )
+            _events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": start,
+                    "dur": end - start,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": args,
+                }
+            )
+
+
+@contextmanager
+def python_profile() -> Iterator[None]:
+    """
+    Profile the block with cProfile, if enabled. cProfile only sees the thread
+    it's enabled in, so every thread worth profiling uses this on its own.
+    """
+    if _profiles is None:
+        yield
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        data = _ProfileData(profile)
+        with _lock:
+            _profiles.append(data)
+
+
+def take() -> Collected:
+    """Remove and return everything collected so far."""
+    global _events, _profiles
+    with _lock:
+        collected = Collected(_events or [], _profiles or [])
+        if _events is not None:
+            _events = []
+        if _profiles is not None:
+            _profiles = []
+    return collected
+
+
+def add(collected: Collected) -> None:
+    """Add what another process collected."""
+    with _lock:
+        if _events is not None:
+            _events.extend(collected.events)
+        if _profiles is not None:
+            _profiles.extend(collected.profiles)
+
+
+def write(trace_path: Optional[str], python_profile_path: Optional[str]) -> None:
+    """
+    Write the trace in the Chrome trace event format, which Perfetto and
+    chrome://tracing open, and the merged cProfile data in pstats format.
+    """
+    collected = take()
+    if trace_path is not None:
+        with open(trace_path, "w") as f:
+            json.dump({"traceEvents": collected.events, "displayTimeUnit": "ms"}, f)
+    if python_profile_path is not None and collected.profiles:
+        pstats.Stats(*collected.profiles).dump_stats(  # type: ignore
+            python_profile_path
+        )
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+# The modules in src/ are run as scripts rather than installed as a package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+from checks import State  # noqa: E402
+
+
+@pytest.fixture
+def make_state(tmp_path):
+    """Builds States for a release of zipkin-lens, working in tmp_path."""
+
+    def make(**kwargs) -> State:
+        return State(
+            "zipkin",
+            "zipkin-lens",
+            "1.0",
+            str(tmp_path),
+            True,
+            "apache-{project}{dash_module}{dash_incubating}-{version}-source-release",
+            "{module_or_project}-{version}",
+            "{incubator_dash}{project}{dash_module}.git",
+            "BB67A050",
+            "3cf4ac6577eb0d4775d20f24814e7a0852fa1635",
+            None,
+            **kwargs,
+        )
+
+    return make
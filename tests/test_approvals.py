@@ -0,0 +1,55 @@
+import itertools
+import time
+
+import pytest
+
+from approvals import ApprovalStore, diff, normalize
+
+NOTICE = "Apache Zipkin\nCopyright 2018 The Apache Software Foundation\n"
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # Every approval strictly after the one before it
+    ticks = itertools.count()
+    monkeypatch.setattr(time, "time", lambda: float(next(ticks)))
+    return ApprovalStore(str(tmp_path / "approvals" / "approvals.sqlite"))
+
+
+def test_formatting_doesnt_need_another_review():
+    assert normalize(NOTICE.replace("\n", "  \r\n") + "\n\n") == NOTICE
+    assert normalize("") == "\n"
+    assert normalize(NOTICE) != normalize(NOTICE.replace("2018", "2019"))
+
+
+def test_approvals_are_per_project_and_file(store):
+    store.approve("zipkin", "NOTICE", NOTICE)
+
+    assert store.is_approved("zipkin", "NOTICE", NOTICE.replace("\n", "\r\n"))
+    assert not store.is_approved("zipkin", "NOTICE", NOTICE.replace("2018", "2019"))
+    assert not store.is_approved("zipkin", "LICENSE", NOTICE)
+    assert not store.is_approved("brave", "NOTICE", NOTICE)
+
+
+def test_changes_are_shown_against_the_last_approved_version(store):
+    assert store.last_approved("zipkin", "NOTICE") is None
+    store.approve("zipkin", "NOTICE", NOTICE)
+    newer = NOTICE.replace("2018", "2019")
+    store.approve("zipkin", "NOTICE", newer + "\n\n")
+    # Approving an older version again makes it the last approved one
+    store.approve("zipkin", "NOTICE", NOTICE)
+    store.approve("zipkin", "NOTICE", newer)
+
+    last = store.last_approved("zipkin", "NOTICE")
+
+    assert last == newer
+    assert diff(last, NOTICE.replace("2018", "2020"), "NOTICE") == [
+        "--- NOTICE (last approved)\n",
+        "+++ NOTICE\n",
+        "@@ -1,2 +1,2 @@\n",
+        " Apache Zipkin\n",
+        "-Copyright 2019 The Apache Software Foundation\n",
+        "+Copyright 2020 The Apache Software Foundation\n",
+    ]
+    # Only the formatting changed
+    assert diff(last, newer.replace("\n", "\r\n"), "NOTICE") == []
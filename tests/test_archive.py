@@ -0,0 +1,100 @@
+import os
+import stat
+import tarfile
+import zipfile
+
+import pytest
+
+from archive import MAX_LINK_TARGET, ArchiveError, Limits, extract
+
+
+def _zip(path, files=(), links=()):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, content in files:
+            zf.writestr(name, content)
+        for name, target in links:
+            info = zipfile.ZipInfo(name)
+            info.external_attr = (stat.S_IFLNK | 0o777) << 16
+            zf.writestr(info, target)
+    return str(path)
+
+
+def _tar(path, links=()):
+    with tarfile.open(path, "w:gz") as tf:
+        for name, target in links:
+            info = tarfile.TarInfo(name)
+            info.type = tarfile.SYMTYPE
+            info.linkname = target
+            tf.addfile(info)
+    return str(path)
+
+
+def test_links_inside_the_archive_are_extracted(tmp_path):
+    archive = _zip(
+        tmp_path / "a.zip",
+        files=[("root/dir/file", "content")],
+        links=[("root/link", "dir/file"), ("root/dir/up", "../dir")],
+    )
+
+    extraction = extract(archive, str(tmp_path / "out"), jobs=1)
+
+    assert os.readlink(tmp_path / "out/root/link") == "dir/file"
+    assert extraction.members["root/link"].link_target == "dir/file"
+    assert (tmp_path / "out/root/dir/up/file").read_text() == "content"
+
+
+@pytest.mark.parametrize(
+    "links",
+    [
+        [("root/out", "../..")],
+        # Each link on its own stays inside, but the chain doesn't
+        [("root/a", "b/.."), ("root/b", "../..")],
+        [("root/b", "../.."), ("root/a", "b/..")],
+        [("root/inside", "."), ("root/evil", "/etc")],
+    ],
+)
+def test_links_out_of_the_archive_are_refused(tmp_path, links):
+    (tmp_path / "out").mkdir()
+    for name, make in [("a.zip", _zip), ("a.tar.gz", _tar)]:
+        archive = make(tmp_path / name, links=links)
+        with pytest.raises(ArchiveError, match="points out of the archive"):
+            extract(archive, str(tmp_path / "out" / name), jobs=1)
+        # None of the links are left behind
+        assert os.listdir(tmp_path / "out" / name / "root") == []
+
+
+def test_links_are_not_created_through_other_links(tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    archive = _zip(
+        tmp_path / "a.zip",
+        links=[("root/dir", str(outside)), ("root/dir/evil", "/etc/passwd")],
+    )
+
+    with pytest.raises(ArchiveError, match="in a symbolic link pointing out"):
+        extract(archive, str(tmp_path / "out"), jobs=1)
+    assert os.listdir(outside) == []
+
+
+def test_limits_are_checked_before_reading_links(tmp_path):
+    archive = _zip(tmp_path / "a.zip", links=[(f"root/{i}", "x") for i in range(3)])
+
+    with pytest.raises(ArchiveError, match="more than 2 files"):
+        extract(archive, str(tmp_path / "out"), Limits(max_files=2), jobs=1)
+
+
+def test_long_link_targets_are_refused(tmp_path):
+    target = "x/" * (MAX_LINK_TARGET // 2 + 1)
+    for name, make in [("a.zip", _zip), ("a.tar.gz", _tar)]:
+        archive = make(tmp_path / name, links=[("root/link", target)])
+        with pytest.raises(ArchiveError, match="symbolic link with a target"):
+            extract(archive, str(tmp_path / "out" / name), jobs=1)
+
+
+def test_os_errors_are_archive_errors(tmp_path):
+    archive = _zip(tmp_path / "a.zip", files=[("root/file", "content")])
+    # A file where the destination directory should be
+    (tmp_path / "out").write_bytes(b"")
+
+    with pytest.raises(ArchiveError, match="Failed to extract"):
+        extract(archive, str(tmp_path / "out"), jobs=1)
@@ -0,0 +1,40 @@
+import pickle
+
+import path_policy
+import trace_profile
+from batch import verify_all
+from checks import check_zip_file_exists
+from project_config import ProjectConfig
+from report import ResultKind
+
+
+def test_state_survives_pickling_for_worker_processes(make_state):
+    config = ProjectConfig(
+        path_rules={"zipkin-lens": {path_policy.FORBIDDEN_IN_ARCHIVE: ["!mvnw"]}}
+    )
+    state = make_state(project_config=config)
+    state.path_policy.select(path_policy.ONLY_IN_GIT, [(".github", True)])
+
+    copy = pickle.loads(pickle.dumps(state))
+
+    assert copy == state
+    assert copy.path_policy.match_counts() == state.path_policy.match_counts()
+    # The copy has a working lock of its own
+    found = copy.path_policy.select(
+        path_policy.FORBIDDEN_IN_ARCHIVE, [("mvnw", False), ("sub/.git", True)]
+    )
+    assert found == ["sub/.git"]
+
+
+def test_releases_are_verified_in_worker_processes(make_state, monkeypatch):
+    # Tracing, as if enabled with --profile
+    monkeypatch.setattr(trace_profile, "_events", [])
+    states = [make_state(), make_state()]
+    states[1].version = "2.0"
+
+    reports = verify_all(states, ["1.0", "2.0"], [check_zip_file_exists], 1, 2)
+
+    # No archive was downloaded
+    assert [report.worst_kind for report in reports] == [ResultKind.FAIL] * 2
+    names = {event["name"] for event in trace_profile.take().events}
+    assert "run_checks" in names
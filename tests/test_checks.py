@@ -0,0 +1,163 @@
+import os
+import re
+import stat
+import threading
+import zipfile
+from typing import List
+
+import pytest
+
+import checks
+from checks import (
+    BuildAndTest,
+    check,
+    check_build_and_test,
+    check_source_dir_in_zip,
+    check_unzip,
+    run_checks,
+)
+from report import ResultKind
+from result_cache import ResultCache
+
+# Long enough to never happen unless something waits for something it
+# shouldn't
+TIMEOUT = 30
+
+
+def _checks(ran: List[str]):
+    digest_check_ran = threading.Event()
+
+    def digest(state):
+        return "digest"
+
+    def tool_versions(state):
+        # Like a build tool taking its time to start, until the checks that
+        # don't need it ran
+        if not digest_check_ran.wait(TIMEOUT):
+            ran.append("timed out")
+        return "versions"
+
+    @check(inputs=[digest])
+    def check_digest(state):
+        ran.append("digest")
+        digest_check_ran.set()
+
+    @check(depends_on=[check_digest])
+    def check_uncached(state):
+        ran.append("uncached")
+
+    @check(inputs=[digest, tool_versions], depends_on=[check_digest])
+    def check_build(state):
+        ran.append("build")
+
+    return [check_digest, check_uncached, check_build]
+
+
+def test_checks_dont_wait_for_inputs_they_dont_have(make_state, tmp_path):
+    state = make_state(result_cache=ResultCache(str(tmp_path / "results.sqlite")))
+    ran: List[str] = []
+
+    report = run_checks(state, _checks(ran), jobs=2)
+
+    assert ran[0] == "digest"
+    assert sorted(ran[1:]) == ["build", "uncached"]
+    assert not any(result.cached for result in report.results)
+
+
+def test_cached_checks_only_run_again_for_checks_that_need_them(make_state, tmp_path):
+    state = make_state(result_cache=ResultCache(str(tmp_path / "results.sqlite")))
+    run_checks(state, _checks([]), jobs=2)
+    ran: List[str] = []
+
+    report = run_checks(state, _checks(ran), jobs=2)
+
+    # The uncached check depends on the digest check, so both run
+    assert ran == ["digest", "uncached"]
+    assert [result.cached for result in report.results] == [False, False, True]
+
+
+def test_refused_archives_are_not_built(make_state):
+    state = make_state()
+    state.build_and_test_command = "touch built"
+    os.makedirs(os.path.dirname(state.archive_path))
+    with zipfile.ZipFile(state.archive_path, "w") as zf:
+        zf.writestr("zipkin-lens-1.0/pom.xml", "<project/>")
+        link = zipfile.ZipInfo("zipkin-lens-1.0/evil")
+        link.external_attr = (stat.S_IFLNK | 0o777) << 16
+        zf.writestr(link, "/etc")
+
+    report = run_checks(
+        state, [check_unzip, check_source_dir_in_zip, check_build_and_test], jobs=1
+    )
+
+    assert [result.kind for result in report.results] == [
+        ResultKind.FAIL,
+        ResultKind.ERROR,
+        ResultKind.ERROR,
+    ]
+    assert not os.path.lexists(os.path.join(state.source_dir, "evil"))
+    assert not os.path.exists(os.path.join(state.source_dir, "built"))
+
+
+class _StubBuild(BuildAndTest):
+    """Fails offline with `offline_failure`, passes online."""
+
+    offline_miss = re.compile("not in the cache")
+
+    def __init__(self, offline_failure: str) -> None:
+        self.offline_failure = offline_failure
+        self.ran: List[bool] = []
+
+    def name(self) -> str:
+        return "stub"
+
+    def should_run(self, state) -> bool:
+        return True
+
+    def run(self, state, source_dir, cache_dir, offline, output=None):
+        self.ran.append(offline)
+        return (self.offline_failure, ResultKind.FAIL) if offline else None
+
+
+def test_offline_builds_only_go_online_for_missing_dependencies(make_state, tmp_path):
+    state = make_state(build_cache_dir=str(tmp_path / "builds"))
+    os.makedirs(tmp_path / "builds/zipkin/stub")
+    (tmp_path / "builds/zipkin/stub/.warm").write_text("")
+
+    missing = _StubBuild("org.example:lib:1.0 is not in the cache")
+    assert checks._run_build(state, missing, str(tmp_path), None) is None
+    assert missing.ran == [True, False]
+
+    broken = _StubBuild("Compilation failure")
+    assert checks._run_build(state, broken, str(tmp_path), None) == (
+        "Compilation failure",
+        ResultKind.FAIL,
+    )
+    assert broken.ran == [True]
+
+
+@pytest.mark.parametrize(
+    "strategy,failure",
+    [
+        (
+            checks.BuildAndTestMaven(),
+            "[ERROR] Failed to execute goal on project lens: Could not resolve "
+            "dependencies for project io.zipkin:lens:jar:1.0: Cannot access central "
+            "(https://repo.maven.apache.org/maven2) in offline mode and the artifact "
+            "junit:junit:jar:4.12 has not been downloaded from it before. -> [Help 1]",
+        ),
+        (checks.BuildAndTestNpm(), "npm ERR! code ENOTCACHED"),
+        (
+            checks.BuildAndTestGradle(),
+            "> No cached version of junit:junit:4.12 available for offline mode.",
+        ),
+        (
+            checks.BuildAndTestCargo(),
+            "error: failed to download `serde v1.0.0`\n\nCaused by:\n  attempting "
+            "to make an HTTP request, but --offline was specified",
+        ),
+    ],
+)
+def test_build_tools_missing_dependencies_offline_are_told_apart(strategy, failure):
+    assert strategy.missed_cache(failure)
+    assert not strategy.missed_cache("[ERROR] COMPILATION ERROR : cannot find symbol")
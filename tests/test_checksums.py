@@ -0,0 +1,88 @@
+import pytest
+
+from checksums import verify_sidecars
+
+NAME = "apache-zipkin-1.0-source-release.zip"
+CONTENT = b"release"
+SHA512 = (
+    "694c24c429f9bf6f358ef0d0c276b2a53475c4d3033a33813f8f3bd95382ab31"
+    "e0c48dee407f8e63eaf87f22b2474acc27b3719003ead6f23cb9c67af8e68396"
+)
+OTHER_SHA512 = "0" * 128
+
+GPG_PRINT_MD = f"""\
+{NAME}: 694C24C4 29F9BF6F 358EF0D0 C276B2A5
+                                      3475C4D3 033A3381 3F8F3BD9 5382AB31
+                                      E0C48DEE 407F8E63 EAF87F22 B2474ACC
+                                      27B37190 03EAD6F2 3CB9C67A F8E68396
+"""
+
+
+def _verify(tmp_path, sidecar: str):
+    path = tmp_path / NAME
+    path.write_bytes(CONTENT)
+    sidecar_path = tmp_path / f"{NAME}.sha512"
+    sidecar_path.write_text(sidecar)
+    errors, _ = verify_sidecars(str(path), {"sha512": str(sidecar_path)})
+    return errors
+
+
+@pytest.mark.parametrize(
+    "sidecar",
+    [
+        f"{SHA512}\n",
+        f"{SHA512.upper()}",
+        # sha512sum, in text and binary mode
+        f"{SHA512}  {NAME}\n",
+        f"{SHA512} *{NAME}\n",
+        f"{OTHER_SHA512}  other.zip\n{SHA512}  {NAME}\n",
+        # BSD, shasum --tag and openssl
+        f"SHA512 ({NAME}) = {SHA512}\n",
+        f"SHA2-512({NAME})= {SHA512}\n",
+        GPG_PRINT_MD,
+    ],
+    ids=[
+        "bare",
+        "bare upper case",
+        "gnu",
+        "gnu binary",
+        "gnu several files",
+        "bsd",
+        "openssl",
+        "gpg print-md",
+    ],
+)
+def test_sidecar_formats(tmp_path, sidecar):
+    assert _verify(tmp_path, sidecar) == []
+
+
+@pytest.mark.parametrize(
+    "sidecar",
+    [
+        f"{OTHER_SHA512}\n",
+        f"{OTHER_SHA512}  {NAME}\n",
+        f"SHA512 ({NAME}) = {OTHER_SHA512}\n",
+        GPG_PRINT_MD.replace("694C24C4", "694C24C5"),
+    ],
+    ids=["bare", "gnu", "bsd", "gpg print-md"],
+)
+def test_mismatched_digests(tmp_path, sidecar):
+    (error,) = _verify(tmp_path, sidecar)
+
+    assert "sha512 checksum mismatch" in error
+    assert f"got {SHA512}" in error
+
+
+@pytest.mark.parametrize(
+    "sidecar, message",
+    [
+        (f"{OTHER_SHA512}  other.zip\n", "no entry for " + NAME),
+        (f"{SHA512[:64]}  {NAME}\n", "digest has length 64, expected 128"),
+        ("not a checksum\n", "Unrecognized checksum file format"),
+    ],
+    ids=["other file", "wrong length", "garbage"],
+)
+def test_unusable_sidecars(tmp_path, sidecar, message):
+    (error,) = _verify(tmp_path, sidecar)
+
+    assert message in error
@@ -0,0 +1,49 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+from classifier import MIN_FILES_FOR_POOL, TEXT, Classification, Classifier
+from manifest import Manifest
+from source_tree import DirectoryTree
+
+
+def _tree(tmp_path, count):
+    for i in range(count):
+        content = b"\0\1\2 binary" if i % 2 else f"text {i}\n".encode()
+        (tmp_path / f"file{i}").write_bytes(content)
+    # Results are only kept for files with a known content hash
+    return DirectoryTree(str(tmp_path), {f"file{i}": str(i) for i in range(count)})
+
+
+def test_classify_on_worker_processes_from_a_thread(tmp_path):
+    tree = _tree(tmp_path, MIN_FILES_FOR_POOL)
+    paths = [entry.path for entry in tree.entries()]
+    file_classifier = Classifier(jobs=2)
+
+    # Like a check, which runs on a thread while others run on theirs
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        classified = executor.submit(
+            file_classifier.classify, paths, tree.read_prefix
+        ).result()
+
+    for path in paths:
+        expected = Classification(True, "data") if int(path[4:]) % 2 else TEXT
+        assert classified[path] == expected
+
+
+def test_manifests_share_their_classifier(tmp_path):
+    tree = _tree(tmp_path, 2)
+    file_classifier = Classifier(jobs=1)
+    Manifest(tree, file_classifier).classify(["file0"])
+    (tmp_path / "file0").write_bytes(b"\0 changed, but not sniffed again")
+
+    assert not Manifest(tree, file_classifier).is_binary("file0")
+
+
+def test_classifier_survives_pickling(tmp_path):
+    tree = _tree(tmp_path, 2)
+    file_classifier = Classifier(jobs=1)
+    file_classifier.classify(["file1"], tree.read_prefix)
+
+    copy = pickle.loads(pickle.dumps(file_classifier))
+
+    assert copy.classify(["file0"], tree.read_prefix)["file0"] == TEXT
@@ -0,0 +1,136 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from download import Download, Downloader
+
+CONTENT = bytes(range(256)) * 1024
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, like the servers Apache releases are downloaded from
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connections += 1  # type: ignore
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        server = self.server
+        server.requests.append(dict(self.headers))  # type: ignore
+        content, etag = server.file  # type: ignore
+        action = server.actions.pop(0) if server.actions else None  # type: ignore
+        if action == "unavailable":
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        start = 0
+        requested = self.headers.get("Range")
+        if (
+            requested
+            and server.honor_range  # type: ignore
+            and self.headers.get("If-Range") in (None, etag)
+        ):
+            start = int(requested.replace("bytes=", "").rstrip("-"))
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(content) - 1}/{len(content)}"
+            )
+        else:
+            self.send_response(200)
+        body = content[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        if action in ("truncate", "truncate and change"):
+            self.wfile.write(body[: len(body) // 2])
+            self.close_connection = True
+            if action == "truncate and change":
+                server.file = (CONTENT[::-1], '"v2"')  # type: ignore
+            return
+        if action == "stall":
+            half = len(body) // 2
+            self.wfile.write(body[:half])
+            self.wfile.flush()
+            time.sleep(1)
+            self.wfile.write(body[half:])
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.file = (CONTENT, '"v1"')  # type: ignore
+    server.actions = []  # type: ignore
+    server.requests = []  # type: ignore
+    server.connections = 0  # type: ignore
+    server.honor_range = True  # type: ignore
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def _fetch(server, tmp_path, timeout: float = 10) -> bytes:
+    downloader = Downloader("test", backoff=0, timeout=timeout)
+    path = str(tmp_path / "release.tar.gz")
+    downloader.fetch(
+        Download(f"http://127.0.0.1:{server.server_address[1]}/release.tar.gz", path)
+    )
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_download(server, tmp_path):
+    assert _fetch(server, tmp_path) == CONTENT
+    assert len(server.requests) == 1
+    assert "Range" not in server.requests[0]
+
+
+def test_interrupted_download_is_resumed(server, tmp_path):
+    server.actions = ["truncate"]
+
+    assert _fetch(server, tmp_path) == CONTENT
+    resumed = server.requests[1]
+    assert resumed["Range"] == f"bytes={len(CONTENT) // 2}-"
+    assert resumed["If-Range"] == '"v1"'
+
+
+def test_failed_request_is_retried(server, tmp_path):
+    server.actions = ["unavailable", "unavailable"]
+
+    assert _fetch(server, tmp_path) == CONTENT
+    assert len(server.requests) == 3
+
+
+def test_server_ignoring_range_sends_everything_again(server, tmp_path):
+    server.honor_range = False
+    server.actions = ["truncate"]
+
+    assert _fetch(server, tmp_path) == CONTENT
+    assert "Range" in server.requests[1]
+
+
+def test_file_changed_since_interrupted_download(server, tmp_path):
+    server.actions = ["truncate and change"]
+
+    assert _fetch(server, tmp_path) == CONTENT[::-1]
+
+
+def test_connection_is_not_reused_after_failure_mid_body(server, tmp_path):
+    server.actions = ["stall"]
+
+    # The rest of the first body arrives on the first connection after the
+    # read timed out, and must not be taken for the second response
+    assert _fetch(server, tmp_path, timeout=0.2) == CONTENT
+    assert server.connections == 2
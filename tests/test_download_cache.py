@@ -0,0 +1,100 @@
+import errno
+import itertools
+import os
+import stat
+import time
+
+import pytest
+
+import download_cache
+from download_cache import DownloadCache, link_or_copy
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Makes every entry used strictly after the one before it."""
+    ticks = itertools.count()
+    monkeypatch.setattr(time, "time", lambda: float(next(ticks)))
+
+
+def _download(tmp_path, name, content):
+    path = tmp_path / "work" / name
+    path.parent.mkdir(exist_ok=True)
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = DownloadCache(str(tmp_path / "cache"), max_size=10)
+    cache.store("a", _download(tmp_path, "a", b"aaaaa"), None, None)
+    cache.store("b", _download(tmp_path, "b", b"bbbbb"), '"b"', None)
+    cache.use(cache.lookup("a"), str(tmp_path / "a-again"))
+
+    cache.store("c", _download(tmp_path, "c", b"ccccc"), None, None)
+
+    assert cache.lookup("b") is None
+    assert cache.lookup("a").size == 5
+    assert cache.lookup("c") is not None
+    assert cache.stats.evictions == 1
+    objects = [
+        name for _, _, names in os.walk(tmp_path / "cache/objects") for name in names
+    ]
+    assert len(objects) == 2
+
+
+def test_content_served_for_several_urls_is_stored_once(tmp_path, clock):
+    cache = DownloadCache(str(tmp_path / "cache"), max_size=5)
+    cache.store("a", _download(tmp_path, "a", b"same!"), None, None)
+    cache.store("mirror/a", _download(tmp_path, "b", b"same!"), None, None)
+
+    assert cache.lookup("a").sha256 == cache.lookup("mirror/a").sha256
+    assert cache.stats.evictions == 0
+
+
+def test_cached_objects_are_read_only_and_shared_with_the_download(tmp_path):
+    cache = DownloadCache(str(tmp_path / "cache"), max_size=100)
+    path = _download(tmp_path, "a", b"content")
+
+    cache.store("a", path, '"etag"', "Mon, 01 Jan 2024 00:00:00 GMT")
+
+    entry = cache.lookup("a")
+    assert entry.etag == '"etag"'
+    assert entry.last_modified == "Mon, 01 Jan 2024 00:00:00 GMT"
+    object_stat = os.stat(cache._object_path(entry.sha256))
+    assert stat.S_IMODE(object_stat.st_mode) == 0o444
+    assert os.stat(path).st_ino == object_stat.st_ino
+
+
+def test_entries_whose_object_is_gone_are_not_found(tmp_path):
+    cache = DownloadCache(str(tmp_path / "cache"), max_size=100)
+    cache.store("a", _download(tmp_path, "a", b"content"), None, None)
+
+    os.remove(cache._object_path(cache.lookup("a").sha256))
+
+    assert cache.lookup("a") is None
+
+
+def test_files_are_copied_where_they_cant_be_hard_linked(tmp_path, monkeypatch):
+    def cross_device_link(src, dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(download_cache.os, "link", cross_device_link)
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.write_bytes(b"content")
+    dst.write_bytes(b"replaced")
+
+    link_or_copy(str(src), str(dst))
+
+    assert dst.read_bytes() == b"content"
+    assert os.stat(src).st_ino != os.stat(dst).st_ino
+
+
+def test_unexpected_link_errors_are_raised(tmp_path, monkeypatch):
+    def no_space(src, dst):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(download_cache.os, "link", no_space)
+    (tmp_path / "src").write_bytes(b"content")
+
+    with pytest.raises(OSError, match="No space left"):
+        link_or_copy(str(tmp_path / "src"), str(tmp_path / "dst"))
@@ -0,0 +1,104 @@
+import os
+import subprocess
+
+import pytest
+
+import checks
+import gittree
+
+
+def _git(*args, cwd):
+    return subprocess.run(
+        [
+            "git",
+            "-c",
+            "user.name=Test",
+            "-c",
+            "user.email=test@example.com",
+            *args,
+        ],
+        cwd=cwd,
+        check=True,
+        stdout=subprocess.PIPE,
+    ).stdout.decode()
+
+
+def _commit(repo, name, content):
+    (repo / name).write_text(content)
+    _git("add", name, cwd=repo)
+    _git("commit", "--quiet", "-m", name, cwd=repo)
+    return _git("rev-parse", "HEAD", cwd=repo).strip()
+
+
+@pytest.fixture
+def upstream(tmp_path, make_state):
+    """A repository to fetch from, at the URL States built by make_state use."""
+    state = make_state()
+    repo = tmp_path / "remote" / state.git_repo_name
+    repo.mkdir(parents=True)
+    _git("init", "--quiet", cwd=repo)
+    # Like GitHub, which allows fetching commits by id and without blobs
+    _git("config", "uploadpack.allowAnySHA1InWant", "true", cwd=repo)
+    _git("config", "uploadpack.allowFilter", "true", cwd=repo)
+    return repo
+
+
+def _state(make_state, tmp_path, git_hash, run, **kwargs):
+    state = make_state(git_remote_base=f"file://{tmp_path}/remote", **kwargs)
+    state.git_hash = git_hash
+    state.work_dir = str(tmp_path / run)
+    return state
+
+
+def _missing_objects(state):
+    output = subprocess.run(
+        [
+            "git",
+            "-C",
+            state.git_dir,
+            "rev-list",
+            "--objects",
+            "--missing=print",
+            state.git_hash,
+        ],
+        check=True,
+        stdout=subprocess.PIPE,
+    ).stdout.decode()
+    return [line for line in output.splitlines() if line.startswith("?")]
+
+
+def test_only_the_commit_and_its_trees_are_fetched(make_state, tmp_path, upstream):
+    git_hash = _commit(upstream, "a.txt", "a")
+    _commit(upstream, "b.txt", "b")
+    state = _state(make_state, tmp_path, git_hash, "run")
+
+    assert checks._fetch_git_revision(state) is None
+
+    assert sorted(gittree.ls_tree(state.git_dir, git_hash)) == ["a.txt"]
+    # The blob of a.txt
+    assert len(_missing_objects(state)) == 1
+
+
+def test_mirrors_are_updated_with_the_wanted_commit(make_state, tmp_path, upstream):
+    mirror_dir = str(tmp_path / "mirrors")
+    first = _commit(upstream, "a.txt", "a")
+    state = _state(make_state, tmp_path, first, "run0", git_mirror_dir=mirror_dir)
+    assert checks._fetch_git_revision(state) is None
+    # One commit on the branch, and one that no branch or tag reaches
+    on_branch = _commit(upstream, "b.txt", "b")
+    unreachable = _commit(upstream, "c.txt", "c")
+    _git("reset", "--quiet", "--hard", on_branch, cwd=upstream)
+
+    for run, (git_hash, files) in enumerate(
+        [(on_branch, ["a.txt", "b.txt"]), (unreachable, ["a.txt", "b.txt", "c.txt"])]
+    ):
+        state = _state(
+            make_state, tmp_path, git_hash, f"run{run + 1}", git_mirror_dir=mirror_dir
+        )
+
+        assert checks._fetch_git_revision(state) is None
+
+        assert sorted(gittree.ls_tree(state.git_dir, git_hash)) == files
+        # Sharing the mirror's objects rather than copying them
+        alternates = os.path.join(state.git_dir, ".git/objects/info/alternates")
+        assert os.path.exists(alternates)
@@ -0,0 +1,116 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from gitignore import Gitignore
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="needs git")
+
+ROOT_GITIGNORE = r"""
+# Comments and blank lines are no rules
+
+*.log
+!keep.log
+build/
+!build/reincluded
+/root-only.txt
+docs/**/*.tmp
+**/generated
+a/**/b
+\!bang
+foo?.txt
+[Tt]emp*
+""" + (
+    # An escaped trailing space is part of the pattern
+    "trailing-space\\ \n"
+)
+
+SUB_GITIGNORE = """
+!*.log
+local/
+/anchored
+"""
+
+# (path, is_dir); directories are listed before what's in them
+PATHS = [
+    ("app.log", False),
+    ("keep.log", False),
+    ("build", True),
+    ("build/out.class", False),
+    ("build/reincluded", False),
+    ("build.txt", False),
+    ("src", True),
+    ("src/build", True),
+    ("src/build/x", False),
+    ("src/build.log", False),
+    ("root-only.txt", False),
+    ("docs", True),
+    ("docs/x.tmp", False),
+    ("docs/a", True),
+    ("docs/a/b", True),
+    ("docs/a/b/x.tmp", False),
+    ("other", True),
+    ("other/docs", True),
+    ("other/docs/x.tmp", False),
+    ("generated", False),
+    ("x", True),
+    ("x/generated", True),
+    ("x/generated/y", False),
+    ("a", True),
+    ("a/b", False),
+    ("a/x", True),
+    ("a/x/y", True),
+    ("a/x/y/b", False),
+    ("a/c", False),
+    ("!bang", False),
+    ("bang", False),
+    ("foo1.txt", False),
+    ("foo12.txt", False),
+    ("Temp.java", False),
+    ("temp", False),
+    ("tEmp", False),
+    ("trailing-space ", False),
+    ("sub", True),
+    ("sub/app.log", False),
+    ("sub/root-only.txt", False),
+    ("sub/local", True),
+    ("sub/local/z", False),
+    ("sub/anchored", False),
+    ("sub/x", True),
+    ("sub/x/anchored", False),
+    ("sub/x/local", False),
+]
+
+
+def test_matches_like_git_check_ignore(tmp_path):
+    for path, is_dir in PATHS:
+        if is_dir:
+            (tmp_path / path).mkdir()
+        else:
+            (tmp_path / path).write_text("")
+    (tmp_path / ".gitignore").write_text(ROOT_GITIGNORE)
+    (tmp_path / "sub/.gitignore").write_text(SUB_GITIGNORE)
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    git = subprocess.run(
+        ["git", "check-ignore", "--no-index", "--stdin"],
+        cwd=str(tmp_path),
+        input="".join(f"{path}\n" for path, _ in PATHS).encode(),
+        stdout=subprocess.PIPE,
+        env={**os.environ, "GIT_CONFIG_NOSYSTEM": "1", "HOME": str(tmp_path)},
+    )
+    assert git.returncode in (0, 1)
+
+    rules = Gitignore({"": ROOT_GITIGNORE, "sub": SUB_GITIGNORE})
+    ignored = [
+        path for path, is_dir in PATHS if rules.ignored_by(path, is_dir) is not None
+    ]
+
+    assert ignored == git.stdout.decode().splitlines()
+
+
+def test_ignored_lists_only_the_topmost_ignored_directory():
+    rules = Gitignore({"": ROOT_GITIGNORE})
+
+    assert rules.ignored(PATHS[:6]) == ["app.log", "build"]
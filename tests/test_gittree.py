@@ -0,0 +1,68 @@
+import subprocess
+
+from gittree import GitEntry, blob_sha1, compare, ls_tree
+
+BLOB_A = "a" * 40
+BLOB_B = "b" * 40
+COMMIT = "c" * 40
+
+
+def _blob(sha):
+    return GitEntry("100644", "blob", sha)
+
+
+def test_only_the_topmost_missing_directory_is_listed():
+    git = {"a.txt": _blob(BLOB_A), "docs/x/1.md": _blob(BLOB_A)}
+    archive = {"a.txt": BLOB_B, "gen/x/1.java": BLOB_A, "gen/x/2.java": BLOB_A}
+
+    comparison = compare(git, archive)
+
+    assert comparison.only_in_git == ["docs"]
+    assert comparison.only_in_archive == ["gen"]
+    assert comparison.differing == ["a.txt"]
+    assert comparison.uncomparable == []
+
+
+def test_submodules_are_uncomparable_whatever_the_archive_has_there():
+    git = {"a.txt": _blob(BLOB_A), "sub": GitEntry("160000", "commit", COMMIT)}
+
+    for archive in [
+        {"a.txt": BLOB_A},
+        {"a.txt": BLOB_A, "sub": BLOB_B},
+        {"a.txt": BLOB_A, "sub/x.java": BLOB_B, "sub/y/z.java": BLOB_B},
+    ]:
+        comparison = compare(git, archive)
+
+        assert comparison.only_in_git == []
+        assert comparison.only_in_archive == []
+        assert comparison.differing == []
+        assert comparison.uncomparable == ["sub"]
+
+
+def test_blob_ids_match_git(tmp_path):
+    (tmp_path / "file").write_text("content\n")
+    (tmp_path / "link").symlink_to("file")
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    subprocess.run(["git", "-C", str(tmp_path), "add", "."], check=True)
+    subprocess.run(
+        [
+            "git",
+            "-C",
+            str(tmp_path),
+            "-c",
+            "user.name=Test",
+            "-c",
+            "user.email=test@example.com",
+            "commit",
+            "-q",
+            "-m",
+            "Test",
+        ],
+        check=True,
+    )
+
+    entries = ls_tree(str(tmp_path), "HEAD")
+
+    assert sorted(entries) == ["file", "link"]
+    for name, entry in entries.items():
+        assert entry.sha == blob_sha1(str(tmp_path / name))
@@ -0,0 +1,21 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from classifier import MIN_FILES_FOR_POOL
+from headers import SPDX_IDENTIFIER, missing_headers
+from source_tree import DirectoryTree
+
+
+def test_missing_headers_on_worker_processes_from_a_thread(tmp_path):
+    for i in range(MIN_FILES_FOR_POOL):
+        header = f"// {SPDX_IDENTIFIER}\n" if i % 2 else ""
+        (tmp_path / f"File{i}.java").write_text(header + "class A {}\n")
+    tree = DirectoryTree(str(tmp_path))
+    paths = [entry.path for entry in tree.entries()]
+
+    # Like a check, which runs on a thread while others run on theirs
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        missing = executor.submit(
+            missing_headers, paths, tree.read_prefix, [], 2
+        ).result()
+
+    assert missing == sorted(f"File{i}.java" for i in range(0, MIN_FILES_FOR_POOL, 2))
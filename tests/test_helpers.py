@@ -0,0 +1,78 @@
+import io
+import os
+import signal
+import time
+
+import helpers
+from helpers import TAIL_BYTES, sh
+
+
+def _dead(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Killed, but not reaped yet by whoever inherited it
+            return f.read().rsplit(")", 1)[1].split()[0] == "Z"
+    except FileNotFoundError:
+        return True
+
+
+def _dies(pid: int) -> bool:
+    """Whether process `pid` dies soon; signals take a moment to be delivered."""
+    deadline = time.monotonic() + 5
+    while not _dead(pid):
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_commands_taking_too_long_are_terminated():
+    result = sh("sleep 30", timeout=0.5, quiet=True)
+
+    assert result.timed_out
+    assert result.status == -signal.SIGTERM
+    assert result.wall_seconds < 10
+
+
+def test_commands_ignoring_sigterm_are_killed(monkeypatch):
+    monkeypatch.setattr(helpers, "KILL_GRACE_SECONDS", 0.5)
+
+    result = sh("trap '' TERM; sleep 30", timeout=0.5, quiet=True)
+
+    assert result.timed_out
+    assert result.status == -signal.SIGKILL
+    assert result.wall_seconds < 10
+
+
+def test_what_commands_leave_behind_is_killed(tmp_path):
+    pid_file = tmp_path / "pid"
+
+    # The background process would keep the output pipe open
+    result = sh(f"sleep 30 & echo $! > {pid_file}", quiet=True)
+
+    assert result.status == 0
+    assert not result.timed_out
+    assert result.wall_seconds < 10
+    assert _dies(int(pid_file.read_text()))
+
+
+def test_only_the_tail_of_the_output_is_kept():
+    output = io.StringIO()
+
+    result = sh("seq 1 100000; exit 3", output=output)
+
+    assert result.status == 3
+    assert len(result.output_tail) == TAIL_BYTES
+    assert result.output_tail.endswith("\n99999\n100000\n")
+    # All of it goes to the output, after the command
+    lines = output.getvalue().splitlines()
+    assert lines[0] == ">> Executing `seq 1 100000; exit 3`"
+    assert lines[1:] == [str(i) for i in range(1, 100001)]
+
+
+def test_environment_and_working_directory(tmp_path):
+    result = sh(
+        'echo "$GREETING from $PWD"', str(tmp_path), {"GREETING": "hi"}, quiet=True
+    )
+
+    assert result.output_tail == f"hi from {os.path.realpath(tmp_path)}\n"
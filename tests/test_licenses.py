@@ -0,0 +1,74 @@
+import textwrap
+
+import apache_2_license
+import license_texts
+from licenses import identify, starts_with_apache_2
+
+MIT_COPYRIGHT = "Copyright (c) 2018 Jane Doe"
+BSD_COPYRIGHT = "Copyright (c) 2017, John Doe\nAll rights reserved."
+
+
+def _bundled_license_file():
+    """A LICENSE file with the licenses of two bundled libraries appended."""
+    return "\n\n".join(
+        [
+            apache_2_license.text.strip(),
+            "This product bundles jquery, which is available under the MIT " "license:",
+            MIT_COPYRIGHT,
+            license_texts.MIT.strip(),
+            "This product bundles d3, which is available under the 3-clause "
+            "BSD license:",
+            BSD_COPYRIGHT,
+            # Wrapped differently
+            textwrap.fill(" ".join(license_texts.BSD_3_CLAUSE.split()), 60),
+        ]
+    )
+
+
+def _line(text, line):
+    return text.splitlines()[line - 1]
+
+
+def test_each_bundled_license_is_a_section_of_its_own():
+    text = _bundled_license_file()
+
+    sections = identify(text)
+
+    licensed = [section for section in sections if section.license is not None]
+    assert [section.license.spdx_id for section in licensed] == [
+        "Apache-2.0",
+        "MIT",
+        "BSD-3-Clause",
+    ]
+    assert all(section.score > 0.95 for section in licensed)
+    # The sections cover the file in order, without overlapping
+    assert sections[0].first_line == 1
+    assert sections[-1].last_line == len(text.splitlines())
+    for before, after in zip(sections, sections[1:]):
+        assert before.last_line < after.first_line
+    mit = licensed[1]
+    assert _line(text, mit.last_line) == license_texts.MIT.strip().splitlines()[-1]
+
+
+def test_the_same_license_twice_is_two_sections():
+    text = "\n\n".join([license_texts.MIT, license_texts.MIT])
+
+    sections = identify(text)
+
+    assert [section.license.spdx_id for section in sections] == ["MIT", "MIT"]
+
+
+def test_text_thats_no_known_license_is_unidentified():
+    sections = identify(
+        "Permission is granted to whoever is named Bob to use this software on\n"
+        "Tuesdays, as long as they send the author a postcard each time.\n"
+    )
+
+    assert [section.license for section in sections] == [None]
+
+
+def test_apache_2_is_recognized_however_its_wrapped():
+    rewrapped = textwrap.fill(" ".join(apache_2_license.text.split()), 50)
+
+    assert starts_with_apache_2(rewrapped + "\n\nThis product bundles ...")
+    assert not starts_with_apache_2(license_texts.MIT)
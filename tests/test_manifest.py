@@ -0,0 +1,81 @@
+import stat
+
+import pytest
+
+from manifest import Manifest
+from source_tree import DirectoryTree, Entry, SourceTree
+
+
+class _CountingTree(SourceTree):
+    """A tree of files whose content is their path, counting reads."""
+
+    def __init__(self, entries):
+        self._entries = entries
+        self.reads = []
+
+    def entries(self):
+        return iter(self._entries)
+
+    def exists(self, path):
+        return any(entry.path == path for entry in self._entries)
+
+    def read_prefix(self, path, size=8192):
+        return self.read(path)[:size]
+
+    def read(self, path):
+        self.reads.append(path)
+        return path.encode()
+
+
+def _file(path):
+    return Entry(path, len(path), stat.S_IFREG | 0o644)
+
+
+def test_entries_are_sorted_by_encoded_path(tmp_path):
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b/z.txt").write_text("z")
+    (tmp_path / "a-b.txt").write_text("ab")
+    (tmp_path / "é.txt").write_text("e")
+    (tmp_path / "link").symlink_to("a-b.txt")
+
+    manifest = Manifest(DirectoryTree(str(tmp_path)))
+
+    assert [entry.path for entry in manifest] == [
+        "a-b.txt",
+        "b",
+        "b/z.txt",
+        "link",
+        "é.txt",
+    ]
+    assert manifest.entry(manifest.index("link")).link_target == "a-b.txt"
+    assert manifest.entry(manifest.index("b/z.txt")).size == 1
+    assert manifest.entry(manifest.index("b")).is_dir
+    assert [entry.path for entry in manifest.files()] == [
+        "a-b.txt",
+        "b/z.txt",
+        "é.txt",
+    ]
+
+
+def test_paths_are_looked_up_by_bisection():
+    paths = [f"dir{i % 7}/file{i}" for i in range(1000)]
+    manifest = Manifest(_CountingTree([_file(path) for path in paths]))
+
+    for path in paths:
+        assert manifest.path(manifest.index(path)) == path
+    for path in ["", "dir0", "dir0/file", "dir9/file1", "zzz"]:
+        assert manifest.index(path) is None
+        assert path not in manifest
+
+
+def test_content_hashes_are_worked_out_once_when_asked_for():
+    tree = _CountingTree([_file("a"), _file("b")])
+    manifest = Manifest(tree)
+    assert tree.reads == []
+
+    first = manifest.content_hash("a")
+
+    assert manifest.content_hash("a") == first
+    assert tree.reads == ["a"]
+    with pytest.raises(FileNotFoundError):
+        manifest.content_hash("missing")
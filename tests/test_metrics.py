@@ -0,0 +1,51 @@
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import metrics
+from helpers import run, sh, sh_all
+
+MIB = 1024 * 1024
+
+
+def _check(commands: int, mib: int) -> metrics.Usage:
+    with metrics.measure() as meter:
+        sh_all(["true"] * commands)
+        sh(f"head -c {mib * MIB} /dev/zero > /dev/null", quiet=True)
+    return meter.usage
+
+
+def test_concurrent_measurements_only_count_their_own_commands():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        small, large = executor.map(_check, [1, 5], [1, 20])
+
+    assert small.subprocesses == 2
+    assert large.subprocesses == 6
+    assert MIB <= small.bytes_read < 20 * MIB
+    assert large.bytes_written >= 20 * MIB
+    assert large.max_rss_kib > 0
+
+
+def test_nested_measurements_both_count():
+    with metrics.measure() as outer:
+        with metrics.measure() as inner:
+            sh("true", quiet=True)
+        sh("true", quiet=True)
+
+    assert inner.usage.subprocesses == 1
+    assert outer.usage.subprocesses == 2
+
+
+def test_run_captures_output_and_usage():
+    with metrics.measure() as meter:
+        process = run(["sh", "-c", "cat; echo oops >&2; exit 3"], input=b"input")
+
+    assert (process.returncode, process.stdout, process.stderr) == (
+        3,
+        b"input",
+        b"oops\n",
+    )
+    assert meter.usage.subprocesses == 1
+    with pytest.raises(subprocess.CalledProcessError):
+        run(["false"], check=True)
@@ -0,0 +1,92 @@
+import io
+
+from mismatches import (
+    DIFF_MAX_BYTES,
+    DIFF_MAX_FILES,
+    DIFF_MAX_LINES,
+    MAX_DIRECTORIES,
+    MAX_EXAMPLES,
+    MismatchReport,
+)
+
+
+def test_summary_lists_directories_with_the_most_mismatches_first():
+    detail = io.StringIO()
+    report = MismatchReport(detail)
+    for i in range(MAX_EXAMPLES + 3):
+        report.add("Only in git", f"big/file{i}")
+    report.add("Only in git", "small/file")
+    report.add("Only in git", "top")
+
+    assert report.summary() == [
+        f"Only in git: {MAX_EXAMPLES + 5} in 3 directories",
+        "    big/: "
+        + ", ".join(f"file{i}" for i in range(MAX_EXAMPLES))
+        + " and 3 more",
+        "    ./: top",
+        "    small/: file",
+    ]
+    # Every single one is in the details
+    assert len(detail.getvalue().splitlines()) == MAX_EXAMPLES + 5
+
+
+def test_summary_size_is_bounded_however_many_mismatches_there_are():
+    report = MismatchReport(io.StringIO())
+    for i in range(MAX_DIRECTORIES * 10):
+        for j in range(MAX_EXAMPLES * 10):
+            report.add("Differs", f"dir{i}/file{j}")
+    report.add("Only in archive", "generated.txt")
+
+    summary = report.summary()
+
+    assert summary[0] == (
+        f"Differs: {MAX_DIRECTORIES * MAX_EXAMPLES * 100} in "
+        f"{MAX_DIRECTORIES * 10} directories"
+    )
+    assert len(summary) == 1 + MAX_DIRECTORIES + 1 + 2
+    assert summary[MAX_DIRECTORIES + 1] == (
+        f"    ... and {MAX_DIRECTORIES * 9} more directories"
+    )
+    assert summary[-2:] == [
+        "Only in archive: 1 in 1 directory",
+        "    ./: generated.txt",
+    ]
+
+
+def test_only_the_start_of_the_first_few_diffs_is_shown():
+    detail = io.StringIO()
+    report = MismatchReport(detail)
+    old = "".join(f"line {i}\n" for i in range(DIFF_MAX_LINES * 2))
+    new = old.replace("line", "LINE")
+    for i in range(DIFF_MAX_FILES + 1):
+        report.add_diff(f"file{i}", old.encode(), new.encode(), "git", "archive")
+
+    summary = report.summary()
+
+    assert summary.count("--- file0 (git)") == 1
+    assert f"--- file{DIFF_MAX_FILES} (git)" not in summary
+    assert len(summary) == DIFF_MAX_FILES * (DIFF_MAX_LINES + 1)
+    assert summary.count("... (diff truncated)") == DIFF_MAX_FILES
+    # The full diffs of all files are in the details
+    assert f"+++ file{DIFF_MAX_FILES} (archive)\n" in detail.getvalue()
+    assert f"+LINE {DIFF_MAX_LINES * 2 - 1}\n" in detail.getvalue()
+
+
+def test_binary_and_large_files_are_not_diffed():
+    detail = io.StringIO()
+    report = MismatchReport(detail)
+
+    report.add_diff("image.png", b"\x89PNG\0", b"\x89PNG\0\1", "git", "archive")
+    large = b"x\n" * DIFF_MAX_BYTES
+    report.add_diff("large.txt", large, large + b"y\n", "git", "archive")
+    report.add_diff("no-newline.txt", b"a", b"b", "git", "archive")
+
+    assert detail.getvalue().splitlines() == [
+        "--- no-newline.txt (git)",
+        "+++ no-newline.txt (archive)",
+        "@@ -1 +1 @@",
+        "-a",
+        "\\ No newline at end of file",
+        "+b",
+        "\\ No newline at end of file",
+    ]
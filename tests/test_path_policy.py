@@ -0,0 +1,77 @@
+import pytest
+
+from path_policy import (
+    DEFAULT_RULES,
+    FORBIDDEN_IN_ARCHIVE,
+    ONLY_IN_ARCHIVE,
+    ONLY_IN_GIT,
+    PathPolicy,
+)
+
+
+def test_the_last_matching_rule_decides():
+    policy = PathPolicy(
+        {FORBIDDEN_IN_ARCHIVE: ["*.jar", "!lib/*.jar", "lib/bad.jar"]},
+    )
+    paths = [
+        ("app.jar", False),
+        ("lib/good.jar", False),
+        ("lib/bad.jar", False),
+        ("lib/sub/deep.jar", False),
+    ]
+
+    assert policy.select(FORBIDDEN_IN_ARCHIVE, paths) == [
+        "app.jar",
+        "lib/bad.jar",
+        "lib/sub/deep.jar",
+    ]
+
+
+def test_later_rule_sets_override_earlier_ones():
+    policy = PathPolicy(DEFAULT_RULES, {FORBIDDEN_IN_ARCHIVE: ["!mvnw"]})
+
+    found = policy.select(
+        FORBIDDEN_IN_ARCHIVE,
+        [("mvnw", False), ("sub/mvnw", False), (".git", True), ("sub/.mvn", True)],
+    )
+
+    assert found == [".git", "sub/.mvn"]
+
+
+def test_directory_rules_only_match_directories():
+    policy = PathPolicy({ONLY_IN_GIT: ["build/", "/docs"]})
+    paths = [
+        ("build", True),
+        ("sub/build", True),
+        ("build", False),
+        ("docs", False),
+        ("sub/docs", True),
+    ]
+
+    assert policy.select(ONLY_IN_GIT, paths) == ["build", "sub/build", "docs"]
+
+
+def test_rules_only_apply_to_their_category():
+    policy = PathPolicy(
+        {ONLY_IN_GIT: ["CONTRIBUTING.md"], ONLY_IN_ARCHIVE: ["!CONTRIBUTING.md"]}
+    )
+
+    assert policy.select(ONLY_IN_GIT, [("CONTRIBUTING.md", False)]) == [
+        "CONTRIBUTING.md"
+    ]
+    assert policy.select(ONLY_IN_ARCHIVE, [("CONTRIBUTING.md", False)]) == []
+
+
+def test_matches_are_counted_per_deciding_rule():
+    policy = PathPolicy({FORBIDDEN_IN_ARCHIVE: ["*.jar", "!lib/*.jar", "*.class"]})
+    policy.select(FORBIDDEN_IN_ARCHIVE, [("a.jar", False), ("lib/b.jar", False)])
+    policy.select(FORBIDDEN_IN_ARCHIVE, [("c.jar", False)])
+
+    assert policy.match_counts() == {
+        FORBIDDEN_IN_ARCHIVE: {"*.jar": 2, "!lib/*.jar": 1, "*.class": 0}
+    }
+
+
+def test_unknown_categories_are_refused():
+    with pytest.raises(ValueError, match="Unknown path policy category"):
+        PathPolicy({"only-in-svn": ["*"]})
@@ -0,0 +1,124 @@
+import os
+import shutil
+import subprocess
+import tempfile
+
+import pytest
+
+import pgp
+
+pytestmark = pytest.mark.skipif(
+    shutil.which("gpg") is None or shutil.which("gpgv") is None,
+    reason="needs gpg and gpgv",
+)
+
+BROKEN_BLOCK = """\
+-----BEGIN PGP PUBLIC KEY BLOCK-----
+
+mDMEXu8AAAAAAAAAAAAAAAAAAAAA
+=AAAA
+-----END PGP PUBLIC KEY BLOCK-----
+"""
+
+
+def _gpg(gnupg_home, *args):
+    return subprocess.run(
+        ["gpg", "--batch", "--homedir", gnupg_home, *args],
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    ).stdout.decode()
+
+
+@pytest.fixture(scope="module")
+def gnupg_home():
+    # Not in pytest's tmp_path, whose length can exceed gpg-agent's socket paths
+    home = tempfile.mkdtemp(prefix="gnupg-")
+    try:
+        for user_id in ["Signer <signer@example.org>", "Other <other@example.org>"]:
+            _gpg(home, "--passphrase", "", "--quick-gen-key", user_id)
+        yield home
+    finally:
+        subprocess.run(["gpgconf", "--homedir", home, "--kill", "all"])
+        shutil.rmtree(home)
+
+
+def _fingerprints(gnupg_home):
+    """The (primary, [subkeys]) fingerprints of each key in the keyring."""
+    keys = []
+    listing = _gpg(gnupg_home, "--with-colons", "--list-keys")
+    kind = None
+    for line in listing.splitlines():
+        fields = line.split(":")
+        if fields[0] in ("pub", "sub"):
+            kind = fields[0]
+        elif fields[0] == "fpr" and kind == "pub":
+            keys.append((fields[9], []))
+        elif fields[0] == "fpr" and kind == "sub":
+            keys[-1][1].append(fields[9])
+    return keys
+
+
+def test_parse_keys_finds_keys_and_subkeys(gnupg_home):
+    keys = pgp.parse_keys(_gpg(gnupg_home, "--armor", "--export"))
+
+    assert [(key.fingerprint, key.subkey_fingerprints) for key in keys] == (
+        _fingerprints(gnupg_home)
+    )
+
+
+def test_parse_keys_skips_broken_blocks(gnupg_home, caplog):
+    text = BROKEN_BLOCK + "\n" + _gpg(gnupg_home, "--armor", "--export")
+
+    keys = pgp.parse_keys(text)
+
+    assert len(keys) == 2
+    assert "Skipping the key block at line 1 of KEYS" in caplog.text
+
+
+def test_key_index_finds_keys_by_id(gnupg_home):
+    index = pgp.KeyIndex(pgp.parse_keys(_gpg(gnupg_home, "--armor", "--export")))
+    fingerprint, (subkey, *_) = _fingerprints(gnupg_home)[0]
+
+    for key_id in [fingerprint, fingerprint[-16:], "0x" + fingerprint[-8:], subkey]:
+        assert index.find(key_id).fingerprint == fingerprint
+    with pytest.raises(pgp.KeysError):
+        index.find("0123456789ABCDEF")
+
+
+def test_key_index_uses_leftmost_bits_of_v5_fingerprints():
+    fingerprint = "".join(f"{i:02X}" for i in range(32))
+    index = pgp.KeyIndex([pgp.Key(fingerprint, [], "", b"")])
+
+    assert index.find("0001020304050607").fingerprint == fingerprint
+    assert index.find("04050607").fingerprint == fingerprint
+    with pytest.raises(pgp.KeysError):
+        index.find(fingerprint[-16:])
+
+
+def test_verify_signatures(gnupg_home, tmp_path):
+    keys = pgp.parse_keys(_gpg(gnupg_home, "--armor", "--export"))
+    signer, other = _fingerprints(gnupg_home)
+    key = next(key for key in keys if key.fingerprint == signer[0])
+    signed = tmp_path / "release.tar.gz"
+    signed.write_bytes(b"release")
+    signatures = {}
+    for name, content, local_user in [
+        ("good", b"release", signer[0]),
+        ("tampered", b"changed", signer[0]),
+        ("other-key", b"release", other[0]),
+    ]:
+        path = str(tmp_path / name)
+        with open(path, "wb") as f:
+            f.write(content)
+        _gpg(gnupg_home, "--local-user", local_user, "--detach-sign", path)
+        os.rename(path + ".sig", path + ".asc")
+        signatures[path + ".asc"] = str(signed)
+
+    results = pgp.verify_signatures(key, signatures)
+
+    errors = {os.path.basename(r.signature_path): r.error for r in results}
+    assert errors["good.asc"] is None
+    assert errors["tampered.asc"] is not None
+    # gpgv doesn't have the other key at all
+    assert errors["other-key.asc"] is not None
@@ -0,0 +1,21 @@
+import pytest
+
+from report import Report, Result, ResultKind, exit_code
+
+
+def _report(*kinds):
+    return Report([Result(kind.name, False, None, kind) for kind in kinds])
+
+
+@pytest.mark.parametrize(
+    "reports,code",
+    [
+        ([], 0),
+        ([_report(ResultKind.PASS, ResultKind.NOTE)], 0),
+        ([_report(ResultKind.NOTE, ResultKind.WARN)], 1),
+        ([_report(ResultKind.WARN), _report(ResultKind.FAIL, ResultKind.NOTE)], 2),
+        ([_report(ResultKind.ERROR), _report(ResultKind.FAIL)], 3),
+    ],
+)
+def test_exit_code_is_that_of_the_worst_result(reports, code):
+    assert exit_code(reports) == code
@@ -0,0 +1,67 @@
+import io
+import stat
+import tarfile
+import zipfile
+
+import pytest
+
+from archive import MAX_LINK_TARGET, ArchiveError, Limits
+from headers import SPDX_IDENTIFIER, missing_headers
+from source_tree import TarTree, ZipTree, open_archive
+
+CONTENT = f"// {SPDX_IDENTIFIER}\nclass A {{}}\n".encode()
+
+
+def _add_file(tf, name, content):
+    info = tarfile.TarInfo(name)
+    info.size = len(content)
+    tf.addfile(info, io.BytesIO(content))
+
+
+def _add_hard_link(tf, name, target):
+    info = tarfile.TarInfo(name)
+    info.type = tarfile.LNKTYPE
+    info.linkname = target
+    tf.addfile(info)
+
+
+def test_hard_links_have_the_content_of_their_target(tmp_path):
+    path = str(tmp_path / "a.tar.gz")
+    with tarfile.open(path, "w:gz") as tf:
+        _add_file(tf, "outside/Shared.java", CONTENT)
+        _add_file(tf, "root/A.java", CONTENT)
+        _add_hard_link(tf, "root/B.java", "root/A.java")
+        _add_hard_link(tf, "root/C.java", "outside/Shared.java")
+
+    tree = open_archive(path, "root", Limits())
+
+    assert isinstance(tree, TarTree)
+    entries = {entry.path: entry for entry in tree.entries()}
+    assert sorted(entries) == ["A.java", "B.java", "C.java"]
+    for name in ["B.java", "C.java"]:
+        assert entries[name].is_file
+        assert entries[name].size == len(CONTENT)
+        assert tree.read_prefix(name) == CONTENT
+        assert tree.read(name) == CONTENT
+    assert missing_headers(sorted(entries), tree.read_prefix, [], parallel=False) == []
+
+
+def test_hard_links_to_unknown_files_are_refused(tmp_path):
+    path = str(tmp_path / "a.tar.gz")
+    with tarfile.open(path, "w:gz") as tf:
+        _add_hard_link(tf, "root/B.java", "root/A.java")
+        _add_file(tf, "root/A.java", CONTENT)
+
+    with pytest.raises(ArchiveError, match="hard link to unknown file"):
+        open_archive(path, "root", Limits())
+
+
+def test_long_zip_link_targets_are_refused(tmp_path):
+    path = str(tmp_path / "a.zip")
+    with zipfile.ZipFile(path, "w") as zf:
+        info = zipfile.ZipInfo("root/link")
+        info.external_attr = (stat.S_IFLNK | 0o777) << 16
+        zf.writestr(info, "x/" * (MAX_LINK_TARGET // 2 + 1))
+
+    with pytest.raises(ArchiveError, match="symbolic link with a target"):
+        ZipTree(path, "root", Limits())